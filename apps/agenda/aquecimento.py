@@ -0,0 +1,80 @@
+"""
+Aquecimento dos caches antes de o servidor atender a primeira requisição.
+
+``aquecer_processo`` prepara o que é local a cada processo: rotas, campos dos
+serializers, traduções, linhas de Horario e catálogo de serviços. Chamado no
+master do gunicorn antes do fork (ver ``config/gunicorn.py``), os workers
+herdam tudo pronto.
+
+``aquecer`` faz o mesmo com os caches locais e monta no cache compartilhado
+as grades da agenda padrão (a semana a partir de hoje) de todos os
+profissionais ativos, que é o que o endpoint ``agenda`` consulta quando não
+recebe 'data_inicial'.
+"""
+import logging
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.urls import URLResolver, get_resolver
+from django.utils import translation
+
+from apps.agenda import cache as agenda_cache
+from apps.agenda.catalogo import catalogo
+from apps.agenda.horarios import grade_horarios
+from apps.usuario.models import Usuario, TipoUsuario
+
+logger = logging.getLogger(__name__)
+
+
+def _views(padroes):
+    for padrao in padroes:
+        if isinstance(padrao, URLResolver):
+            yield from _views(padrao.url_patterns)
+        else:
+            yield padrao.callback
+
+
+def aquecer_processo():
+    """
+    Importa todas as views, monta as tabelas de reverse() e os campos de cada
+    serializer_class, carrega as traduções do idioma padrão e os caches locais.
+    Retorna um resumo: {'rotas', 'serializers'}.
+    """
+    resolver = get_resolver()
+    callbacks = list(_views(resolver.url_patterns))
+    # As tabelas de reverse() são montadas na primeira leitura
+    resolver.reverse_dict
+
+    serializers = {
+        getattr(callback.cls, 'serializer_class', None)
+        for callback in callbacks if hasattr(callback, 'cls')
+    }
+    serializers.discard(None)
+    for serializer_class in serializers:
+        try:
+            serializer_class().fields
+        except Exception:
+            logger.warning("Não foi possível aquecer %s.", serializer_class.__name__, exc_info=True)
+
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext('Not found.')
+
+    grade_horarios()
+    catalogo()
+    return {'rotas': len(callbacks), 'serializers': len(serializers)}
+
+
+def aquecer(dias=7):
+    """Aquece os caches e retorna um resumo: {'profissionais', 'grades_montadas'}."""
+    grade_horarios()
+    catalogo()
+
+    profissional_ids = list(Usuario.objects.filter(
+        tipo=TipoUsuario.PROFISSIONAL, is_active=True
+    ).values_list('id', flat=True))
+    montadas = 0
+    if profissional_ids and dias > 0:
+        hoje = date.today()
+        _, hits = agenda_cache.agendas_em_cache(profissional_ids, hoje, hoje + timedelta(days=dias - 1))
+        montadas = len(profissional_ids) - hits
+    return {'profissionais': len(profissional_ids), 'grades_montadas': montadas}
@@ -0,0 +1,88 @@
+"""
+Busca dos próximos horários livres para um serviço entre todos os
+profissionais habilitados.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from itertools import chain
+
+from apps.agenda.horarios import mascaras_expediente
+from apps.agenda.models import Agendamento, SerieRecorrente
+from apps.agenda.disponibilidade import (
+    ROTULOS,
+    SLOTS,
+    indices,
+    inicios_possiveis,
+    mascara_agendamento,
+)
+
+BLOCO_DIAS = 7
+HORIZONTE_DIAS = 90
+
+
+def proximos_horarios(servico, a_partir_de, limite, horizonte_dias=HORIZONTE_DIAS):
+    """
+    Retorna os ``limite`` primeiros inícios possíveis para ``servico`` a partir
+    de ``a_partir_de`` (datetime local), ordenados por data, horário e profissional.
+
+    Os agendamentos são lidos em blocos de ``BLOCO_DIAS`` dias e a varredura
+    para assim que ``limite`` resultados são encontrados.
+    """
+    profissionais = dict(servico.profissionais.order_by('id').values_list('id', 'nome_completo'))
+    if not profissionais or limite <= 0:
+        return []
+
+    mascaras = mascaras_expediente(profissionais)
+    if not mascaras:
+        return []
+
+    resultados = []
+    primeiro_dia = a_partir_de.date()
+    hora_minima = a_partir_de.time()
+    ultimo_dia = primeiro_dia + timedelta(days=horizonte_dias - 1)
+
+    series = list(SerieRecorrente.objects.no_periodo(primeiro_dia, ultimo_dia).filter(
+        profissional_id__in=profissionais
+    ))
+
+    bloco_inicio = primeiro_dia
+    while bloco_inicio <= ultimo_dia:
+        bloco_fim = min(bloco_inicio + timedelta(days=BLOCO_DIAS - 1), ultimo_dia)
+
+        ocupacao = defaultdict(int)
+        agendamentos = Agendamento.objects.filter(
+            profissional_id__in=profissionais,
+            data__range=[bloco_inicio, bloco_fim]
+        )
+        ocorrencias = SerieRecorrente.expandir(series, bloco_inicio, bloco_fim)
+        for ag in chain(agendamentos, ocorrencias):
+            ocupacao[ag.profissional_id, ag.data] |= mascara_agendamento(ag)
+
+        dia = bloco_inicio
+        while dia <= bloco_fim:
+            candidatos = []
+            for prof_id in profissionais:
+                mascara_exp = mascaras.get((prof_id, dia.weekday()))
+                if not mascara_exp:
+                    continue
+                possiveis = inicios_possiveis(mascara_exp, ocupacao[prof_id, dia], servico.duracao)
+                for indice in indices(possiveis):
+                    if dia == primeiro_dia and SLOTS[indice] < hora_minima:
+                        continue
+                    candidatos.append((indice, prof_id))
+
+            for indice, prof_id in sorted(candidatos):
+                resultados.append({
+                    "profissional": prof_id,
+                    "nome_profissional": profissionais[prof_id],
+                    "data": dia.strftime('%Y-%m-%d'),
+                    "horario": ROTULOS[indice],
+                })
+                if len(resultados) >= limite:
+                    return resultados
+
+            dia += timedelta(days=1)
+
+        bloco_inicio = bloco_fim + timedelta(days=1)
+
+    return resultados
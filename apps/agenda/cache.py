@@ -0,0 +1,234 @@
+"""
+Cache versionado da grade de agenda.
+
+Cada profissional tem um contador de versão no cache, incrementado pelos
+signals sempre que um agendamento, expediente ou série dele muda. Existe
+também uma versão global, para mudanças que afetam todas as agendas (nomes
+de serviços e clientes, linhas de Horario). A chave da grade inclui as duas
+versões, então uma agenda inalterada é servida sem tocar no ORM e uma
+alterada simplesmente deixa de ser encontrada.
+
+As mesmas versões servem de marcador para os ETags (ver ``condicional``);
+VERSAO_SERVICOS cobre a listagem e o catálogo local de serviços (ver
+``catalogo``) e VERSAO_HORARIOS o cache local das linhas de Horario (ver
+``horarios``).
+
+As versões só valem entre processos se o cache for compartilhado (Redis):
+com o LocMem, cada processo tem as suas, e uma escrita atendida por um worker
+não invalidaria a grade em cache nos outros. Por isso, com LocMem e mais de
+um processo (``versoes_compartilhadas``), as grades são montadas a cada
+requisição.
+
+As funções com prefixo 'a' (``aversoes``, ``aagendas_em_cache``, ...) são as
+versões para views assíncronas, com a API assíncrona do cache e do ORM.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from config.roteamento import usar_primario
+
+VERSAO_GLOBAL = 'global'
+VERSAO_SERVICOS = 'servicos'
+VERSAO_HORARIOS = 'horarios'
+
+_estatisticas = {'hits': 0, 'misses': 0}
+
+
+def cache_local():
+    """Indica se o cache padrão vive na memória do processo (LocMem, sem REDIS_URL)."""
+    return isinstance(caches['default'], LocMemCache)
+
+
+def versoes_compartilhadas():
+    """
+    Indica se as versões valem para todos os processos que atendem requisições:
+    o cache é externo ao processo ou há um só processo (PROCESSOS_WEB).
+    """
+    return settings.PROCESSOS_WEB <= 1 or not cache_local()
+
+
+def _chave_versao(nome):
+    return f'agenda:versao:{nome}'
+
+
+def _nova_versao():
+    # Baseada no relógio para que uma versão despejada do cache nunca volte a um valor já usado
+    return time.time_ns()
+
+
+def versoes(nomes):
+    """Retorna {nome: versão} para profissionais (ids) ou as versões nomeadas (VERSAO_*)."""
+    chaves = {_chave_versao(nome): nome for nome in nomes}
+    encontradas = cache.get_many(chaves)
+    resultado = {}
+    for chave, nome in chaves.items():
+        valor = encontradas.get(chave)
+        if valor is None:
+            valor = _nova_versao()
+            if not cache.add(chave, valor, None):
+                valor = cache.get(chave, valor)
+        resultado[nome] = valor
+    return resultado
+
+
+async def aversoes(nomes):
+    """Versão assíncrona de ``versoes``."""
+    chaves = {_chave_versao(nome): nome for nome in nomes}
+    encontradas = await cache.aget_many(chaves)
+    resultado = {}
+    for chave, nome in chaves.items():
+        valor = encontradas.get(chave)
+        if valor is None:
+            valor = _nova_versao()
+            if not await cache.aadd(chave, valor, None):
+                valor = await cache.aget(chave, valor)
+        resultado[nome] = valor
+    return resultado
+
+
+def _incrementar(nomes):
+    for nome in nomes:
+        chave = _chave_versao(nome)
+        try:
+            cache.incr(chave)
+        except ValueError:
+            cache.set(chave, _nova_versao(), None)
+
+
+def invalidar(*nomes):
+    """
+    Incrementa a versão dos profissionais (ou as versões nomeadas) informados.
+    Incrementa de novo após o commit, para que uma grade montada por outra
+    requisição antes do commit não fique em cache com a versão nova.
+    """
+    nomes = {nome for nome in nomes if nome is not None}
+    if not nomes:
+        return
+    _incrementar(nomes)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _incrementar(nomes))
+
+
+def invalidar_tudo():
+    invalidar(VERSAO_GLOBAL)
+
+
+def profissional_do_expediente(expediente_id):
+    """
+    Profissional de um expediente, guardado em cache para evitar buscar a linha
+    (só se o cache for compartilhado: a troca de profissional feita por outro
+    processo não apagaria a cópia deste).
+    """
+    chave = f'agenda:expediente:{expediente_id}:profissional'
+    compartilhado = versoes_compartilhadas()
+    profissional_id = cache.get(chave) if compartilhado else None
+    if profissional_id is None:
+        from apps.agenda.models import HorarioExpediente
+
+        # Guardado sem expirar: não pode vir atrasado da réplica
+        with usar_primario():
+            profissional_id = HorarioExpediente.objects.filter(
+                pk=expediente_id
+            ).values_list('profissional_id', flat=True).first()
+        if profissional_id is not None and compartilhado:
+            cache.set(chave, profissional_id, None)
+    return profissional_id
+
+
+async def aprofissional_do_expediente(expediente_id):
+    """Versão assíncrona de ``profissional_do_expediente``."""
+    chave = f'agenda:expediente:{expediente_id}:profissional'
+    compartilhado = versoes_compartilhadas()
+    profissional_id = await cache.aget(chave) if compartilhado else None
+    if profissional_id is None:
+        from apps.agenda.models import HorarioExpediente
+
+        with usar_primario():
+            profissional_id = await HorarioExpediente.objects.filter(
+                pk=expediente_id
+            ).values_list('profissional_id', flat=True).afirst()
+        if profissional_id is not None and compartilhado:
+            await cache.aset(chave, profissional_id, None)
+    return profissional_id
+
+
+def esquecer_expediente(expediente_id):
+    cache.delete(f'agenda:expediente:{expediente_id}:profissional')
+
+
+def _chave_agenda(profissional_id, data_inicial, data_final, versao_global, versao):
+    return f'agenda:grade:{profissional_id}:{data_inicial:%Y%m%d}:{data_final:%Y%m%d}:{versao_global}:{versao}'
+
+
+def _chaves_agenda(profissional_ids, data_inicial, data_final, versoes_atuais):
+    return {
+        prof_id: _chave_agenda(prof_id, data_inicial, data_final, versoes_atuais[VERSAO_GLOBAL], versoes_atuais[prof_id])
+        for prof_id in profissional_ids
+    }
+
+
+def _separar(profissional_ids, chaves, encontradas):
+    """Separa as grades encontradas no cache das que faltam montar, contando acertos e faltas."""
+    agendas = {prof_id: encontradas[chave] for prof_id, chave in chaves.items() if chave in encontradas}
+    faltantes = [prof_id for prof_id in profissional_ids if prof_id not in agendas]
+    _estatisticas['hits'] += len(agendas)
+    _estatisticas['misses'] += len(faltantes)
+    return agendas, faltantes
+
+
+def agendas_em_cache(profissional_ids, data_inicial, data_final):
+    """
+    Igual a ``montar_agendas``, mas reaproveita as grades em cache cuja versão
+    não mudou. Retorna ``(agendas, hits)``, em que hits é quantas vieram do cache.
+    """
+    # Import local: models e catálogo importam este módulo
+    from apps.agenda.grade import montar_agendas
+
+    profissional_ids = list(dict.fromkeys(profissional_ids))
+    if not versoes_compartilhadas():
+        return montar_agendas(profissional_ids, data_inicial, data_final), 0
+    chaves = _chaves_agenda(profissional_ids, data_inicial, data_final, versoes([VERSAO_GLOBAL, *profissional_ids]))
+    agendas, faltantes = _separar(profissional_ids, chaves, cache.get_many(chaves.values()))
+
+    if faltantes:
+        # A grade fica em cache sob a versão atual, então é montada com os dados do primário
+        with usar_primario():
+            novas = montar_agendas(faltantes, data_inicial, data_final)
+        cache.set_many({chaves[prof_id]: novas[prof_id] for prof_id in faltantes}, settings.AGENDA_CACHE_TTL)
+        agendas.update(novas)
+
+    return agendas, len(profissional_ids) - len(faltantes)
+
+
+async def aagendas_em_cache(profissional_ids, data_inicial, data_final):
+    """Versão assíncrona de ``agendas_em_cache``."""
+    from apps.agenda.grade import amontar_agendas
+
+    profissional_ids = list(dict.fromkeys(profissional_ids))
+    if not versoes_compartilhadas():
+        return await amontar_agendas(profissional_ids, data_inicial, data_final), 0
+    chaves = _chaves_agenda(profissional_ids, data_inicial, data_final, await aversoes([VERSAO_GLOBAL, *profissional_ids]))
+    agendas, faltantes = _separar(profissional_ids, chaves, await cache.aget_many(chaves.values()))
+
+    if faltantes:
+        with usar_primario():
+            novas = await amontar_agendas(faltantes, data_inicial, data_final)
+        await cache.aset_many({chaves[prof_id]: novas[prof_id] for prof_id in faltantes}, settings.AGENDA_CACHE_TTL)
+        agendas.update(novas)
+
+    return agendas, len(profissional_ids) - len(faltantes)
+
+
+def estatisticas():
+    """Estatísticas de acerto do cache da agenda neste processo."""
+    hits, misses = _estatisticas['hits'], _estatisticas['misses']
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'taxa_acerto': round(hits / total, 4) if total else None,
+    }
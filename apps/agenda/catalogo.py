@@ -0,0 +1,109 @@
+"""
+Catálogo local (por processo) dos serviços.
+
+Guarda nome, duração e preço de cada Servico e o conjunto de profissionais
+habilitados, para que validação, agenda e busca consultem duração e
+competência em memória. Como em ``horarios``, a validade é conferida contra
+uma versão no cache compartilhado (VERSAO_SERVICOS), incrementada pelos
+signals de Servico e de ``profissionais``. A versão é lida uma vez por
+requisição (não a cada agendamento que pede uma duração): a escrita feita por
+outro processo aparece na requisição seguinte, e a deste processo na hora,
+porque os mesmos signals descartam o catálogo local (``descartar``).
+
+Sem versões compartilhadas (LocMem com vários processos, ver
+``agenda_cache.versoes_compartilhadas``) o incremento feito por outro
+processo não chega aqui; o catálogo então vale só até o início da próxima
+requisição deste processo. Um serviço que não está no catálogo (criado
+depois da última carga) sempre provoca uma recarga.
+"""
+from itertools import count
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+from types import MappingProxyType
+from typing import NamedTuple
+
+from apps.agenda import cache as agenda_cache
+from config.roteamento import usar_primario
+from apps.servicos.models import Servico
+
+
+class ServicoCatalogo(NamedTuple):
+    pk: int
+    nome: str
+    duracao: timedelta
+    preco: Decimal
+    profissionais: frozenset
+
+
+@dataclass(frozen=True)
+class Catalogo:
+    versao: object
+    servicos: MappingProxyType
+
+    def servico(self, servico_id):
+        return self.servicos.get(servico_id)
+
+    def duracao(self, servico_id):
+        servico = self.servicos.get(servico_id)
+        return servico.duracao if servico else None
+
+    def habilitado(self, servico_id, profissional_id):
+        """Indica se o profissional realiza o serviço."""
+        servico = self.servicos.get(servico_id)
+        return servico is not None and profissional_id in servico.profissionais
+
+
+_catalogo = None
+_requisicoes = count(1)
+_requisicao = 0
+_versao_lida = None  # (requisição, versão)
+
+
+def nova_requisicao():
+    """Chamado a cada requisição: a versão do catálogo é conferida de novo."""
+    global _requisicao
+    _requisicao = next(_requisicoes)
+
+
+def descartar():
+    """Esquece o catálogo e a versão lida, depois de uma escrita deste processo em serviços."""
+    global _catalogo, _versao_lida
+    _catalogo = _versao_lida = None
+
+
+def _versao():
+    global _versao_lida
+    if not agenda_cache.versoes_compartilhadas():
+        return ('requisicao', _requisicao)
+    lida = _versao_lida
+    if lida is None or lida[0] != _requisicao:
+        versao = agenda_cache.versoes([agenda_cache.VERSAO_SERVICOS])[agenda_cache.VERSAO_SERVICOS]
+        lida = _versao_lida = (_requisicao, versao)
+    return lida[1]
+
+
+@usar_primario()
+def _carregar(versao):
+    profissionais = {}
+    for servico_id, profissional_id in Servico.profissionais.through.objects.values_list('servico_id', 'usuario_id'):
+        profissionais.setdefault(servico_id, set()).add(profissional_id)
+
+    servicos = {
+        pk: ServicoCatalogo(pk, nome, duracao, preco, frozenset(profissionais.get(pk, ())))
+        for pk, nome, duracao, preco in Servico.objects.values_list('pk', 'nome', 'duracao', 'preco')
+    }
+    return Catalogo(versao=versao, servicos=MappingProxyType(servicos))
+
+
+def catalogo(*servico_ids):
+    """
+    Retorna o Catalogo atual, recarregando só se um serviço ou competência mudou
+    ou se algum dos ``servico_ids`` ainda não estiver nele.
+    """
+    global _catalogo
+    versao = _versao()
+    atual = _catalogo
+    if atual is None or atual.versao != versao or any(pk not in atual.servicos for pk in servico_ids):
+        atual = _catalogo = _carregar(versao)
+    return atual
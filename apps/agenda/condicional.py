@@ -0,0 +1,92 @@
+"""
+Requisições condicionais (ETag / If-None-Match) para actions de ViewSet.
+
+O ETag é derivado de um marcador barato (as versões do cache da agenda), então
+uma requisição cujo conteúdo não mudou recebe 304 sem buscar linhas nem
+serializar nada.
+
+``com_etag_assincrono`` faz o mesmo para as views assíncronas (ver
+``views.assincronas``), com o marcador também assíncrono.
+
+Quando as versões não são compartilhadas entre os processos (LocMem com mais
+de um worker, ver ``cache.versoes_compartilhadas``), o marcador de um worker
+não muda com as escritas atendidas pelos outros e um 304 devolveria ao
+cliente uma cópia desatualizada; nesse caso as respostas saem sem ETag.
+"""
+import hashlib
+from functools import wraps
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.agenda.cache import versoes_compartilhadas
+
+
+def calcular_etag(request, marcador):
+    parametros = sorted(request.GET.lists())
+    conteudo = repr((request.path, parametros, marcador)).encode()
+    return f'"{hashlib.sha1(conteudo).hexdigest()}"'
+
+
+def _nao_modificado(request, etag):
+    if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+    return etag in if_none_match or '*' in if_none_match
+
+
+def _marcar(response, etag):
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def com_etag(marcador):
+    """
+    Decorator para métodos de ViewSet. ``marcador(view, request, *args, **kwargs)``
+    deve retornar um valor que muda sempre que a resposta muda, ou None para
+    desativar o ETag naquela requisição.
+    """
+    def decorator(metodo):
+        @wraps(metodo)
+        def wrapper(self, request, *args, **kwargs):
+            if not versoes_compartilhadas():
+                return metodo(self, request, *args, **kwargs)
+            valor = marcador(self, request, *args, **kwargs)
+            if valor is None:
+                return metodo(self, request, *args, **kwargs)
+
+            etag = calcular_etag(request, valor)
+            if _nao_modificado(request, etag):
+                return _marcar(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+            response = metodo(self, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            return _marcar(response, etag)
+        return wrapper
+    return decorator
+
+
+def com_etag_assincrono(marcador):
+    """
+    Decorator para views assíncronas do Django. ``await marcador(request, *args, **kwargs)``
+    segue as mesmas regras do marcador de ``com_etag``.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if not versoes_compartilhadas():
+                return await view(request, *args, **kwargs)
+            valor = await marcador(request, *args, **kwargs)
+            if valor is None:
+                return await view(request, *args, **kwargs)
+
+            etag = calcular_etag(request, valor)
+            if _nao_modificado(request, etag):
+                return _marcar(HttpResponseNotModified(), etag)
+            response = await view(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            return _marcar(response, etag)
+        return wrapper
+    return decorator
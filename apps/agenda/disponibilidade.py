@@ -0,0 +1,125 @@
+"""
+Motor de disponibilidade baseado em máscaras de bits.
+
+Cada posição de ``HORARIOS_DISPONIVEIS`` corresponde a um bit: o bit ``i``
+representa o slot de 30 minutos que começa em ``HORARIOS_DISPONIVEIS[i]``.
+O expediente de um dia e os agendamentos de um dia viram inteiros, e as
+checagens de encaixe, sobreposição e horários livres passam a ser operações
+bit a bit.
+"""
+from datetime import datetime, time
+
+from apps.agenda.models.expediente import HORARIOS_DISPONIVEIS
+
+DURACAO_SLOT = 30  # minutos
+
+ROTULOS = tuple(h for _, h in HORARIOS_DISPONIVEIS)  # 'HH:MM' de cada slot
+SLOTS = tuple(datetime.strptime(h, '%H:%M').time() for h in ROTULOS)
+TOTAL_SLOTS = len(SLOTS)
+INDICE_POR_HORARIO = {horario: indice for indice, horario in enumerate(SLOTS)}
+
+GRADE_INICIO = SLOTS[0].hour * 60 + SLOTS[0].minute
+GRADE_FIM = GRADE_INICIO + TOTAL_SLOTS * DURACAO_SLOT
+MASCARA_COMPLETA = (1 << TOTAL_SLOTS) - 1
+
+
+def _minutos(horario):
+    return horario.hour * 60 + horario.minute + horario.second / 60
+
+
+def indices(mascara):
+    """Gera, em ordem crescente, os índices dos bits ligados na máscara."""
+    while mascara:
+        menor_bit = mascara & -mascara
+        yield menor_bit.bit_length() - 1
+        mascara ^= menor_bit
+
+
+def primeiro_slot(mascara):
+    """Retorna o horário do primeiro slot ligado na máscara (ou None)."""
+    if not mascara:
+        return None
+    return SLOTS[(mascara & -mascara).bit_length() - 1]
+
+
+def mascara_horarios(horarios):
+    """
+    Converte uma coleção de ``time`` na máscara dos slots correspondentes.
+    Horários que não pertencem à grade são ignorados.
+    """
+    mascara = 0
+    for horario in horarios:
+        indice = INDICE_POR_HORARIO.get(horario)
+        if indice is not None:
+            mascara |= 1 << indice
+    return mascara
+
+
+def mascara_expediente(expediente):
+    """Máscara dos slots de um ``HorarioExpediente`` (use com prefetch de 'horarios')."""
+    return mascara_horarios(h.horario for h in expediente.horarios.all())
+
+
+def mascara_periodo(inicio, duracao):
+    """
+    Retorna a máscara dos slots da grade que se sobrepõem ao período que
+    começa em ``inicio`` (time) e dura ``duracao`` (timedelta).
+    """
+    inicio_min = _minutos(inicio)
+    fim_min = inicio_min + duracao.total_seconds() / 60
+
+    primeiro = max(0, int((inicio_min - GRADE_INICIO) // DURACAO_SLOT))
+    # Último slot cujo início é anterior ao fim do período
+    ultimo = min(TOTAL_SLOTS - 1, -int(-(fim_min - GRADE_INICIO) // DURACAO_SLOT) - 1)
+
+    if ultimo < primeiro:
+        return 0
+    return ((1 << (ultimo - primeiro + 1)) - 1) << primeiro
+
+
+def mascara_agendamento(agendamento):
+    """Máscara dos slots ocupados por um agendamento (0 se os dados forem inválidos)."""
+    inicio_dt = agendamento.hora_inicio_dt
+    fim_dt = agendamento.hora_fim_dt
+    if not inicio_dt or not fim_dt or fim_dt <= inicio_dt:
+        return 0
+    return mascara_periodo(agendamento.hora, fim_dt - inicio_dt)
+
+
+def horario_fora_do_expediente(inicio, duracao, mascara_exp):
+    """
+    Retorna o primeiro horário necessário ao período que não está coberto pelo
+    expediente, ou None se o período couber inteiramente nele.
+    Um início fora da grade de slots (ex.: 09:15) é sempre recusado: a máscara
+    do período arredondaria para os slots vizinhos.
+    """
+    if inicio not in INDICE_POR_HORARIO:
+        return inicio
+    inicio_min = _minutos(inicio)
+
+    faltantes = mascara_periodo(inicio, duracao) & ~mascara_exp
+    if faltantes:
+        return primeiro_slot(faltantes)
+
+    if inicio_min + duracao.total_seconds() / 60 > GRADE_FIM:
+        return time((GRADE_FIM // 60) % 24, GRADE_FIM % 60)
+    return None
+
+
+def slots_livres(mascara_exp, mascara_ocupada):
+    """Máscara dos slots do expediente que não estão ocupados."""
+    return mascara_exp & ~mascara_ocupada
+
+
+def inicios_possiveis(mascara_exp, mascara_ocupada, duracao):
+    """
+    Máscara dos slots em que um atendimento de ``duracao`` pode começar:
+    o período inteiro precisa caber no expediente e estar livre.
+    """
+    livres = slots_livres(mascara_exp, mascara_ocupada)
+    possiveis = 0
+    for indice in indices(livres):
+        inicio = SLOTS[indice]
+        if horario_fora_do_expediente(inicio, duracao, livres) is None:
+            possiveis |= 1 << indice
+    return possiveis
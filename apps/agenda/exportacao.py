@@ -0,0 +1,65 @@
+"""
+Exportação em streaming dos agendamentos (NDJSON ou CSV).
+
+As linhas são lidas com ``values_list().iterator()`` (cursor no servidor no
+PostgreSQL) já com os nomes e o preço vindos do JOIN, e cada linha é escrita
+assim que chega. A memória fica constante qualquer que seja o período.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+# (nome da coluna, caminho no ORM)
+COLUNAS = (
+    ('id', 'id'),
+    ('data', 'data'),
+    ('hora', 'hora'),
+    ('status', 'status'),
+    ('cliente_id', 'cliente_id'),
+    ('cliente', 'cliente__nome_completo'),
+    ('profissional_id', 'profissional_id'),
+    ('profissional', 'profissional__nome_completo'),
+    ('servico_id', 'servico_id'),
+    ('servico', 'servico__nome'),
+    ('preco', 'servico__preco'),
+)
+NOMES = [nome for nome, _ in COLUNAS]
+
+TAMANHO_LOTE = 2000
+
+FORMATOS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def linhas(queryset):
+    return queryset.order_by('data', 'hora', 'id').values_list(
+        *(caminho for _, caminho in COLUNAS)
+    ).iterator(chunk_size=TAMANHO_LOTE)
+
+
+def gerar_ndjson(queryset):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for linha in linhas(queryset):
+        yield encoder.encode(dict(zip(NOMES, linha))) + '\n'
+
+
+class _Eco:
+    """Buffer que devolve o que recebe, para o csv.writer escrever direto no stream."""
+    def write(self, valor):
+        return valor
+
+
+def gerar_csv(queryset):
+    writer = csv.writer(_Eco())
+    yield writer.writerow(NOMES)
+    for linha in linhas(queryset):
+        yield writer.writerow(linha)
+
+
+GERADORES = {
+    'ndjson': gerar_ndjson,
+    'csv': gerar_csv,
+}
@@ -0,0 +1,88 @@
+"""
+Factories (factory_boy) dos modelos da agenda, usadas pelos testes e pelo
+comando ``benchmark`` para gerar volumes realistas.
+"""
+from datetime import date, time, timedelta
+from functools import lru_cache
+
+import factory
+from django.contrib.auth.hashers import make_password
+from factory.django import DjangoModelFactory
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario
+
+SENHA_PADRAO = 'senha123'
+
+
+@lru_cache(maxsize=None)
+def senha_hash(senha=SENHA_PADRAO):
+    """Hash calculado uma vez só: gerar milhares de usuários não deve custar milhares de PBKDF2."""
+    return make_password(senha)
+
+
+class UsuarioFactory(DjangoModelFactory):
+    class Meta:
+        model = Usuario
+        django_get_or_create = ('email',)
+
+    email = factory.Sequence(lambda n: f'usuario{n}@exemplo.com')
+    nome_completo = factory.Faker('name', locale='pt_BR')
+    tipo = TipoUsuario.CLIENTE
+    password = factory.LazyFunction(senha_hash)
+    telefone = factory.Faker('numerify', text='119########')
+    cidade = factory.Faker('city', locale='pt_BR')
+    uf = factory.Faker('estado_sigla', locale='pt_BR')
+
+
+class ClienteFactory(UsuarioFactory):
+    email = factory.Sequence(lambda n: f'cliente{n}@exemplo.com')
+
+
+class ProfissionalFactory(UsuarioFactory):
+    email = factory.Sequence(lambda n: f'profissional{n}@exemplo.com')
+    tipo = TipoUsuario.PROFISSIONAL
+
+
+class ServicoFactory(DjangoModelFactory):
+    class Meta:
+        model = Servico
+
+    nome = factory.Iterator(['Manicure', 'Pedicure', 'Esmaltação em gel', 'Alongamento', 'Spa dos pés'])
+    descricao = factory.Faker('sentence', locale='pt_BR')
+    duracao = factory.Iterator([timedelta(minutes=30), timedelta(minutes=60), timedelta(minutes=90)])
+    preco = factory.Faker('pydecimal', left_digits=3, right_digits=2, min_value=20, max_value=300)
+
+    @factory.post_generation
+    def profissionais(self, create, extraidos, **kwargs):
+        if create and extraidos:
+            self.profissionais.add(*extraidos)
+
+
+class HorarioFactory(DjangoModelFactory):
+    class Meta:
+        model = Horario
+        django_get_or_create = ('horario',)
+
+    horario = time(9, 0)
+
+
+class HorarioExpedienteFactory(DjangoModelFactory):
+    class Meta:
+        model = HorarioExpediente
+
+    profissional = factory.SubFactory(ProfissionalFactory)
+    dia_semana = 0
+
+
+class AgendamentoFactory(DjangoModelFactory):
+    class Meta:
+        model = Agendamento
+
+    cliente = factory.SubFactory(ClienteFactory)
+    profissional = factory.SubFactory(ProfissionalFactory)
+    servico = factory.SubFactory(ServicoFactory)
+    data = factory.LazyFunction(date.today)
+    hora = time(9, 0)
+    status = 'AGENDADO'
@@ -0,0 +1,151 @@
+"""
+Montagem da grade de agenda de um ou mais profissionais.
+
+A ocupação é calculada como uma matriz (profissionais × dias) de máscaras de
+bits, em que cada máscara já representa a dimensão de slots do dia. Os dados
+de todos os profissionais são buscados com um número fixo de queries.
+
+``amontar_agendas`` é a versão para views assíncronas: as mesmas queries são
+lidas com a API assíncrona do ORM e só o cálculo roda numa thread.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from itertools import chain
+
+from asgiref.sync import sync_to_async
+
+from apps.agenda.catalogo import catalogo
+from apps.agenda.horarios import associacoes_expediente, grade_horarios, somar_mascaras
+from apps.agenda.models import Agendamento, SerieRecorrente
+from apps.agenda.disponibilidade import (
+    indices,
+    mascara_agendamento,
+    primeiro_slot,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def intervalo_datas(data_inicial, data_final):
+    """Lista as datas de ``data_inicial`` até ``data_final`` (inclusive)."""
+    return [data_inicial + timedelta(days=i) for i in range((data_final - data_inicial).days + 1)]
+
+
+def _celula_ocupada(agendamento, servicos):
+    servico = servicos.servico(agendamento.servico_id)
+    return {
+        "ocupado": True,
+        "agendamento_id": agendamento.id,
+        "cliente_id": agendamento.cliente.id,
+        "nome_cliente": str(agendamento.cliente),
+        "servico_id": agendamento.servico_id,
+        "servico_nome": servico.nome if servico else None,
+        "status": agendamento.status,
+        "recorrencia_id": str(agendamento.recorrencia_id) if agendamento.recorrencia_id else None,
+        "serie_id": agendamento.serie_id,
+    }
+
+
+def _consultas(profissional_ids, datas):
+    """Querysets, ainda não avaliados, de expedientes, agendamentos e séries do período."""
+    data_inicial, data_final = datas[0], datas[-1]
+    associacoes = associacoes_expediente(profissional_ids, {data.weekday() for data in datas})
+    agendamentos = Agendamento.objects.filter(
+        profissional_id__in=profissional_ids,
+        data__range=[data_inicial, data_final]
+    ).select_related('cliente')
+    series = SerieRecorrente.objects.no_periodo(data_inicial, data_final).filter(
+        profissional_id__in=profissional_ids
+    ).select_related('cliente')
+    return associacoes, agendamentos, series
+
+
+def montar_agendas(profissional_ids, data_inicial, data_final):
+    """
+    Retorna ``{profissional_id: linhas}`` com a agenda de cada profissional no
+    período, no mesmo formato do endpoint ``agenda``.
+    Ocorrências de séries recorrentes são expandidas no período e aparecem
+    sem 'agendamento_id' até serem materializadas.
+    Usa até 4 queries independentemente do número de profissionais e de dias
+    (as linhas de Horario vêm do cache local de ``horarios``).
+    """
+    profissional_ids = list(dict.fromkeys(profissional_ids))
+    datas = intervalo_datas(data_inicial, data_final)
+    associacoes, agendamentos, series = _consultas(profissional_ids, datas)
+    series = list(series)
+    materializadas = set(SerieRecorrente.materializadas(series, data_inicial, data_final))
+    return _montar(profissional_ids, datas, associacoes, agendamentos, series, materializadas)
+
+
+async def amontar_agendas(profissional_ids, data_inicial, data_final):
+    """Versão assíncrona de ``montar_agendas``, com as mesmas queries."""
+    profissional_ids = list(dict.fromkeys(profissional_ids))
+    datas = intervalo_datas(data_inicial, data_final)
+    associacoes, agendamentos, series = _consultas(profissional_ids, datas)
+    associacoes = [linha async for linha in associacoes]
+    agendamentos = [ag async for ag in agendamentos]
+    series = [serie async for serie in series]
+    materializadas = {par async for par in SerieRecorrente.materializadas(series, data_inicial, data_final)}
+    # A grade de horários e o catálogo podem precisar recarregar do banco
+    return await sync_to_async(_montar)(profissional_ids, datas, associacoes, agendamentos, series, materializadas)
+
+
+def _montar(profissional_ids, datas, associacoes, agendamentos, series, materializadas):
+    posicao_prof = {prof_id: p for p, prof_id in enumerate(profissional_ids)}
+    posicao_dia = {data: d for d, data in enumerate(datas)}
+
+    # --- Expedientes: máscara por (profissional, dia da semana) ---
+    horarios = grade_horarios()
+    mascaras = somar_mascaras(associacoes, horarios)
+    expediente = [
+        [mascaras.get((prof_id, data.weekday()), 0) for data in datas]
+        for prof_id in profissional_ids
+    ]
+
+    # --- Agendamentos: matriz de ocupação (profissional × dia) ---
+    ocorrencias = SerieRecorrente.ocorrencias_pendentes(series, materializadas, datas[0], datas[-1])
+
+    ocupacao = [[0] * len(datas) for _ in profissional_ids]
+    celulas = defaultdict(dict)  # (p, d) -> {indice_slot: agendamento}
+
+    for ag in chain(agendamentos, ocorrencias):
+        mascara = mascara_agendamento(ag)
+
+        if not mascara:
+            logger.warning("Agendamento ID %s com dados inválidos.", ag.id)
+            continue
+
+        p, d = posicao_prof[ag.profissional_id], posicao_dia[ag.data]
+        colisao = mascara & ocupacao[p][d]
+        if colisao:
+            logger.warning("Slots %s %s já ocupados, tentando marcar por %s", ag.data, primeiro_slot(colisao), ag.id)
+
+        for indice in indices(mascara & ~ocupacao[p][d]):
+            celulas[p, d][indice] = ag
+        ocupacao[p][d] |= mascara
+
+    # --- Montar as linhas ---
+    linhas_base = horarios.linhas
+    servicos = catalogo(*{ag.servico_id for ocupados in celulas.values() for ag in ocupados.values()})
+    datas_str = [data.strftime('%Y-%m-%d') for data in datas]
+
+    agendas = {}
+    for prof_id, p in posicao_prof.items():
+        colunas = [(datas_str[d], expediente[p][d], celulas.get((p, d), {})) for d in range(len(datas))]
+        linhas = []
+        for base in linhas_base:
+            indice, bit = base.indice, base.bit
+            linha = {"horario": base.rotulo}
+            for data_str, mascara_dia, ocupados_dia in colunas:
+                agendamento = ocupados_dia.get(indice)
+                if agendamento:
+                    linha[data_str] = _celula_ocupada(agendamento, servicos)
+                elif mascara_dia & bit:
+                    linha[data_str] = {"ocupado": False}
+                else:
+                    linha[data_str] = {"ocupado": None}
+            linhas.append(linha)
+        agendas[prof_id] = linhas
+
+    return agendas
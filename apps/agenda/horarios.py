@@ -0,0 +1,139 @@
+"""
+Cache local (por processo) das linhas de Horario sobre a grade de slots.
+
+A grade de slots (``disponibilidade.SLOTS``/``ROTULOS``) é estática. As linhas
+de Horario só mudam quando alguém cria ou apaga um Horario, então são lidas
+uma vez e guardadas num objeto imutável que mapeia pk ↔ time ↔ 'HH:MM' ↔
+índice do slot. A validade é conferida contra VERSAO_HORARIOS no cache,
+incrementada pelos signals de Horario. Com o cache compartilhado (Redis) ou
+um único processo, todos recarregam depois de uma alteração; com LocMem e
+vários processos a versão de um não muda com as escritas dos outros, então a
+grade é relida a cada chamada (ver ``cache.versoes_compartilhadas``).
+"""
+from dataclasses import dataclass
+from datetime import time
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+from apps.agenda import cache as agenda_cache
+from apps.agenda.disponibilidade import INDICE_POR_HORARIO, ROTULOS
+from config.roteamento import usar_primario
+
+
+class LinhaHorario(NamedTuple):
+    pk: int
+    horario: time
+    rotulo: str
+    indice: Optional[int]  # None quando o horário não pertence à grade de slots
+    bit: int
+
+
+@dataclass(frozen=True)
+class GradeHorarios:
+    versao: int
+    linhas: tuple  # LinhaHorario em ordem de horário
+    por_pk: MappingProxyType
+    pk_por_horario: MappingProxyType
+
+    def linhas_de(self, horario_ids):
+        """Linhas dos pks informados, em ordem de horário."""
+        horario_ids = set(horario_ids)
+        return [linha for linha in self.linhas if linha.pk in horario_ids]
+
+    def representar(self, horario_ids):
+        """Mesmo formato do HorarioSerializer: [{"id", "horario": "HH:MM"}]."""
+        return [{"id": linha.pk, "horario": linha.rotulo} for linha in self.linhas_de(horario_ids)]
+
+
+_grade = None
+
+
+@usar_primario()
+def _carregar(versao):
+    from apps.agenda.models import Horario
+
+    linhas = []
+    pk_por_horario = {}
+    for pk, horario in Horario.objects.order_by('horario', 'pk').values_list('pk', 'horario'):
+        indice = INDICE_POR_HORARIO.get(horario)
+        rotulo = ROTULOS[indice] if indice is not None else horario.strftime('%H:%M')
+        linhas.append(LinhaHorario(pk, horario, rotulo, indice, 1 << indice if indice is not None else 0))
+        pk_por_horario.setdefault(horario, pk)
+
+    return GradeHorarios(
+        versao=versao,
+        linhas=tuple(linhas),
+        por_pk=MappingProxyType({linha.pk: linha for linha in linhas}),
+        pk_por_horario=MappingProxyType(pk_por_horario),
+    )
+
+
+def grade_horarios():
+    """Retorna a GradeHorarios atual, recarregando só se um Horario mudou."""
+    global _grade
+    if not agenda_cache.versoes_compartilhadas():
+        return _carregar(None)
+    versao = agenda_cache.versoes([agenda_cache.VERSAO_HORARIOS])[agenda_cache.VERSAO_HORARIOS]
+    grade = _grade
+    if grade is None or grade.versao != versao:
+        grade = _grade = _carregar(versao)
+    return grade
+
+
+def horario_ids_por_expediente(expediente_ids):
+    """{expediente_id: [horario_id, ...]} com uma única query na tabela intermediária."""
+    from apps.agenda.models import HorarioExpediente
+
+    resultado = {expediente_id: [] for expediente_id in expediente_ids}
+    associacoes = HorarioExpediente.horarios.through.objects.filter(
+        horarioexpediente_id__in=resultado.keys()
+    ).values_list('horarioexpediente_id', 'horario_id')
+    for expediente_id, horario_id in associacoes:
+        resultado[expediente_id].append(horario_id)
+    return resultado
+
+
+def associacoes_expediente(profissional_ids, dias_semana=None):
+    """
+    Query (ainda não avaliada) das linhas (profissional_id, dia_semana, horario_id)
+    dos expedientes dos profissionais, na tabela intermediária.
+    """
+    from apps.agenda.models import HorarioExpediente
+
+    associacoes = HorarioExpediente.horarios.through.objects.filter(
+        horarioexpediente__profissional_id__in=profissional_ids
+    )
+    if dias_semana is not None:
+        associacoes = associacoes.filter(horarioexpediente__dia_semana__in=dias_semana)
+    return associacoes.values_list(
+        'horarioexpediente__profissional_id', 'horarioexpediente__dia_semana', 'horario_id'
+    )
+
+
+def somar_mascaras(associacoes, grade=None):
+    """{(profissional_id, dia_semana): máscara} a partir das linhas de ``associacoes_expediente``."""
+    grade = grade or grade_horarios()
+    mascaras = {}
+    for prof_id, dia, horario_id in associacoes:
+        linha = grade.por_pk.get(horario_id)
+        if linha:
+            mascaras[prof_id, dia] = mascaras.get((prof_id, dia), 0) | linha.bit
+    return mascaras
+
+
+def mascaras_expediente(profissional_ids, dias_semana=None):
+    """
+    {(profissional_id, dia_semana): máscara} dos expedientes dos profissionais,
+    com uma query na tabela intermediária e os bits vindos da grade local.
+    Expedientes sem horários não aparecem (equivalem à máscara 0).
+    """
+    return somar_mascaras(associacoes_expediente(profissional_ids, dias_semana))
+
+
+def anexar_horario_ids(expedientes):
+    """Preenche 'horario_ids' nos expedientes, usado pelo HorarioExpedienteSerializer."""
+    expedientes = list(expedientes)
+    por_expediente = horario_ids_por_expediente([exp.pk for exp in expedientes])
+    for expediente in expedientes:
+        expediente.horario_ids = por_expediente[expediente.pk]
+    return expedientes
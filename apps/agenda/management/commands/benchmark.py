@@ -0,0 +1,297 @@
+"""
+Benchmark dos caminhos quentes da API com volumes realistas.
+
+Cria um banco descartável (o banco de testes do Django: SQLite em memória ou
+um PostgreSQL local), popula com as factories de ``apps.agenda.factories``
+e mede cada cenário pelo APIClient. Para cada um informa, em JSON, o tempo de
+parede, a quantidade de queries e o pico de memória (tracemalloc).
+
+    python manage.py benchmark
+    python manage.py benchmark --agendamentos 50000 --repeticoes 3 --saida resultado.json
+"""
+import json
+import logging
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, time as dtime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda import cache as agenda_cache
+from apps.agenda.models import Agendamento, HorarioExpediente
+from apps.agenda.provisionamento import gravar_semanas, horarios_do_intervalo
+
+LOTE = 5000
+EXPEDIENTE = horarios_do_intervalo(dtime(8, 0), dtime(19, 30))  # segunda a sábado
+EMAIL_LOGIN = 'benchmark@exemplo.com'
+
+
+class Command(BaseCommand):
+    help = "Mede agenda, disponibilidade, criação de agendamentos, serviços e login com volumes realistas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profissionais', type=int, default=50)
+        parser.add_argument('--clientes', type=int, default=20000)
+        parser.add_argument('--agendamentos', type=int, default=500000)
+        parser.add_argument('--repeticoes', type=int, default=5, help="Execuções medidas por cenário.")
+        parser.add_argument('--semente', type=int, default=42)
+        parser.add_argument('--saida', help="Arquivo para gravar o JSON (padrão: stdout).")
+        parser.add_argument('--manter-banco', action='store_true',
+                            help="Reaproveita o banco de benchmark entre execuções (não popula de novo).")
+        parser.add_argument('--banco-atual', action='store_true',
+                            help="Usa o banco já configurado em vez de criar um descartável.")
+
+    def handle(self, *args, **opcoes):
+        # factory_boy e Faker registram cada valor gerado em DEBUG
+        for nome in ('factory', 'faker'):
+            logging.getLogger(nome).setLevel(logging.WARNING)
+
+        try:
+            setup_test_environment()  # libera o host 'testserver' do APIClient
+            ambiente_preparado = True
+        except RuntimeError:
+            ambiente_preparado = False  # já dentro do runner de testes
+
+        nome_original = connection.settings_dict['NAME']
+        try:
+            if not opcoes['banco_atual']:
+                connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=opcoes['manter_banco'])
+            resultado = self._executar(opcoes)
+        finally:
+            if not opcoes['banco_atual']:
+                connection.creation.destroy_test_db(nome_original, verbosity=0, keepdb=opcoes['manter_banco'])
+            if ambiente_preparado:
+                teardown_test_environment()
+
+        saida = json.dumps(resultado, indent=2, ensure_ascii=False)
+        if opcoes['saida']:
+            with open(opcoes['saida'], 'w', encoding='utf-8') as arquivo:
+                arquivo.write(saida)
+        else:
+            self.stdout.write(saida)
+
+    def _executar(self, opcoes):
+        inicio = time.perf_counter()
+        if not Agendamento.objects.exists():
+            popular(opcoes['profissionais'], opcoes['clientes'], opcoes['agendamentos'], random.Random(opcoes['semente']))
+        semeadura = time.perf_counter() - inicio
+
+        cenarios = Cenarios(opcoes['repeticoes'])
+        return {
+            "banco": connection.vendor,
+            "volumes": {
+                "profissionais": Usuario.objects.filter(tipo=TipoUsuario.PROFISSIONAL).count(),
+                "clientes": Usuario.objects.filter(tipo=TipoUsuario.CLIENTE).count(),
+                "agendamentos": Agendamento.objects.count(),
+            },
+            "semeadura_segundos": round(semeadura, 2),
+            "cenarios": cenarios.executar(),
+        }
+
+
+def _com_busca(usuarios):
+    # O bulk_create não passa pelo save(), que preenche a coluna de busca
+    for usuario in usuarios:
+        usuario.atualizar_busca()
+    return usuarios
+
+
+def popular(n_profissionais, n_clientes, n_agendamentos, aleatorio):
+    """Popula o banco com as factories, gravando em lotes."""
+    from apps.agenda.factories import (
+        ClienteFactory, ProfissionalFactory, ServicoFactory, UsuarioFactory, senha_hash,
+    )
+
+    with transaction.atomic():
+        UsuarioFactory(email=EMAIL_LOGIN, tipo=TipoUsuario.CLIENTE, password=senha_hash())
+        profissionais = Usuario.objects.bulk_create(
+            _com_busca(ProfissionalFactory.build_batch(n_profissionais)), batch_size=LOTE
+        )
+        clientes = Usuario.objects.bulk_create(_com_busca(ClienteFactory.build_batch(n_clientes)), batch_size=LOTE)
+        servicos = [ServicoFactory(profissionais=profissionais) for _ in range(5)]
+
+        gravar_semanas({prof.pk: {dia: EXPEDIENTE for dia in range(6)} for prof in profissionais})
+
+    # Cada profissional tem a agenda preenchida dia a dia, terminando perto de hoje
+    por_profissional = max(1, n_agendamentos // max(1, n_profissionais))
+    dias = por_profissional // 14 + 1
+    primeiro_dia = date.today() - timedelta(days=int(dias * 7 / 6))
+    lote = []
+    total = 0
+    for profissional in profissionais:
+        dia = primeiro_dia
+        criados = 0
+        while criados < por_profissional and total < n_agendamentos:
+            if dia.weekday() < 6:
+                minuto = 8 * 60
+                while minuto < 20 * 60 and criados < por_profissional and total < n_agendamentos:
+                    servico = aleatorio.choice(servicos)
+                    duracao = int(servico.duracao.total_seconds() // 60)
+                    if minuto + duracao > 20 * 60:
+                        break
+                    if aleatorio.random() < 0.85:  # deixa alguns buracos na agenda
+                        lote.append(Agendamento(
+                            cliente=aleatorio.choice(clientes),
+                            profissional=profissional,
+                            servico=servico,
+                            data=dia,
+                            hora=dtime(minuto // 60, minuto % 60),
+                            status=aleatorio.choice(('AGENDADO', 'AGENDADO', 'CONCLUIDO', 'CANCELADO')),
+                        ))
+                        criados += 1
+                        total += 1
+                    minuto += duracao
+                    if len(lote) >= LOTE:
+                        Agendamento.objects.bulk_create(lote)
+                        lote = []
+            dia += timedelta(days=1)
+    if lote:
+        Agendamento.objects.bulk_create(lote)
+
+
+class Cenarios:
+    def __init__(self, repeticoes):
+        self.repeticoes = repeticoes
+        self.api = APIClient()
+
+        self.profissional = Usuario.objects.filter(tipo=TipoUsuario.PROFISSIONAL).order_by('pk').first()
+        self.cliente = Usuario.objects.get(email=EMAIL_LOGIN)
+        # Não é gravado: só autentica a busca, que exige is_staff
+        self.admin = Usuario(email='admin@exemplo.com', tipo=TipoUsuario.ADMIN, is_staff=True)
+        # Começo do sobrenome de um cliente, que costuma casar com vários outros
+        self.termo_busca = max(self.cliente.nome_completo.split(), key=len)[:4]
+        self.servico = Servico.objects.filter(profissionais=self.profissional).order_by('duracao', 'pk').first()
+        self.expediente = HorarioExpediente.objects.filter(profissional=self.profissional, dia_semana=0).first()
+
+        ultima_data = Agendamento.objects.aggregate(ultima=Max('data'))['ultima'] or date.today()
+        self.semana_cheia = ultima_data - timedelta(days=ultima_data.weekday() + 7)  # segunda-feira
+        # Segundas-feiras livres, depois de todos os agendamentos gerados
+        self.proxima_segunda = ultima_data + timedelta(days=7 - ultima_data.weekday())
+        self.recorrencias = []
+
+    def executar(self):
+        cenarios = [
+            ('agenda_sem_cache', self.agenda, True),
+            ('agenda_com_cache', self.agenda, False),
+            ('horarios_disponiveis', self.horarios_disponiveis, False),
+            ('servicos', self.servicos, False),
+            ('buscar_clientes', self.buscar_clientes, False),
+            ('criar_agendamento', self.criar_agendamento, False),
+            ('criar_recorrencia', self.criar_recorrencia, False),
+            ('excluir_recorrencia', self.excluir_recorrencia, False),
+            ('login', self.login, False),
+        ]
+        return {nome: self.medir(funcao, limpar_cache) for nome, funcao, limpar_cache in cenarios}
+
+    def medir(self, funcao, limpar_cache):
+        """Executa o cenário 'repeticoes' vezes medindo tempo e queries, e uma vez a mais sob tracemalloc."""
+        tempos, consultas, status = [], [], set()
+        for i in range(self.repeticoes + 1):
+            if limpar_cache:
+                # Só as agendas: cache.clear() apagaria o cache inteiro (FLUSHDB no Redis)
+                agenda_cache.invalidar_tudo()
+            medir_memoria = i == self.repeticoes
+            if medir_memoria:
+                tracemalloc.start()
+            with CaptureQueriesContext(connection) as capturadas:
+                inicio = time.perf_counter()
+                response = funcao(i)
+                duracao = time.perf_counter() - inicio
+            status.add(response.status_code)
+            if medir_memoria:
+                _, pico = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            else:
+                tempos.append(duracao * 1000)
+                consultas.append(len(capturadas))
+
+        return {
+            "status": sorted(status),
+            "tempo_ms": {
+                "min": round(min(tempos), 2),
+                "mediana": round(statistics.median(tempos), 2),
+                "max": round(max(tempos), 2),
+            },
+            "queries": {"mediana": statistics.median(consultas), "max": max(consultas)},
+            "pico_memoria_kb": round(pico / 1024, 1),
+        }
+
+    def _como(self, usuario):
+        # Trocar de usuário à toa faz o APIClient gravar uma sessão nova, o que sujaria a contagem de queries
+        if getattr(self, '_usuario', None) != usuario:
+            self.api.force_authenticate(usuario)
+            self._usuario = usuario
+
+    def agenda(self, i):
+        self._como(None)
+        return self.api.get(reverse('agendamentos-agenda'), {
+            "profissional": self.profissional.pk,
+            "data_inicial": self.semana_cheia.isoformat(),
+            "data_final": (self.semana_cheia + timedelta(days=6)).isoformat(),
+        })
+
+    def horarios_disponiveis(self, i):
+        self._como(None)
+        return self.api.get(
+            reverse('expediente-horarios-disponiveis', args=[self.expediente.pk]),
+            {"data": self.semana_cheia.isoformat()}
+        )
+
+    def servicos(self, i):
+        self._como(None)
+        return self.api.get(reverse('servico-list'))
+
+    def buscar_clientes(self, i):
+        self._como(self.admin)
+        return self.api.get(reverse('usuario-buscar'), {"q": self.termo_busca, "tipo": TipoUsuario.CLIENTE})
+
+    def _payload(self, data, **extra):
+        return {
+            "cliente": self.cliente.pk,
+            "profissional": self.profissional.pk,
+            "servico": self.servico.pk,
+            "data": data.isoformat(),
+            "hora": "09:00",
+            **extra,
+        }
+
+    def criar_agendamento(self, i):
+        self._como(self.cliente)
+        data = self.proxima_segunda + timedelta(weeks=i)
+        return self.api.post(reverse('agendamentos-list'), self._payload(data), format='json')
+
+    def criar_recorrencia(self, i):
+        self._como(self.cliente)
+        # Cada execução ocupa um bloco de 12 semanas depois das usadas por criar_agendamento
+        data = self.proxima_segunda + timedelta(weeks=self.repeticoes + 1 + 12 * i)
+        response = self.api.post(
+            reverse('agendamentos-list'),
+            self._payload(data, recorrencia=1, repeticoes=12),
+            format='json'
+        )
+        if response.status_code == 201:
+            self.recorrencias.append(response.data[0]['recorrencia_id'])
+        return response
+
+    def excluir_recorrencia(self, i):
+        self._como(self.cliente)
+        return self.api.delete(
+            reverse('agendamentos-excluir-recorrencia'),
+            {"recorrencia_id": self.recorrencias[i]},
+            format='json'
+        )
+
+    def login(self, i):
+        self._como(None)
+        from apps.agenda.factories import SENHA_PADRAO
+
+        return self.api.post(reverse('token_obtain_pair'), {"email": EMAIL_LOGIN, "password": SENHA_PADRAO}, format='json')
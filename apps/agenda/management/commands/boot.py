@@ -0,0 +1,129 @@
+"""
+Inicialização do container: estáticos, migrações, superusuário e aquecimento.
+
+Cada etapa confere antes se há trabalho a fazer, então subir de novo um
+container já atualizado custa só algumas leituras:
+
+- estáticos: compara um hash da lista de arquivos de origem (caminho, tamanho
+  e mtime) com o gravado em STATIC_ROOT na última coleta; o ``collectstatic``
+  só roda se forem diferentes;
+- migrações: calcula o plano (uma query em django_migrations) e só chama o
+  ``migrate`` se houver alguma pendente;
+- superusuário: um ``exists()`` pelo e-mail, criando só se faltar;
+- ``--aquecer``: monta as grades da semana no cache (ver
+  ``apps.agenda.aquecimento``). Só com um cache fora do processo (Redis): o
+  LocMem do boot seria descartado junto com ele, então a etapa é pulada.
+
+    python manage.py boot --aquecer && exec gunicorn ...
+    python manage.py boot --sem-banco   # no build da imagem: só os estáticos
+
+O superusuário vem de DJANGO_SUPERUSER_EMAIL / DJANGO_SUPERUSER_PASSWORD.
+"""
+import hashlib
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from apps.agenda import cache as agenda_cache
+from apps.agenda.aquecimento import aquecer
+from apps.usuario.models import Usuario
+
+logger = logging.getLogger(__name__)
+
+# Os mesmos padrões ignorados por padrão pelo collectstatic
+IGNORAR_ESTATICOS = ['CVS', '.*', '*~']
+MARCADOR_ESTATICOS = '.boot-estaticos'
+
+ADMIN_EMAIL_PADRAO = 'admin@admin.com'
+ADMIN_SENHA_PADRAO = 'admin'
+
+
+def hash_estaticos():
+    """Hash da lista de arquivos que o collectstatic copiaria (caminho, tamanho e mtime)."""
+    arquivos = []
+    for finder in finders.get_finders():
+        for caminho, storage in finder.list(IGNORAR_ESTATICOS):
+            prefixo = getattr(storage, 'prefix', None) or ''
+            info = os.stat(storage.path(caminho))
+            arquivos.append(f'{prefixo}/{caminho}\0{info.st_size}\0{info.st_mtime_ns}')
+    return hashlib.sha256('\n'.join(sorted(arquivos)).encode()).hexdigest()
+
+
+class Command(BaseCommand):
+    help = "Prepara o ambiente para o servidor, pulando o que já estiver em dia."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sem-banco', action='store_true',
+                            help="Só coleta os estáticos (ex.: no build da imagem, sem banco).")
+        parser.add_argument('--aquecer', action='store_true',
+                            help="Aquece os caches e as grades da agenda da semana.")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **opcoes):
+        self.verbosity = opcoes['verbosity']
+        self._etapa('estáticos', self.coletar_estaticos)
+        if opcoes['sem_banco']:
+            return
+        self._etapa('migrações', self.migrar, opcoes['database'])
+        self._etapa('superusuário', self.garantir_admin)
+        if opcoes['aquecer']:
+            self._etapa('aquecimento', self.aquecer)
+
+    def _etapa(self, nome, funcao, *args):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        if self.verbosity:
+            self.stdout.write(f">> {nome}: {resultado} ({(time.perf_counter() - inicio) * 1000:.0f} ms)")
+
+    def coletar_estaticos(self):
+        marcador = os.path.join(settings.STATIC_ROOT, MARCADOR_ESTATICOS)
+        atual = hash_estaticos()
+        try:
+            with open(marcador) as arquivo:
+                if arquivo.read().strip() == atual:
+                    return "em dia"
+        except FileNotFoundError:
+            pass
+
+        call_command('collectstatic', interactive=False, verbosity=max(self.verbosity - 1, 0))
+        with open(marcador, 'w') as arquivo:
+            arquivo.write(atual)
+        return "coletados"
+
+    def migrar(self, database):
+        executor = MigrationExecutor(connections[database])
+        plano = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if not plano:
+            # Pula também os signals de post_migrate (permissões e content types de todos os models)
+            return "em dia"
+        call_command('migrate', database=database, interactive=False, verbosity=max(self.verbosity - 1, 0))
+        return f"{len(plano)} aplicada(s)"
+
+    def garantir_admin(self):
+        email = os.getenv('DJANGO_SUPERUSER_EMAIL', ADMIN_EMAIL_PADRAO)
+        if Usuario.objects.filter(email=email).exists():
+            return "já existe"
+
+        senha = os.getenv('DJANGO_SUPERUSER_PASSWORD')
+        if not senha:
+            logger.warning("DJANGO_SUPERUSER_PASSWORD não definida; criando %s com a senha padrão.", email)
+            senha = ADMIN_SENHA_PADRAO
+        try:
+            Usuario.objects.create_superuser(email=email, password=senha, nome_completo='Admin')
+        except IntegrityError:
+            # Outra réplica criou ao mesmo tempo
+            return "já existe"
+        return f"{email} criado"
+
+    def aquecer(self):
+        if agenda_cache.cache_local():
+            return "pulado (cache local ao processo, sem REDIS_URL)"
+        resumo = aquecer()
+        return f"{resumo['grades_montadas']} grade(s) montada(s) de {resumo['profissionais']} profissional(is)"
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def preencher_inicio_fim(apps, schema_editor):
+    Agendamento = apps.get_model('agenda', 'Agendamento')
+    lote = []
+    for ag in Agendamento.objects.select_related('servico').iterator(chunk_size=2000):
+        inicio = datetime.combine(ag.data, ag.hora)
+        if ag.duracao_personalizada:
+            fim = inicio + timedelta(minutes=ag.duracao_personalizada)
+        else:
+            fim = inicio + ag.servico.duracao
+        ag.inicio = timezone.make_aware(inicio)
+        ag.fim = timezone.make_aware(fim)
+        lote.append(ag)
+        if len(lote) >= 2000:
+            Agendamento.objects.bulk_update(lote, ['inicio', 'fim'])
+            lote = []
+    if lote:
+        Agendamento.objects.bulk_update(lote, ['inicio', 'fim'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agenda', '0006_agendamento_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agendamento',
+            name='inicio',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='agendamento',
+            name='fim',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(preencher_inicio_fim, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='agendamento',
+            index=models.Index(fields=['profissional', 'inicio', 'fim'], name='agendamento_prof_periodo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='agendamento',
+            index=models.Index(fields=['cliente', 'inicio', 'fim'], name='agendamento_cli_periodo_idx'),
+        ),
+    ]
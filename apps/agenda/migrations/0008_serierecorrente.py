@@ -0,0 +1,57 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agenda', '0007_agendamento_inicio_fim'),
+        ('servicos', '0004_alter_servico_duracao_alter_servico_preco_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agendamento',
+            name='data_ocorrencia',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='SerieRecorrente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hora', models.TimeField()),
+                ('duracao_personalizada', models.PositiveIntegerField(blank=True, help_text='Duração personalizada em minutos para as ocorrências (opcional).', null=True)),
+                ('data_inicio', models.DateField()),
+                ('intervalo_semanas', models.PositiveSmallIntegerField(default=1, help_text='Intervalo entre ocorrências: 1 (semanal), 2 (quinzenal), 4 (mensal).')),
+                ('repeticoes', models.PositiveIntegerField(blank=True, null=True)),
+                ('data_fim', models.DateField(blank=True, help_text='Última data possível da série. Vazio para séries sem fim.', null=True)),
+                ('cliente', models.ForeignKey(limit_choices_to={'tipo': 'CLIENTE'}, on_delete=django.db.models.deletion.CASCADE, related_name='series_como_cliente', to=settings.AUTH_USER_MODEL)),
+                ('profissional', models.ForeignKey(limit_choices_to={'tipo': 'PROFISSIONAL'}, on_delete=django.db.models.deletion.CASCADE, related_name='series_como_profissional', to=settings.AUTH_USER_MODEL)),
+                ('servico', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='servicos.servico')),
+            ],
+            options={
+                'verbose_name': 'Série recorrente',
+                'verbose_name_plural': 'Séries recorrentes',
+                'ordering': ['data_inicio', 'hora'],
+            },
+        ),
+        migrations.AddField(
+            model_name='agendamento',
+            name='serie',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ocorrencias_materializadas', to='agenda.serierecorrente'),
+        ),
+        migrations.AddConstraint(
+            model_name='agendamento',
+            constraint=models.UniqueConstraint(fields=('serie', 'data_ocorrencia'), name='agendamento_ocorrencia_unica'),
+        ),
+        migrations.AddIndex(
+            model_name='serierecorrente',
+            index=models.Index(fields=['profissional', 'data_inicio', 'data_fim'], name='serie_prof_vigencia_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='serierecorrente',
+            index=models.Index(fields=['cliente', 'data_inicio', 'data_fim'], name='serie_cli_vigencia_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agenda', '0008_serierecorrente'),
+        ('servicos', '0004_alter_servico_duracao_alter_servico_preco_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='agendamento',
+            index=models.Index(fields=['data', 'hora', 'id'], name='agendamento_lista_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='agendamento',
+            index=models.Index(fields=['profissional', 'data', 'hora', 'id'], name='agendamento_lista_prof_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='agendamento',
+            index=models.Index(fields=['cliente', 'data', 'hora', 'id'], name='agendamento_lista_cli_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='agendamento',
+            index=models.Index(fields=['status', 'data', 'hora', 'id'], name='agendamento_lista_status_idx'),
+        ),
+    ]
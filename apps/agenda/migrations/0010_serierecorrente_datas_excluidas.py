@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 16:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agenda', '0009_agendamento_indices_listagem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='serierecorrente',
+            name='datas_excluidas',
+            field=models.JSONField(blank=True, default=list, help_text="Datas ('YYYY-MM-DD') em que a série não ocorre."),
+        ),
+    ]
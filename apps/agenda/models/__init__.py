@@ -1,2 +1,3 @@
 from .expediente import HorarioExpediente, Horario
+from .serie import SerieRecorrente
 from .agendamento import Agendamento
\ No newline at end of file
@@ -1,10 +1,51 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+from collections import defaultdict
 from datetime import datetime, timedelta
 from uuid import uuid4 
 
 from apps.agenda.models.expediente import HorarioExpediente
+from apps.agenda.models.serie import SerieRecorrente
+from apps.agenda.catalogo import catalogo
+from apps.agenda.disponibilidade import (
+    horario_fora_do_expediente,
+    mascara_expediente,
+)
 from apps.servicos.models import Servico
+from config.roteamento import usar_primario
+
+
+# Campos dos quais 'inicio' e 'fim' dependem
+CAMPOS_PERIODO = frozenset({'data', 'hora', 'duracao_personalizada', 'servico', 'servico_id'})
+
+
+class AgendamentoQuerySet(models.QuerySet):
+    """
+    Mantém 'inicio' e 'fim' também nas escritas que não passam por save():
+    ``bulk_create`` recalcula o período de cada objeto e ``update`` que altera
+    data, hora, duração ou serviço recalcula o das linhas afetadas.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.atualizar_periodo()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if CAMPOS_PERIODO.isdisjoint(kwargs):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list('pk', flat=True))
+            linhas = super().update(**kwargs)
+            # O base manager não passa por este update(): grava só 'inicio' e 'fim'
+            base = self.model._base_manager.using(self.db)
+            alterados = list(base.filter(pk__in=pks).select_related('servico'))
+            for agendamento in alterados:
+                agendamento.atualizar_periodo()
+            base.bulk_update(alterados, ['inicio', 'fim'])
+        return linhas
 
 
 class Agendamento(models.Model):
@@ -42,10 +83,40 @@ class Agendamento(models.Model):
 
     recorrencia_id = models.UUIDField(null=True, blank=True, db_index=True)
 
+    # Ocorrência materializada de uma SerieRecorrente (data original da ocorrência)
+    serie = models.ForeignKey(
+        SerieRecorrente,
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name='ocorrencias_materializadas'
+    )
+    data_ocorrencia = models.DateField(null=True, blank=True)
+
+    # Início e fim desnormalizados para consultas de conflito por intervalo. São
+    # mantidos por save() e pelo AgendamentoQuerySet (bulk_create e update); quem
+    # grava por outro caminho (SQL direto, bulk_update de data/hora) deve chamar
+    # atualizar_periodo() antes.
+    inicio = models.DateTimeField(null=True, blank=True, editable=False)
+    fim = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = AgendamentoQuerySet.as_manager()
+
     class Meta:
         ordering = ['data', 'hora']
         verbose_name = "Agendamento"
         verbose_name_plural = "Agendamentos"
+        indexes = [
+            models.Index(fields=['profissional', 'inicio', 'fim'], name='agendamento_prof_periodo_idx'),
+            models.Index(fields=['cliente', 'inicio', 'fim'], name='agendamento_cli_periodo_idx'),
+            # Listagem paginada por (data, hora, id), com ou sem filtro
+            models.Index(fields=['data', 'hora', 'id'], name='agendamento_lista_idx'),
+            models.Index(fields=['profissional', 'data', 'hora', 'id'], name='agendamento_lista_prof_idx'),
+            models.Index(fields=['cliente', 'data', 'hora', 'id'], name='agendamento_lista_cli_idx'),
+            models.Index(fields=['status', 'data', 'hora', 'id'], name='agendamento_lista_status_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['serie', 'data_ocorrencia'], name='agendamento_ocorrencia_unica'),
+        ]
 
     def __str__(self):
         hora_formatada = self.hora.strftime('%H:%M')
@@ -66,11 +137,20 @@ class Agendamento(models.Model):
             return None
         if self.duracao_personalizada:
             return inicio + timedelta(minutes=self.duracao_personalizada)
-        try:
-            return inicio + self.servico.duracao
-        except (Servico.DoesNotExist, AttributeError):
-            return None
+        if self._meta.get_field('servico').is_cached(self):
+            duracao = getattr(self.servico, 'duracao', None)
+        else:
+            duracao = catalogo(self.servico_id).duracao(self.servico_id)
+        return inicio + duracao if duracao else None
+
+    def atualizar_periodo(self):
+        """Recalcula os campos desnormalizados 'inicio' e 'fim' a partir de data, hora e duração."""
+        inicio_dt = self.hora_inicio_dt
+        fim_dt = self.hora_fim_dt
+        self.inicio = timezone.make_aware(inicio_dt) if inicio_dt else None
+        self.fim = timezone.make_aware(fim_dt) if fim_dt else None
 
+    @usar_primario()
     def clean(self):
         """Validações personalizadas para o agendamento."""
         super().clean()
@@ -88,54 +168,179 @@ class Agendamento(models.Model):
             raise ValidationError("A duração do serviço resulta em um horário de término inválido.")
 
         # Validação: O profissional oferece o serviço?
-        servico_obj = Servico.objects.filter(pk=self.servico_id).first()
-        if not servico_obj:
+        servico_catalogo = catalogo(self.servico_id).servico(self.servico_id)
+        if not servico_catalogo:
             raise ValidationError("Serviço selecionado não existe.")
-        if self.profissional not in servico_obj.profissionais.all():
-            raise ValidationError(f"O serviço '{servico_obj.nome}' não é oferecido pelo profissional '{self.profissional.nome_completo}'.")
+        if self.profissional_id not in servico_catalogo.profissionais:
+            raise ValidationError(f"O serviço '{servico_catalogo.nome}' não é oferecido pelo profissional '{self.profissional.nome_completo}'.")
 
         # Validação: O horário está dentro do expediente do profissional?
         dia_semana = self.data.weekday()
         try:
             expediente = HorarioExpediente.objects.prefetch_related('horarios').get(
-                profissional=self.profissional,
+                profissional_id=self.profissional_id,
                 dia_semana=dia_semana
             )
-            horarios_expediente_set = {h.horario for h in expediente.horarios.all()}
         except HorarioExpediente.DoesNotExist:
             raise ValidationError(f"O profissional {self.profissional} não possui expediente na data {self.data.strftime('%d/%m/%Y')}.")
 
-        horario_atual_dt = inicio_dt
-        while horario_atual_dt < fim_dt:
-            slot_time = horario_atual_dt.time()
-            if slot_time not in horarios_expediente_set:
-                hora_fmt = slot_time.strftime('%H:%M')
-                raise ValidationError(f"O horário {hora_fmt} (necessário devido à duração) está fora do expediente do profissional.")
-            horario_atual_dt += timedelta(minutes=30)  # Incremento de 30 minutos
+        duracao = fim_dt - inicio_dt
+        horario_fora = horario_fora_do_expediente(self.hora, duracao, mascara_expediente(expediente))
+        if horario_fora:
+            hora_fmt = horario_fora.strftime('%H:%M')
+            raise ValidationError(f"O horário {hora_fmt} (necessário devido à duração) está fora do expediente do profissional.")
+
+        inicio = timezone.make_aware(inicio_dt)
+        fim = timezone.make_aware(fim_dt)
+
+        existentes = Agendamento.objects.exclude(pk=self.pk)
+        if self.serie_id and not self.pk:
+            # Ocorrência virtual: as linhas da própria série não são conflitos
+            existentes = existentes.exclude(serie_id=self.serie_id)
 
         # Validação: Conflito com outros agendamentos do profissional
-        agendamentos_conflitantes_qs = Agendamento.objects.filter(
-            profissional=self.profissional,
-            data=self.data
-        ).exclude(pk=self.pk).select_related('servico')
+        hora_conflito = existentes.filter(
+            profissional_id=self.profissional_id,
+            inicio__lt=fim,
+            fim__gt=inicio
+        ).order_by('inicio').values_list('hora', flat=True).first()
 
-        for ag in agendamentos_conflitantes_qs:
-            if (inicio_dt < ag.hora_fim_dt) and (fim_dt > ag.hora_inicio_dt):
-                hora_fmt = ag.hora_inicio_dt.strftime('%H:%M')
-                raise ValidationError(f"Conflito: Este horário sobrepõe um agendamento existente do profissional às {hora_fmt}.")
+        if hora_conflito is not None:
+            hora_fmt = hora_conflito.strftime('%H:%M')
+            raise ValidationError(f"Conflito: Este horário sobrepõe um agendamento existente do profissional às {hora_fmt}.")
 
         # Validação: Conflito com outros agendamentos do cliente
-        agendamentos_cliente_qs = Agendamento.objects.filter(
-            cliente=self.cliente,
-            data=self.data
-        ).exclude(pk=self.pk).select_related('servico')
-
-        for ag in agendamentos_cliente_qs:
-            if (inicio_dt < ag.hora_fim_dt) and (fim_dt > ag.hora_inicio_dt):
-                hora_fmt = ag.hora_inicio_dt.strftime('%H:%M')
+        hora_conflito = existentes.filter(
+            cliente_id=self.cliente_id,
+            inicio__lt=fim,
+            fim__gt=inicio
+        ).order_by('inicio').values_list('hora', flat=True).first()
+
+        if hora_conflito is not None:
+            hora_fmt = hora_conflito.strftime('%H:%M')
+            raise ValidationError(f"Conflito: O cliente já possui um agendamento neste período (iniciando às {hora_fmt}).")
+
+        # Validação: Conflito com ocorrências (não materializadas) de séries recorrentes
+        series = SerieRecorrente.objects.no_periodo(self.data, self.data).filter(
+            models.Q(profissional_id=self.profissional_id) | models.Q(cliente_id=self.cliente_id)
+        ).exclude(pk=self.serie_id)
+
+        for ocorrencia in sorted(SerieRecorrente.expandir(series, self.data, self.data),
+                                 key=lambda oc: (oc.profissional_id != self.profissional_id, oc.inicio)):
+            if inicio < ocorrencia.fim and fim > ocorrencia.inicio:
+                hora_fmt = ocorrencia.hora.strftime('%H:%M')
+                if ocorrencia.profissional_id == self.profissional_id:
+                    raise ValidationError(f"Conflito: Este horário sobrepõe um agendamento existente do profissional às {hora_fmt}.")
                 raise ValidationError(f"Conflito: O cliente já possui um agendamento neste período (iniciando às {hora_fmt}).")
 
+    @classmethod
+    def validar_lote(cls, agendamentos):
+        """
+        Valida de uma vez ocorrências que compartilham profissional, cliente e serviço
+        (ex.: uma recorrência), com as mesmas regras de clean().
+        Faz um número fixo de queries e retorna {índice: mensagem de erro}.
+        """
+        if not agendamentos:
+            return {}
+        base = agendamentos[0]
+        erros = {}
+
+        # Validação: O profissional oferece o serviço?
+        if not catalogo(base.servico_id).habilitado(base.servico_id, base.profissional_id):
+            mensagem = f"O serviço '{base.servico.nome}' não é oferecido pelo profissional '{base.profissional.nome_completo}'."
+            return {i: mensagem for i in range(len(agendamentos))}
+
+        periodos = {}
+        for i, ag in enumerate(agendamentos):
+            inicio_dt, fim_dt = ag.hora_inicio_dt, ag.hora_fim_dt
+            if not inicio_dt or not fim_dt or fim_dt <= inicio_dt:
+                erros[i] = "A duração do serviço resulta em um horário de término inválido."
+            else:
+                periodos[i] = (inicio_dt, fim_dt)
+        if not periodos:
+            return erros
+
+        # Validação: O horário está dentro do expediente do profissional?
+        expedientes = HorarioExpediente.objects.filter(
+            profissional_id=base.profissional_id,
+            dia_semana__in={agendamentos[i].data.weekday() for i in periodos}
+        ).prefetch_related('horarios')
+        mascaras = {exp.dia_semana: mascara_expediente(exp) for exp in expedientes}
+
+        for i, (inicio_dt, fim_dt) in list(periodos.items()):
+            ag = agendamentos[i]
+            mascara = mascaras.get(ag.data.weekday())
+            if mascara is None:
+                erros[i] = f"O profissional {ag.profissional} não possui expediente na data {ag.data.strftime('%d/%m/%Y')}."
+                del periodos[i]
+                continue
+            horario_fora = horario_fora_do_expediente(ag.hora, fim_dt - inicio_dt, mascara)
+            if horario_fora:
+                hora_fmt = horario_fora.strftime('%H:%M')
+                erros[i] = f"O horário {hora_fmt} (necessário devido à duração) está fora do expediente do profissional."
+                del periodos[i]
+        if not periodos:
+            return erros
+
+        # Validação: Conflitos do profissional e do cliente, com uma única consulta de intervalo
+        periodos = {
+            i: (timezone.make_aware(inicio_dt), timezone.make_aware(fim_dt))
+            for i, (inicio_dt, fim_dt) in periodos.items()
+        }
+        por_data = defaultdict(list)
+        for i in periodos:
+            por_data[agendamentos[i].data].append(i)
+
+        existentes = Agendamento.objects.filter(
+            models.Q(profissional_id=base.profissional_id) | models.Q(cliente_id=base.cliente_id),
+            inicio__lt=max(fim for _, fim in periodos.values()),
+            fim__gt=min(inicio for inicio, _ in periodos.values())
+        ).exclude(pk__in=[ag.pk for ag in agendamentos if ag.pk]).values_list(
+            'profissional_id', 'inicio', 'fim', 'hora'
+        )
+        datas = [agendamentos[i].data for i in periodos]
+        series = SerieRecorrente.objects.no_periodo(min(datas), max(datas)).filter(
+            models.Q(profissional_id=base.profissional_id) | models.Q(cliente_id=base.cliente_id)
+        )
+        existentes = list(existentes) + [
+            (oc.profissional_id, oc.inicio, oc.fim, oc.hora)
+            for oc in SerieRecorrente.expandir(series, min(datas), max(datas))
+        ]
+        # Conflitos do profissional têm precedência, como em clean()
+        existentes = sorted(existentes, key=lambda e: (e[0] != base.profissional_id, e[1]))
+
+        for profissional_id, inicio_existente, fim_existente, hora_existente in existentes:
+            datas = {timezone.localdate(inicio_existente), timezone.localdate(fim_existente)}
+            for data in datas:
+                for i in por_data.get(data, ()):
+                    if i in erros:
+                        continue
+                    inicio, fim = periodos[i]
+                    if inicio < fim_existente and fim > inicio_existente:
+                        hora_fmt = hora_existente.strftime('%H:%M')
+                        if profissional_id == base.profissional_id:
+                            erros[i] = f"Conflito: Este horário sobrepõe um agendamento existente do profissional às {hora_fmt}."
+                        else:
+                            erros[i] = f"Conflito: O cliente já possui um agendamento neste período (iniciando às {hora_fmt})."
+
+        return erros
+
+    def delete(self, *args, **kwargs):
+        """
+        Excluir uma ocorrência materializada pula a data na série; sem isso a
+        ocorrência virtual voltaria a aparecer.
+        """
+        if not (self.serie_id and self.data_ocorrencia):
+            return super().delete(*args, **kwargs)
+        with transaction.atomic():
+            self.serie.excluir_data(self.data_ocorrencia)
+            return super().delete(*args, **kwargs)
+
     def save(self, *args, **kwargs):
-        """Chama clean() antes de salvar."""
+        """Mantém 'inicio' e 'fim' sincronizados antes de salvar."""
         # self.clean()
+        self.atualizar_periodo()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'inicio', 'fim'}
         super().save(*args, **kwargs)
\ No newline at end of file
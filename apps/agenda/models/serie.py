@@ -0,0 +1,238 @@
+from django.db import models, transaction
+from django.core.exceptions import ValidationError
+from datetime import date, timedelta
+
+from apps.servicos.models import Servico
+from config.roteamento import usar_primario
+
+
+class SerieRecorrenteQuerySet(models.QuerySet):
+    def no_periodo(self, data_inicial, data_final):
+        """Séries com alguma vigência entre data_inicial e data_final."""
+        return self.filter(data_inicio__lte=data_final).filter(
+            models.Q(data_fim__isnull=True) | models.Q(data_fim__gte=data_inicial)
+        )
+
+
+class SerieRecorrente(models.Model):
+    """
+    Regra de uma recorrência (ex.: toda semana às 09:00), armazenada uma única vez.
+    As ocorrências são expandidas sob demanda; só viram linhas de Agendamento
+    quando são materializadas (edição, conclusão ou cancelamento individual).
+    Datas puladas ficam em 'datas_excluidas' e deixam de gerar ocorrência.
+    """
+    cliente = models.ForeignKey(
+        'usuario.Usuario',
+        on_delete=models.CASCADE,
+        limit_choices_to={'tipo': 'CLIENTE'},
+        related_name='series_como_cliente'
+    )
+    profissional = models.ForeignKey(
+        'usuario.Usuario',
+        on_delete=models.CASCADE,
+        limit_choices_to={'tipo': 'PROFISSIONAL'},
+        related_name='series_como_profissional'
+    )
+    servico = models.ForeignKey(Servico, on_delete=models.CASCADE)
+    hora = models.TimeField()
+    duracao_personalizada = models.PositiveIntegerField(
+        null=True, blank=True,
+        help_text="Duração personalizada em minutos para as ocorrências (opcional)."
+    )
+
+    data_inicio = models.DateField()
+    intervalo_semanas = models.PositiveSmallIntegerField(
+        default=1,
+        help_text="Intervalo entre ocorrências: 1 (semanal), 2 (quinzenal), 4 (mensal)."
+    )
+    repeticoes = models.PositiveIntegerField(null=True, blank=True)
+    data_fim = models.DateField(
+        null=True, blank=True,
+        help_text="Última data possível da série. Vazio para séries sem fim."
+    )
+    datas_excluidas = models.JSONField(
+        default=list, blank=True,
+        help_text="Datas ('YYYY-MM-DD') em que a série não ocorre."
+    )
+
+    objects = SerieRecorrenteQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['data_inicio', 'hora']
+        verbose_name = "Série recorrente"
+        verbose_name_plural = "Séries recorrentes"
+        indexes = [
+            models.Index(fields=['profissional', 'data_inicio', 'data_fim'], name='serie_prof_vigencia_idx'),
+            models.Index(fields=['cliente', 'data_inicio', 'data_fim'], name='serie_cli_vigencia_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.cliente} com {self.profissional} a cada {self.intervalo_semanas} semana(s) às {self.hora.strftime('%H:%M')}"
+
+    @property
+    def passo(self):
+        return timedelta(weeks=self.intervalo_semanas)
+
+    @staticmethod
+    def fim_por_repeticoes(data_inicio, intervalo_semanas, repeticoes):
+        """Data da última de ``repeticoes`` ocorrências, ou None sem repetições."""
+        if not repeticoes:
+            return None
+        return data_inicio + timedelta(weeks=intervalo_semanas * (repeticoes - 1))
+
+    def datas(self, data_inicial, data_final):
+        """Gera as datas das ocorrências entre data_inicial e data_final (inclusive), sem as excluídas."""
+        inicio = max(data_inicial, self.data_inicio)
+        fim = min(data_final, self.data_fim) if self.data_fim else data_final
+        excluidas = {date.fromisoformat(valor) for valor in self.datas_excluidas}
+        dias_passo = self.passo.days
+        saltos = -(-(inicio - self.data_inicio).days // dias_passo)
+        data = self.data_inicio + timedelta(days=saltos * dias_passo)
+        while data <= fim:
+            if data not in excluidas:
+                yield data
+            data += self.passo
+
+    def excluir_data(self, data):
+        """Pula a ocorrência da data, que deixa de ser expandida."""
+        with transaction.atomic():
+            # Trava a linha para que exclusões simultâneas não se percam
+            serie = SerieRecorrente.objects.select_for_update().get(pk=self.pk)
+            if data.isoformat() not in serie.datas_excluidas:
+                serie.datas_excluidas = sorted([*serie.datas_excluidas, data.isoformat()])
+                serie.save(update_fields=['datas_excluidas'])
+        self.datas_excluidas = serie.datas_excluidas
+
+    def ocorre_em(self, data):
+        return next(self.datas(data, data), None) is not None
+
+    def ocorrencia(self, data):
+        """Retorna a ocorrência da data como um Agendamento não salvo."""
+        from apps.agenda.models.agendamento import Agendamento
+
+        agendamento = Agendamento(
+            cliente_id=self.cliente_id,
+            profissional_id=self.profissional_id,
+            servico_id=self.servico_id,
+            data=data,
+            hora=self.hora,
+            duracao_personalizada=self.duracao_personalizada,
+            serie=self,
+            data_ocorrencia=data,
+        )
+        # Reaproveita as relações já carregadas (select_related) sem forçar novas queries
+        for campo in ('cliente', 'profissional', 'servico'):
+            if self._meta.get_field(campo).is_cached(self):
+                setattr(agendamento, campo, getattr(self, campo))
+        agendamento.atualizar_periodo()
+        return agendamento
+
+    @classmethod
+    def expandir(cls, series, data_inicial, data_final):
+        """
+        Expande as séries em ocorrências virtuais no período, ignorando as datas
+        que já foram materializadas. Faz no máximo uma query além da das séries.
+        """
+        series = list(series)
+        if not series:
+            return []
+        materializadas = set(cls.materializadas(series, data_inicial, data_final))
+        return cls.ocorrencias_pendentes(series, materializadas, data_inicial, data_final)
+
+    @staticmethod
+    def materializadas(series, data_inicial, data_final):
+        """Query dos pares (serie_id, data_ocorrencia) já materializados no período."""
+        from apps.agenda.models.agendamento import Agendamento
+
+        if not series:
+            return Agendamento.objects.none().values_list('serie_id', 'data_ocorrencia')
+        return Agendamento.objects.filter(
+            serie__in=series,
+            data_ocorrencia__range=[data_inicial, data_final]
+        ).values_list('serie_id', 'data_ocorrencia')
+
+    @staticmethod
+    def ocorrencias_pendentes(series, materializadas, data_inicial, data_final):
+        """Ocorrências das séries no período cujo par (serie_id, data) não está em ``materializadas``."""
+        return [
+            serie.ocorrencia(data)
+            for serie in series
+            for data in serie.datas(data_inicial, data_final)
+            if (serie.id, data) not in materializadas
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.repeticoes and not self.data_fim:
+            self.data_fim = self.fim_por_repeticoes(self.data_inicio, self.intervalo_semanas, self.repeticoes)
+        super().save(*args, **kwargs)
+
+    def _datas_em_comum(self, outra):
+        """Indica se duas séries do mesmo dia da semana têm alguma data em comum."""
+        inicio = max(self.data_inicio, outra.data_inicio)
+        fins = [d for d in (self.data_fim, outra.data_fim) if d]
+        fim = min(fins) if fins else None
+        # O padrão de datas em comum se repete a cada mmc(intervalos) semanas
+        janela = inicio + timedelta(weeks=self.intervalo_semanas * outra.intervalo_semanas)
+        fim = min(fim, janela) if fim else janela
+        datas_outra = set(outra.datas(inicio, fim))
+        return any(data in datas_outra for data in self.datas(inicio, fim))
+
+    @usar_primario()
+    def clean(self):
+        """
+        Valida a regra e as ocorrências da série: serviço, expediente e conflitos
+        com agendamentos e outras séries do profissional e do cliente.
+        """
+        super().clean()
+
+        if not self.intervalo_semanas:
+            raise ValidationError("O intervalo da série deve ser de pelo menos 1 semana.")
+        if self.data_fim and self.data_fim < self.data_inicio:
+            raise ValidationError("A data final da série não pode ser anterior à data inicial.")
+        if not self.servico_id or not self.profissional_id or not self.cliente_id or not self.hora:
+            return
+
+        # Serviço, expediente e conflitos da primeira data seguem as regras de Agendamento
+        self.ocorrencia(self.data_inicio).clean()
+
+        from apps.agenda.models.agendamento import Agendamento
+
+        # Conflitos com agendamentos já existentes nas datas futuras da série
+        dia_semana = (self.data_inicio.weekday() + 1) % 7 + 1  # __week_day: 1 = domingo
+        existentes = Agendamento.objects.filter(
+            models.Q(profissional_id=self.profissional_id) | models.Q(cliente_id=self.cliente_id),
+            data__gt=self.data_inicio,
+            data__week_day=dia_semana,
+        )
+        if self.data_fim:
+            existentes = existentes.filter(data__lte=self.data_fim)
+        if self.pk:
+            existentes = existentes.exclude(serie_id=self.pk)
+
+        for ag in existentes:
+            if not self.ocorre_em(ag.data):
+                continue
+            ocorrencia = self.ocorrencia(ag.data)
+            if ag.fim and ocorrencia.inicio < ag.fim and ocorrencia.fim > ag.inicio:
+                raise ValidationError(
+                    f"Conflito: A série sobrepõe um agendamento existente em {ag.data.strftime('%d/%m/%Y')} às {ag.hora.strftime('%H:%M')}."
+                )
+
+        # Conflitos com outras séries no mesmo dia da semana e horário
+        outras = SerieRecorrente.objects.filter(
+            models.Q(profissional_id=self.profissional_id) | models.Q(cliente_id=self.cliente_id),
+            data_inicio__week_day=dia_semana,
+        ).exclude(pk=self.pk)
+        if self.data_fim:
+            outras = outras.filter(data_inicio__lte=self.data_fim)
+        outras = outras.filter(models.Q(data_fim__isnull=True) | models.Q(data_fim__gte=self.data_inicio))
+
+        referencia = self.ocorrencia(self.data_inicio)
+        for outra in outras:
+            outra_ocorrencia = outra.ocorrencia(self.data_inicio)
+            sobrepoe = (referencia.hora_inicio_dt < outra_ocorrencia.hora_fim_dt
+                        and referencia.hora_fim_dt > outra_ocorrencia.hora_inicio_dt)
+            if sobrepoe and self._datas_em_comum(outra):
+                raise ValidationError(
+                    f"Conflito: A série sobrepõe outra série recorrente às {outra.hora.strftime('%H:%M')}."
+                )
@@ -0,0 +1,106 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+class CursorComposto(CursorPagination):
+    """
+    CursorPagination cuja posição é a tupla de todos os campos de ``ordering``.
+
+    O CursorPagination do DRF guarda no cursor só o valor do primeiro campo e
+    pula, com OFFSET, as linhas que o repetem; num dia cheio a página vira uma
+    varredura. Aqui ``ordering`` termina num campo único (o id), a posição é
+    a linha inteira e a página seguinte começa logo depois dela:
+    ``(a, b, id) > (x, y, z)``, escrito como ``a >= x AND (a > x OR
+    (a = x AND b > y) OR (a = x AND b = y AND id > z))`` para que o banco
+    percorra o índice composto a partir de ``x``. O offset nunca é usado.
+    """
+
+    def _campos(self):
+        return [(campo.lstrip('-'), campo.startswith('-')) for campo in self.ordering]
+
+    def _get_position_from_instance(self, instance, ordering):
+        valores = [
+            instance[nome] if isinstance(instance, dict) else getattr(instance, nome)
+            for nome, _ in self._campos()
+        ]
+        return json.dumps([str(valor) for valor in valores])
+
+    def _filtrar_posicao(self, queryset, posicao, reverso):
+        campos = self._campos()
+        try:
+            valores = json.loads(posicao)
+            if not isinstance(valores, list) or len(valores) != len(campos):
+                raise ValueError
+            valores = [
+                queryset.model._meta.get_field(nome).to_python(valor)
+                for (nome, _), valor in zip(campos, valores)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        condicao = Q()
+        iguais = {}
+        for (nome, descendente), valor in zip(campos, valores):
+            operador = 'lt' if descendente != reverso else 'gt'
+            condicao |= Q(**iguais, **{f'{nome}__{operador}': valor})
+            iguais[nome] = valor
+
+        (primeiro, descendente), inicio = campos[0], valores[0]
+        limite = Q(**{f"{primeiro}__{'lte' if descendente != reverso else 'gte'}": inicio})
+        return queryset.filter(limite & condicao)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverso = bool(self.cursor and self.cursor.reverse)
+        posicao = self.cursor.position if self.cursor else None
+
+        queryset = queryset.order_by(*[
+            f"{'-' if descendente != reverso else ''}{nome}" for nome, descendente in self._campos()
+        ])
+        if posicao is not None:
+            queryset = self._filtrar_posicao(queryset, posicao, reverso)
+
+        # Uma linha a mais indica se há página seguinte
+        resultados = list(queryset[:self.page_size + 1])
+        self.page = resultados[:self.page_size]
+        seguinte = (
+            self._get_position_from_instance(resultados[-1], self.ordering)
+            if len(resultados) > len(self.page) else None
+        )
+
+        if reverso:
+            self.page.reverse()
+            self.has_next, self.has_previous = posicao is not None, seguinte is not None
+            self.next_position, self.previous_position = posicao, seguinte
+        else:
+            self.has_next, self.has_previous = seguinte is not None, posicao is not None
+            self.next_position, self.previous_position = seguinte, posicao
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+
+class AgendamentoCursorPagination(CursorComposto):
+    """
+    Paginação por cursor (keyset) da listagem de agendamentos, na ordem dos
+    índices (…, data, hora, id): cada página começa logo depois da última
+    linha da anterior, sem OFFSET, então o tempo de resposta não cresce com
+    a tabela nem com o número de agendamentos de um mesmo dia.
+    Use ?limite= para o tamanho da página e siga os links 'next'/'previous'.
+    """
+    ordering = ('data', 'hora', 'id')
+    page_size = 50
+    page_size_query_param = 'limite'
+    max_page_size = 200
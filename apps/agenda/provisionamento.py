@@ -0,0 +1,108 @@
+"""
+Provisionamento em lote de expedientes.
+
+Os horários de vários profissionais e dias são gravados com um número fixo de
+queries: as linhas de Horario vêm de um mapa pré-carregado (as que faltam são
+criadas num único bulk_create) e as linhas da tabela intermediária
+expediente ↔ horário são escritas com um único bulk_create.
+
+Como bulk_create não dispara m2m_changed, as versões do cache da agenda são
+incrementadas aqui mesmo.
+"""
+from datetime import datetime, timedelta
+
+from django.db import transaction
+
+from apps.agenda import cache as agenda_cache
+from apps.agenda.models import HorarioExpediente, Horario
+
+PASSO = timedelta(minutes=30)
+
+HorarioDoExpediente = HorarioExpediente.horarios.through
+
+
+def horarios_do_intervalo(inicio, fim):
+    """Horários de 30 em 30 minutos de 'inicio' até 'fim' (inclusive)."""
+    atual = datetime.combine(datetime.today(), inicio)
+    limite = datetime.combine(datetime.today(), fim)
+    horarios = []
+    while atual <= limite:
+        horarios.append(atual.time())
+        atual += PASSO
+    return horarios
+
+
+def mapa_horarios(horarios):
+    """
+    Retorna {time: pk de Horario} para os horários informados, criando de uma
+    vez os que ainda não existem. Se houver linhas repetidas, usa a mais antiga.
+    """
+    horarios = set(horarios)
+    mapa = dict(
+        Horario.objects.filter(horario__in=horarios).order_by('-pk').values_list('horario', 'pk')
+    )
+    faltantes = horarios - mapa.keys()
+    if faltantes:
+        criados = Horario.objects.bulk_create([Horario(horario=h) for h in sorted(faltantes)])
+        mapa.update({h.horario: h.pk for h in criados})
+        # Linhas novas de Horario aparecem em todas as agendas
+        agenda_cache.invalidar(agenda_cache.VERSAO_GLOBAL, agenda_cache.VERSAO_HORARIOS)
+    return mapa
+
+
+def gravar_semanas(semanas):
+    """
+    Grava os expedientes de vários profissionais.
+    'semanas' é {profissional_id: {dia_semana: [time, ...]}}; cada dia informado
+    tem seus horários substituídos e os dias ausentes não são alterados.
+    Retorna (expedientes gravados, horários associados).
+    """
+    chaves = [(prof_id, dia) for prof_id, dias in semanas.items() for dia in dias]
+    if not chaves:
+        return 0, 0
+
+    with transaction.atomic():
+        mapa = mapa_horarios(h for dias in semanas.values() for horarios in dias.values() for h in horarios)
+
+        # Reaproveita o expediente mais antigo de cada (profissional, dia)
+        expedientes = {
+            (prof_id, dia): pk
+            for pk, prof_id, dia in HorarioExpediente.objects.filter(
+                profissional_id__in=semanas.keys()
+            ).order_by('-pk').values_list('pk', 'profissional_id', 'dia_semana')
+        }
+        novos = [
+            HorarioExpediente(profissional_id=prof_id, dia_semana=dia)
+            for prof_id, dia in chaves if (prof_id, dia) not in expedientes
+        ]
+        for expediente in HorarioExpediente.objects.bulk_create(novos):
+            expedientes[(expediente.profissional_id, expediente.dia_semana)] = expediente.pk
+
+        ids = [expedientes[chave] for chave in chaves]
+        HorarioDoExpediente.objects.filter(horarioexpediente_id__in=ids).delete()
+        linhas = HorarioDoExpediente.objects.bulk_create([
+            HorarioDoExpediente(horarioexpediente_id=expedientes[(prof_id, dia)], horario_id=horario_id)
+            for prof_id, dias in semanas.items()
+            for dia, horarios in dias.items()
+            for horario_id in dict.fromkeys(mapa[h] for h in horarios)
+        ])
+
+        agenda_cache.invalidar(*semanas.keys())
+
+    return len(ids), len(linhas)
+
+
+def semana_do_profissional(profissional_id):
+    """Lê a semana de um profissional no formato aceito por gravar_semanas."""
+    semana = {
+        dia: []
+        for dia in HorarioExpediente.objects.filter(
+            profissional_id=profissional_id
+        ).values_list('dia_semana', flat=True)
+    }
+    associacoes = HorarioDoExpediente.objects.filter(
+        horarioexpediente__profissional_id=profissional_id
+    ).order_by('horario__horario').values_list('horarioexpediente__dia_semana', 'horario__horario')
+    for dia, horario in associacoes:
+        semana[dia].append(horario)
+    return semana
@@ -1,10 +1,24 @@
+import logging
+
 from rest_framework import serializers
 from apps.agenda.models import Agendamento
 
+logger = logging.getLogger(__name__)
+
+# Tipos de usuário que podem agendar livremente, sem as validações de conflito e expediente
+TIPOS_LIVRES = ['PROFISSIONAL', 'ADMIN']
+
+
 class AgendamentoSerializer(serializers.ModelSerializer):
     class Meta:
         model = Agendamento
         fields = '__all__'
+        read_only_fields = ['serie', 'data_ocorrencia']
+
+    def agendamento_livre(self):
+        """Indica se o usuário da requisição pode pular as regras de negócio."""
+        user = getattr(self.context.get('request'), 'user', None)
+        return getattr(user, 'tipo', None) in TIPOS_LIVRES
 
     def validate(self, data):
         """
@@ -12,14 +26,17 @@ class AgendamentoSerializer(serializers.ModelSerializer):
         Garante que as mesmas validações do model sejam aplicadas no serializer.
         """
 
-        user = self.context['request'].user
-        print(f"DEBUG: user={user}, tipo={getattr(user, 'tipo', None)}")
-        tipos_livres = ['PROFISSIONAL', 'ADMIN']
-        if hasattr(user, 'tipo') and user.tipo in tipos_livres:
+        user = getattr(self.context.get('request'), 'user', None)
+        logger.debug("Validando agendamento: user=%s, tipo=%s", user, getattr(user, 'tipo', None))
+        if self.agendamento_livre():
         # Se o usuário autenticado for profissional ou admin, permite agendamento livre,
         # pulando as validações de conflito de horário e expediente.
             return data
-        
+
+        if self.context.get('em_lote'):
+            # Recorrências são validadas em lote pela view (Agendamento.validar_lote)
+            return data
+
         # Validação de edição (update)
         if self.instance:
             for attr, value in data.items():
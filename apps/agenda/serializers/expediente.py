@@ -1,7 +1,14 @@
+import logging
+
 from rest_framework import serializers
-from datetime import datetime, timedelta
 
 from apps.agenda.models import HorarioExpediente, Horario
+from apps.agenda.models.expediente import DIAS_DA_SEMANA
+from apps.agenda.horarios import grade_horarios
+from apps.agenda.provisionamento import horarios_do_intervalo, mapa_horarios
+from apps.usuario.models import Usuario, TipoUsuario
+
+logger = logging.getLogger(__name__)
 
 
 class HorarioSerializer(serializers.ModelSerializer):
@@ -13,7 +20,8 @@ class HorarioSerializer(serializers.ModelSerializer):
 
 
 class HorarioExpedienteSerializer(serializers.ModelSerializer):
-    horarios = HorarioSerializer(many=True, read_only=True)
+    # Mesmo formato do HorarioSerializer, montado a partir da grade local de horários
+    horarios = serializers.SerializerMethodField()
     inicio = serializers.TimeField(write_only=True, format='%H:%M')
     fim = serializers.TimeField(write_only=True, format='%H:%M')
 
@@ -21,24 +29,29 @@ class HorarioExpedienteSerializer(serializers.ModelSerializer):
         model = HorarioExpediente
         fields = ['id', 'profissional', 'dia_semana', 'horarios', 'inicio', 'fim']
 
+    def get_horarios(self, obj):
+        horario_ids = getattr(obj, 'horario_ids', None)
+        if horario_ids is None:
+            horario_ids = HorarioExpediente.horarios.through.objects.filter(
+                horarioexpediente_id=obj.pk
+            ).values_list('horario_id', flat=True)
+        # Uma grade por listagem: o contexto é o mesmo para todos os itens
+        if 'grade_horarios' not in self.context:
+            self.context['grade_horarios'] = grade_horarios()
+        return self.context['grade_horarios'].representar(horario_ids)
+
     def _gerar_e_associar_horarios(self, instance, inicio, fim):
         """
-        Gera e associa horários ao expediente em blocos de 30 minutos.
+        Gera e associa horários ao expediente em blocos de 30 minutos,
+        buscando as linhas de Horario de uma só vez.
         """
-        instance.horarios.clear()
-
         try:
-            atual_dt = datetime.combine(datetime.today(), inicio)
-            fim_dt = datetime.combine(datetime.today(), fim)
-
-            while atual_dt <= fim_dt:
-                horario_time = atual_dt.time()
-                horario_obj, _ = Horario.objects.get_or_create(horario=horario_time)
-                instance.horarios.add(horario_obj)
-                atual_dt += timedelta(minutes=30)
+            horarios = horarios_do_intervalo(inicio, fim)
+            mapa = mapa_horarios(horarios)
+            instance.horarios.set([mapa[h] for h in horarios])
 
-        except Exception as e:
-            print(f"Erro ao gerar horários: {e}")
+        except Exception:
+            logger.exception("Erro ao gerar horários do expediente %s.", instance.pk)
             raise serializers.ValidationError("Erro ao processar os horários de início e fim.")
 
     def create(self, validated_data):
@@ -75,3 +88,61 @@ class HorarioExpedienteSerializer(serializers.ModelSerializer):
 
         return data
 
+
+class DiaExpedienteSerializer(serializers.Serializer):
+    dia_semana = serializers.ChoiceField(choices=DIAS_DA_SEMANA)
+    inicio = serializers.TimeField(format='%H:%M')
+    fim = serializers.TimeField(format='%H:%M')
+
+    def validate(self, data):
+        if data['inicio'] >= data['fim']:
+            raise serializers.ValidationError("O horário de início deve ser menor que o horário de fim.")
+        return data
+
+
+def _validar_profissionais(ids):
+    ids = list(dict.fromkeys(ids))
+    encontrados = set(
+        Usuario.objects.filter(pk__in=ids, tipo=TipoUsuario.PROFISSIONAL).values_list('pk', flat=True)
+    )
+    invalidos = [pk for pk in ids if pk not in encontrados]
+    if invalidos:
+        raise serializers.ValidationError(f"Profissionais inválidos: {invalidos}.")
+    return ids
+
+
+class ProvisionamentoSerializer(serializers.Serializer):
+    """
+    Modelo semanal aplicado a vários profissionais de uma vez.
+    Cada dia informado tem os horários substituídos; os demais dias não mudam.
+    """
+    profissionais = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    semana = DiaExpedienteSerializer(many=True, allow_empty=False)
+
+    def validate_profissionais(self, value):
+        return _validar_profissionais(value)
+
+    def validate_semana(self, value):
+        dias = [dia['dia_semana'] for dia in value]
+        if len(dias) != len(set(dias)):
+            raise serializers.ValidationError("Cada dia da semana deve aparecer uma única vez.")
+        return value
+
+    def semanas(self):
+        modelo = {
+            dia['dia_semana']: horarios_do_intervalo(dia['inicio'], dia['fim'])
+            for dia in self.validated_data['semana']
+        }
+        return {prof_id: modelo for prof_id in self.validated_data['profissionais']}
+
+
+class CopiaSemanaSerializer(serializers.Serializer):
+    """Copia a semana de um profissional ('origem') para outros ('destinos')."""
+    origem = serializers.IntegerField()
+    destinos = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+    def validate(self, data):
+        if data['origem'] in data['destinos']:
+            raise serializers.ValidationError("A origem não pode estar entre os destinos.")
+        data['destinos'] = _validar_profissionais(data['destinos'])
+        return data
@@ -0,0 +1,41 @@
+import copy
+
+from rest_framework import serializers
+from apps.agenda.models import SerieRecorrente
+from apps.agenda.serializers.agendamento import TIPOS_LIVRES
+
+
+class SerieRecorrenteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SerieRecorrente
+        fields = '__all__'
+        # Alteradas pela action 'excluir-ocorrencia' e pela exclusão de ocorrências materializadas
+        read_only_fields = ['datas_excluidas']
+
+    def validate(self, data):
+        """
+        Valida a regra da série com SerieRecorrente.clean().
+        Profissionais e admins podem criar séries sem as validações de conflito e expediente.
+        """
+        if 'repeticoes' in data and 'data_fim' not in data:
+            # Novas repetições redefinem a data final
+            data_inicio = data.get('data_inicio', getattr(self.instance, 'data_inicio', None))
+            intervalo = data.get('intervalo_semanas', getattr(self.instance, 'intervalo_semanas', 1))
+            data['data_fim'] = SerieRecorrente.fim_por_repeticoes(data_inicio, intervalo, data['repeticoes'])
+
+        if self.instance:
+            # Uma cópia: se a validação falhar, a instância da view continua com os valores gravados
+            serie = copy.copy(self.instance)
+            for attr, value in data.items():
+                setattr(serie, attr, value)
+        else:
+            serie = SerieRecorrente(**data)
+
+        user = getattr(self.context.get('request'), 'user', None)
+        if getattr(user, 'tipo', None) in TIPOS_LIVRES:
+            if serie.data_fim and serie.data_fim < serie.data_inicio:
+                raise serializers.ValidationError("A data final da série não pode ser anterior à data inicial.")
+            return data
+
+        serie.clean()
+        return data
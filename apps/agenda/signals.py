@@ -0,0 +1,111 @@
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from apps.agenda import cache as agenda_cache, catalogo
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario, SerieRecorrente
+from apps.servicos.models import Servico
+from apps.usuario.models import Usuario
+
+
+@receiver(pre_save, sender=Servico)
+def marcar_alteracao_duracao(sender, instance, **kwargs):
+    """Registra se a duração do serviço mudou, para recalcular o fim dos agendamentos."""
+    if not instance.pk:
+        instance._duracao_alterada = False
+        return
+    duracao_anterior = Servico.objects.filter(pk=instance.pk).values_list('duracao', flat=True).first()
+    instance._duracao_alterada = duracao_anterior is not None and duracao_anterior != instance.duracao
+
+
+@receiver(post_save, sender=Servico)
+def recalcular_fim_agendamentos(sender, instance, created, **kwargs):
+    """Mantém 'fim' sincronizado nos agendamentos que usam a duração do serviço."""
+    if created or not getattr(instance, '_duracao_alterada', False):
+        return
+    Agendamento.objects.filter(
+        servico=instance,
+        duracao_personalizada__isnull=True
+    ).update(fim=F('inicio') + instance.duracao)
+
+
+# --- Invalidação do cache da agenda ---
+
+@receiver(pre_save, sender=Agendamento)
+@receiver(pre_save, sender=HorarioExpediente)
+@receiver(pre_save, sender=SerieRecorrente)
+def guardar_profissional_anterior(sender, instance, **kwargs):
+    """Guarda o profissional atual no banco, para invalidar as duas agendas se ele mudar."""
+    instance._profissional_anterior = None
+    if instance.pk and not instance._state.adding:
+        instance._profissional_anterior = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('profissional_id', flat=True).first()
+
+
+@receiver(post_save, sender=Agendamento)
+@receiver(post_save, sender=HorarioExpediente)
+@receiver(post_save, sender=SerieRecorrente)
+@receiver(post_delete, sender=Agendamento)
+@receiver(post_delete, sender=HorarioExpediente)
+@receiver(post_delete, sender=SerieRecorrente)
+def invalidar_agenda_profissional(sender, instance, **kwargs):
+    agenda_cache.invalidar(instance.profissional_id, getattr(instance, '_profissional_anterior', None))
+    if sender is HorarioExpediente:
+        agenda_cache.esquecer_expediente(instance.pk)
+
+
+@receiver(m2m_changed, sender=HorarioExpediente.horarios.through)
+def invalidar_agenda_horarios_expediente(sender, instance, action, reverse, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # Alteração feita pelo lado do Horario: pode afetar vários profissionais
+        agenda_cache.invalidar_tudo()
+    else:
+        agenda_cache.invalidar(instance.profissional_id)
+
+
+def _invalidar_servicos():
+    agenda_cache.invalidar(agenda_cache.VERSAO_SERVICOS)
+    catalogo.descartar()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(catalogo.descartar)
+
+
+@receiver(post_save, sender=Servico)
+@receiver(post_delete, sender=Servico)
+@receiver(post_save, sender=Horario)
+@receiver(post_delete, sender=Horario)
+def invalidar_todas_agendas(sender, **kwargs):
+    agenda_cache.invalidar_tudo()
+    if sender is Servico:
+        _invalidar_servicos()
+    elif sender is Horario:
+        agenda_cache.invalidar(agenda_cache.VERSAO_HORARIOS)
+
+
+@receiver(m2m_changed, sender=Servico.profissionais.through)
+def invalidar_lista_servicos(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _invalidar_servicos()
+
+
+@receiver(post_save, sender=Usuario)
+def invalidar_agendas_usuario(sender, instance, created, **kwargs):
+    # Nomes de clientes aparecem nas agendas; um usuário novo ainda não aparece em nenhuma
+    if not created:
+        agenda_cache.invalidar_tudo()
+
+
+@receiver(post_delete, sender=Usuario)
+def invalidar_servicos_usuario(sender, **kwargs):
+    # A exclusão remove o profissional dos serviços sem disparar m2m_changed
+    _invalidar_servicos()
+
+
+@receiver(request_started)
+def renovar_catalogo(sender, **kwargs):
+    catalogo.nova_requisicao()
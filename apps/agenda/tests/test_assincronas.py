@@ -0,0 +1,136 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario, SerieRecorrente
+from config import metricas
+
+
+class ViewsAssincronasTests(TestCase):
+    """As views assíncronas devem responder exatamente como as actions síncronas."""
+
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.segunda = date(2025, 5, 26)
+
+        self.profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.servico = Servico.objects.create(nome="Manicure", preco=40, duracao=timedelta(minutes=30))
+        self.servico.profissionais.add(self.profissional)
+        self.expediente = HorarioExpediente.objects.create(profissional=self.profissional, dia_semana=0)
+        for hora in (time(9, 0), time(9, 30), time(10, 0)):
+            self.expediente.horarios.add(Horario.objects.create(horario=hora))
+
+        Agendamento.objects.create(
+            cliente=self.cliente,
+            profissional=self.profissional,
+            servico=self.servico,
+            data=self.segunda,
+            hora=time(9, 0)
+        )
+        SerieRecorrente.objects.create(
+            cliente=self.cliente,
+            profissional=self.profissional,
+            servico=self.servico,
+            hora=time(10, 0),
+            data_inicio=self.segunda,
+            intervalo_semanas=1,
+        )
+
+    def _comparar(self, nome_sync, nome_async, params, args=()):
+        esperado = self.api.get(reverse(nome_sync, args=args), params)
+        cache.clear()
+        response = self.client.get(reverse(nome_async, args=args), params)
+        self.assertEqual(response.status_code, esperado.status_code)
+        self.assertEqual(response.json(), esperado.json())
+        return response
+
+    def test_agenda_igual_a_sincrona(self):
+        params = {"profissional": self.profissional.id, "data_inicial": "2025-05-26", "data_final": "2025-06-03"}
+        response = self._comparar('agendamentos-agenda', 'async-agendamentos-agenda', params)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        linha_10h = next(linha for linha in response.json() if linha["horario"] == "10:00")
+        self.assertIsNone(linha_10h["2025-06-02"]["agendamento_id"])  # ocorrência da série
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('async-agendamentos-agenda'), params)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_agenda_valida_parametros(self):
+        url = 'async-agendamentos-agenda'
+        self._comparar('agendamentos-agenda', url, {})
+        self._comparar('agendamentos-agenda', url, {"profissional": "abc"})
+        self._comparar('agendamentos-agenda', url, {"profissional": self.profissional.id, "data_inicial": "26/05/2025"})
+        self._comparar('agendamentos-agenda', url, {
+            "profissional": self.profissional.id, "data_inicial": "2025-05-26", "data_final": "2025-05-20"
+        })
+
+    def test_horarios_disponiveis_igual_a_sincrona(self):
+        args = [self.expediente.id]
+        nomes = ('expediente-horarios-disponiveis', 'async-expediente-horarios-disponiveis')
+        response = self._comparar(*nomes, {"data": "2025-05-26"}, args)
+        # 10:00 é da série, ainda não materializada
+        self.assertEqual([linha["ocupado"] for linha in response.json()], [True, False, True])
+        self._comparar(*nomes, {}, args)
+        self._comparar(*nomes, {"data": "26-05-2025"}, args)
+        self._comparar(*nomes, {"data": "2025-05-26"}, [self.expediente.id + 100])
+
+    def test_por_profissional_igual_a_sincrona(self):
+        nomes = ('expediente-por-profissional', 'async-expediente-por-profissional')
+        self._comparar(*nomes, {"profissional": self.profissional.id})
+        self._comparar(*nomes, {})
+        self._comparar(*nomes, {"profissional": "abc"})
+
+    def test_servicos_igual_a_sincrona(self):
+        outro = Usuario.objects.create_user(
+            email="prof2@test.com",
+            password="senha123",
+            nome_completo="Outro Profissional",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.servico.profissionais.add(outro)
+        Servico.objects.create(nome="Pedicure", preco="55.50", duracao=timedelta(minutes=45))
+        self._comparar('servico-list', 'async-servico-list', {})
+
+    def test_etag_e_304(self):
+        url = reverse('async-expediente-por-profissional')
+        params = {"profissional": self.profissional.id}
+        etag = self.client.get(url, params)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        self.expediente.horarios.add(Horario.objects.create(horario=time(10, 30)))
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_apenas_get(self):
+        response = self.client.post(reverse('async-servico-list'))
+        self.assertEqual(response.status_code, 405)
+
+    async def test_pilha_assincrona_conta_queries_nas_metricas(self):
+        metricas.reiniciar()
+        response = await self.async_client.get(
+            reverse('async-expediente-por-profissional'), {"profissional": self.profissional.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(
+            metricas.texto_prometheus(),
+            r'http_requisicao_sql_consultas_total\{pid="\d+",rota="async-expediente-por-profissional"\} [1-9]'
+        )
@@ -0,0 +1,33 @@
+import json
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_benchmark_em_escala_reduzida(self):
+        cache.set('outra-aplicacao', 1)
+        saida = StringIO()
+        call_command(
+            'benchmark', '--banco-atual',
+            '--profissionais', '2', '--clientes', '5', '--agendamentos', '60', '--repeticoes', '1',
+            stdout=saida
+        )
+        resultado = json.loads(saida.getvalue())
+
+        self.assertEqual(resultado["volumes"]["agendamentos"], 60)
+        esperados = {
+            "agenda_sem_cache": 200, "agenda_com_cache": 200, "horarios_disponiveis": 200, "servicos": 200,
+            "buscar_clientes": 200,
+            "criar_agendamento": 201, "criar_recorrencia": 201, "excluir_recorrencia": 200, "login": 200,
+        }
+        for nome, status in esperados.items():
+            cenario = resultado["cenarios"][nome]
+            self.assertEqual(cenario["status"], [status], nome)
+            self.assertGreater(cenario["pico_memoria_kb"], 0)
+        self.assertEqual(resultado["cenarios"]["agenda_com_cache"]["queries"]["max"], 0)
+        self.assertGreater(resultado["cenarios"]["agenda_sem_cache"]["queries"]["mediana"], 0)
+        # O cenário sem cache invalida só as agendas, não o cache inteiro
+        self.assertEqual(cache.get('outra-aplicacao'), 1)
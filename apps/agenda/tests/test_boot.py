@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import time
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.agenda.management.commands.boot import Command, MARCADOR_ESTATICOS
+from apps.agenda.models import HorarioExpediente, Horario
+
+
+class BootTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root)
+        self.settings_estaticos = override_settings(STATIC_ROOT=self.static_root)
+        self.settings_estaticos.enable()
+        self.addCleanup(self.settings_estaticos.disable)
+
+    def _boot(self, *args, **env):
+        saida = StringIO()
+        with mock.patch.dict(os.environ, env):
+            call_command('boot', *args, stdout=saida)
+        return saida.getvalue()
+
+    def test_estaticos_coletados_uma_vez(self):
+        saida = self._boot('--sem-banco')
+        self.assertIn('estáticos: coletados', saida)
+        self.assertTrue(os.path.exists(os.path.join(self.static_root, 'admin', 'css', 'base.css')))
+        self.assertTrue(os.path.exists(os.path.join(self.static_root, MARCADOR_ESTATICOS)))
+        self.assertNotIn('migrações', saida)
+
+        with mock.patch('apps.agenda.management.commands.boot.call_command') as comando:
+            saida = self._boot('--sem-banco')
+        comando.assert_not_called()
+        self.assertIn('estáticos: em dia', saida)
+
+    def test_migracoes_em_dia_nao_chamam_migrate(self):
+        self._boot('--sem-banco')
+        with mock.patch('apps.agenda.management.commands.boot.call_command') as comando:
+            saida = self._boot()
+        comando.assert_not_called()
+        self.assertIn('migrações: em dia', saida)
+
+    def test_superusuario_criado_so_se_faltar(self):
+        self._boot('--sem-banco')
+        env = {'DJANGO_SUPERUSER_EMAIL': 'dono@sellet.com', 'DJANGO_SUPERUSER_PASSWORD': 's3cret!'}
+        self.assertIn('dono@sellet.com criado', self._boot(**env))
+        admin = Usuario.objects.get(email='dono@sellet.com')
+        self.assertTrue(admin.is_superuser)
+        self.assertTrue(admin.check_password('s3cret!'))
+
+        with self.assertNumQueries(1), mock.patch.dict(os.environ, env):
+            self.assertEqual(Command().garantir_admin(), 'já existe')
+
+    def test_aquecer_monta_as_grades_da_semana(self):
+        profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        expediente = HorarioExpediente.objects.create(profissional=profissional, dia_semana=0)
+        expediente.horarios.add(Horario.objects.create(horario=time(9, 0)))
+
+        self._boot('--sem-banco')
+        # O LocMem dos testes faz as vezes do Redis: o "outro processo" aqui é o mesmo
+        with mock.patch('apps.agenda.cache.cache_local', return_value=False):
+            self.assertIn('aquecimento: 1 grade(s) montada(s) de 1 profissional(is)', self._boot('--aquecer'))
+
+        response = APIClient().get(reverse('agendamentos-agenda'), {"profissional": profissional.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_aquecer_sem_cache_compartilhado_e_pulado(self):
+        self._boot('--sem-banco')
+        with mock.patch('apps.agenda.management.commands.boot.aquecer') as aquecer:
+            self.assertIn('aquecimento: pulado', self._boot('--aquecer'))
+        aquecer.assert_not_called()
@@ -0,0 +1,79 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario
+
+
+class ProximosHorariosTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('agendamentos-proximos-horarios')
+        hoje = date.today()
+        self.segunda = hoje + timedelta(days=7 - hoje.weekday())
+        self.terca = self.segunda + timedelta(days=1)
+
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.ana = Usuario.objects.create_user(
+            email="ana@test.com", password="senha123",
+            nome_completo="Ana", tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.bia = Usuario.objects.create_user(
+            email="bia@test.com", password="senha123",
+            nome_completo="Bia", tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.servico = Servico.objects.create(nome="Manicure", preco=40, duracao=timedelta(minutes=60))
+        self.servico.profissionais.add(self.ana, self.bia)
+
+        horarios = [Horario.objects.create(horario=time(9, 0)),
+                    Horario.objects.create(horario=time(9, 30)),
+                    Horario.objects.create(horario=time(10, 0))]
+        HorarioExpediente.objects.create(profissional=self.ana, dia_semana=0).horarios.add(*horarios)
+        HorarioExpediente.objects.create(profissional=self.bia, dia_semana=1).horarios.add(*horarios)
+
+    def test_retorna_primeiros_horarios_em_ordem(self):
+        Agendamento.objects.create(
+            cliente=self.cliente,
+            profissional=self.ana,
+            servico=self.servico,
+            data=self.segunda,
+            hora=time(9, 0)
+        )
+        response = self.client.get(self.url, {"servico": self.servico.id, "a_partir_de": self.segunda.isoformat(), "limite": 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(r["profissional"], r["data"], r["horario"]) for r in response.data],
+            [
+                (self.bia.id, self.terca.isoformat(), "09:00"),
+                (self.bia.id, self.terca.isoformat(), "09:30"),
+                (self.ana.id, (self.segunda + timedelta(weeks=1)).isoformat(), "09:00"),
+            ]
+        )
+
+    def test_respeita_horario_minimo(self):
+        response = self.client.get(self.url, {"servico": self.servico.id, "a_partir_de": f"{self.segunda.isoformat()}T09:15", "limite": 1})
+        self.assertEqual(response.data[0]["horario"], "09:30")
+        self.assertEqual(response.data[0]["data"], self.segunda.isoformat())
+
+    def test_horario_com_fuso_e_convertido_para_o_local(self):
+        # 12:15 UTC = 09:15 em America/Sao_Paulo
+        response = self.client.get(self.url, {"servico": self.servico.id, "a_partir_de": f"{self.segunda.isoformat()}T12:15:00Z", "limite": 1})
+        self.assertEqual(response.data[0]["horario"], "09:30")
+        self.assertEqual(response.data[0]["data"], self.segunda.isoformat())
+
+    def test_consultas_limitadas(self):
+        with self.assertNumQueries(6):
+            response = self.client.get(self.url, {"servico": self.servico.id, "a_partir_de": self.segunda.isoformat(), "limite": 2})
+        self.assertEqual(len(response.data), 2)
+
+    def test_servico_obrigatorio(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario
+from apps.agenda import cache as agenda_cache
+
+
+class AgendaCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.segunda = date(2025, 5, 26)
+
+        self.profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.servico = Servico.objects.create(nome="Manicure", preco=40, duracao=timedelta(minutes=30))
+        self.horario_09 = Horario.objects.create(horario=time(9, 0))
+        self.horario_0930 = Horario.objects.create(horario=time(9, 30))
+        self.expediente = HorarioExpediente.objects.create(profissional=self.profissional, dia_semana=0)
+        self.expediente.horarios.add(self.horario_09)
+
+    def _agenda(self):
+        return self.client.get(
+            reverse('agendamentos-agenda'),
+            {"profissional": self.profissional.id, "data_inicial": "2025-05-26", "data_final": "2025-06-01"}
+        )
+
+    def test_agenda_inalterada_vem_do_cache_sem_queries(self):
+        self.assertEqual(self._agenda()['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self._agenda()
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    @override_settings(PROCESSOS_WEB=2)
+    def test_locmem_com_varios_processos_nao_usa_o_cache(self):
+        self.assertFalse(agenda_cache.versoes_compartilhadas())
+        self.assertEqual(self._agenda()['X-Cache'], 'MISS')
+        # Simula uma escrita atendida por outro worker: as versões deste processo não mudam
+        Agendamento.objects.bulk_create([Agendamento(
+            cliente=self.cliente,
+            profissional=self.profissional,
+            servico=self.servico,
+            data=self.segunda,
+            hora=time(9, 0)
+        )])
+        response = self._agenda()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertTrue(response.data[0]["2025-05-26"]["ocupado"])
+
+    def test_novo_agendamento_invalida_agenda(self):
+        self._agenda()
+        Agendamento.objects.create(
+            cliente=self.cliente,
+            profissional=self.profissional,
+            servico=self.servico,
+            data=self.segunda,
+            hora=time(9, 0)
+        )
+        response = self._agenda()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertTrue(response.data[0]["2025-05-26"]["ocupado"])
+
+    def test_alterar_horarios_do_expediente_invalida_agenda(self):
+        self.assertIsNone(self._agenda().data[1]["2025-05-26"]["ocupado"])
+        self.expediente.horarios.add(self.horario_0930)
+        self.assertFalse(self._agenda().data[1]["2025-05-26"]["ocupado"])
+
+    def test_mudanca_de_outro_profissional_nao_invalida(self):
+        self._agenda()
+        outro = Usuario.objects.create_user(
+            email="outro@test.com",
+            password="senha123",
+            nome_completo="Outro Profissional",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        HorarioExpediente.objects.create(profissional=outro, dia_semana=0)
+        self.assertEqual(self._agenda()['X-Cache'], 'HIT')
+
+    def test_estatisticas(self):
+        antes = agenda_cache.estatisticas()
+        self._agenda()
+        self._agenda()
+        depois = agenda_cache.estatisticas()
+        self.assertEqual(depois['hits'] - antes['hits'], 1)
+        self.assertEqual(depois['misses'] - antes['misses'], 1)
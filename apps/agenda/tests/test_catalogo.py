@@ -0,0 +1,91 @@
+from django.core.exceptions import ValidationError
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from datetime import date, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario
+from apps.agenda import cache as agenda_cache
+from apps.agenda.catalogo import catalogo, nova_requisicao
+
+
+class CatalogoTests(TestCase):
+    def setUp(self):
+        self.profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.servico = Servico.objects.create(nome="Manicure", preco=40, duracao=timedelta(minutes=30))
+        self.servico.profissionais.add(self.profissional)
+        expediente = HorarioExpediente.objects.create(profissional=self.profissional, dia_semana=0)
+        expediente.horarios.add(Horario.objects.create(horario=time(9, 0)), Horario.objects.create(horario=time(9, 30)))
+
+    def _agendamento(self):
+        return Agendamento(
+            cliente_id=self.cliente.id,
+            profissional_id=self.profissional.id,
+            servico_id=self.servico.id,
+            data=date(2025, 5, 26),
+            hora=time(9, 0)
+        )
+
+    def test_consultas_em_memoria(self):
+        catalogo()
+        with self.assertNumQueries(0):
+            item = catalogo().servico(self.servico.id)
+            self.assertEqual(item.duracao, timedelta(minutes=30))
+            self.assertTrue(catalogo().habilitado(self.servico.id, self.profissional.id))
+            self.assertFalse(catalogo().habilitado(self.servico.id, self.cliente.id))
+            self.assertEqual(self._agendamento().hora_fim_dt.time(), time(9, 30))
+
+    def test_clean_nao_busca_servico_nem_profissionais(self):
+        catalogo()
+        # expediente + prefetch, conflitos do profissional e do cliente, séries
+        with self.assertNumQueries(5):
+            self._agendamento().clean()
+
+    def test_signals_atualizam_catalogo(self):
+        catalogo()
+        self.servico.duracao = timedelta(minutes=60)
+        self.servico.save()
+        self.assertEqual(catalogo().duracao(self.servico.id), timedelta(minutes=60))
+
+        self.servico.profissionais.remove(self.profissional)
+        with self.assertRaises(ValidationError) as cm:
+            self._agendamento().clean()
+        self.assertIn("não é oferecido", str(cm.exception))
+
+    def test_servico_fora_do_catalogo_recarrega(self):
+        catalogo()
+        # bulk_create não dispara signals: é como um serviço criado por outro processo
+        novo, = Servico.objects.bulk_create([Servico(nome="Pedicure", preco=50, duracao=timedelta(minutes=45))])
+        self.assertIsNone(catalogo().servico(novo.id))
+        self.assertEqual(catalogo(novo.id).duracao(novo.id), timedelta(minutes=45))
+
+    @override_settings(PROCESSOS_WEB=2)
+    def test_versoes_por_processo_valem_ate_a_proxima_requisicao(self):
+        catalogo()
+        Servico.objects.filter(pk=self.servico.pk).update(duracao=timedelta(minutes=60))
+        with self.assertNumQueries(0):
+            catalogo()
+        nova_requisicao()
+        self.assertEqual(catalogo().duracao(self.servico.id), timedelta(minutes=60))
+
+    def test_bulk_create_le_a_versao_uma_vez(self):
+        nova_requisicao()
+        agendamentos = [self._agendamento() for _ in range(10)]
+        for i, agendamento in enumerate(agendamentos):
+            agendamento.data += timedelta(weeks=i)
+        with mock.patch.object(agenda_cache.cache, 'get_many', wraps=agenda_cache.cache.get_many) as get_many:
+            Agendamento.objects.bulk_create(agendamentos)
+        self.assertEqual(get_many.call_count, 1)
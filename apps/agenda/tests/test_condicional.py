@@ -0,0 +1,98 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario
+
+
+class EtagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.segunda = date(2025, 5, 26)
+
+        self.profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.servico = Servico.objects.create(nome="Manicure", preco=40, duracao=timedelta(minutes=30))
+        self.expediente = HorarioExpediente.objects.create(profissional=self.profissional, dia_semana=0)
+        self.expediente.horarios.add(Horario.objects.create(horario=time(9, 0)))
+
+    def _revalidar(self, url, params, etag, queries=0):
+        with self.assertNumQueries(queries):
+            return self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+
+    @override_settings(PROCESSOS_WEB=2)
+    def test_sem_etag_quando_as_versoes_nao_sao_compartilhadas(self):
+        params = {"profissional": self.profissional.id, "data_inicial": "2025-05-26", "data_final": "2025-06-01"}
+        for nome in ('agendamentos-agenda', 'async-agendamentos-agenda'):
+            response = self.client.get(reverse(nome), params, HTTP_IF_NONE_MATCH='*')
+            self.assertEqual(response.status_code, 200, nome)
+            self.assertFalse(response.has_header('ETag'), nome)
+
+    def test_agenda_inalterada_responde_304(self):
+        url = reverse('agendamentos-agenda')
+        params = {"profissional": self.profissional.id, "data_inicial": "2025-05-26", "data_final": "2025-06-01"}
+        etag = self.client.get(url, params)['ETag']
+
+        response = self._revalidar(url, params, etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        Agendamento.objects.create(
+            cliente=self.cliente,
+            profissional=self.profissional,
+            servico=self.servico,
+            data=self.segunda,
+            hora=time(9, 0)
+        )
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_parametros_diferentes_geram_etags_diferentes(self):
+        url = reverse('agendamentos-agenda')
+        semana = self.client.get(url, {"profissional": self.profissional.id, "data_inicial": "2025-05-26"})
+        dia = self.client.get(url, {"profissional": self.profissional.id, "data_inicial": "2025-05-26", "data_final": "2025-05-26"})
+        self.assertNotEqual(semana['ETag'], dia['ETag'])
+
+    def test_horarios_disponiveis_e_por_profissional(self):
+        url = reverse('expediente-horarios-disponiveis', args=[self.expediente.id])
+        params = {"data": "2025-05-26"}
+        etag = self.client.get(url, params)['ETag']
+        self.assertEqual(self._revalidar(url, params, etag).status_code, 304)
+
+        url_prof = reverse('expediente-por-profissional')
+        params_prof = {"profissional": self.profissional.id}
+        etag_prof = self.client.get(url_prof, params_prof)['ETag']
+        self.assertEqual(self._revalidar(url_prof, params_prof, etag_prof).status_code, 304)
+
+        self.expediente.horarios.add(Horario.objects.create(horario=time(9, 30)))
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(self.client.get(url_prof, params_prof, HTTP_IF_NONE_MATCH=etag_prof).status_code, 200)
+
+    def test_lista_de_servicos(self):
+        url = reverse('servico-list')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self._revalidar(url, {}, etag).status_code, 304)
+
+        self.servico.profissionais.add(self.profissional)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_erro_nao_recebe_etag(self):
+        response = self.client.get(reverse('agendamentos-agenda'), {"profissional": "abc"})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header('ETag'))
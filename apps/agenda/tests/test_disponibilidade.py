@@ -0,0 +1,112 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from datetime import date, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario
+from apps.agenda.disponibilidade import (
+    INDICE_POR_HORARIO,
+    horario_fora_do_expediente,
+    indices,
+    mascara_horarios,
+    mascara_periodo,
+    primeiro_slot,
+    slots_livres,
+)
+
+
+class MascarasTests(TestCase):
+    def test_mascara_horarios_ignora_horarios_fora_da_grade(self):
+        mascara = mascara_horarios([time(6, 0), time(6, 30), time(9, 15)])
+        self.assertEqual(mascara, 0b11)
+
+    def test_mascara_periodo_cobre_slots_da_duracao(self):
+        mascara = mascara_periodo(time(9, 0), timedelta(minutes=90))
+        self.assertEqual(list(indices(mascara)), [6, 7, 8])
+
+    def test_mascara_periodo_fora_da_grade_arredonda_para_slots_sobrepostos(self):
+        mascara = mascara_periodo(time(9, 15), timedelta(minutes=30))
+        self.assertEqual(list(indices(mascara)), [INDICE_POR_HORARIO[time(9, 0)], INDICE_POR_HORARIO[time(9, 30)]])
+
+    def test_horario_fora_do_expediente(self):
+        expediente = mascara_horarios([time(9, 0), time(9, 30)])
+        self.assertIsNone(horario_fora_do_expediente(time(9, 0), timedelta(minutes=60), expediente))
+        self.assertEqual(horario_fora_do_expediente(time(9, 30), timedelta(minutes=60), expediente), time(10, 0))
+        self.assertEqual(horario_fora_do_expediente(time(5, 30), timedelta(minutes=30), expediente), time(5, 30))
+
+    def test_inicio_fora_da_grade_e_recusado(self):
+        expediente = mascara_horarios([time(9, 0), time(9, 30), time(10, 0)])
+        self.assertEqual(horario_fora_do_expediente(time(9, 15), timedelta(minutes=30), expediente), time(9, 15))
+
+    def test_slots_livres(self):
+        expediente = mascara_horarios([time(9, 0), time(9, 30), time(10, 0)])
+        ocupado = mascara_periodo(time(9, 30), timedelta(minutes=30))
+        self.assertEqual(primeiro_slot(slots_livres(expediente, ocupado)), time(9, 0))
+        self.assertEqual(len(list(indices(slots_livres(expediente, ocupado)))), 2)
+
+
+class AgendamentoCleanMascaraTests(TestCase):
+    def setUp(self):
+        self.segunda = date(2025, 5, 26)
+        self.profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.servico = Servico.objects.create(nome="Alongamento", preco=120, duracao=timedelta(minutes=60))
+        self.servico.profissionais.add(self.profissional)
+
+        expediente = HorarioExpediente.objects.create(profissional=self.profissional, dia_semana=0)
+        for hora in (time(9, 0), time(9, 30), time(10, 0)):
+            expediente.horarios.add(Horario.objects.create(horario=hora))
+
+    def _agendamento(self, hora):
+        return Agendamento(
+            cliente=self.cliente,
+            profissional=self.profissional,
+            servico=self.servico,
+            data=self.segunda,
+            hora=hora
+        )
+
+    def test_duracao_que_ultrapassa_expediente(self):
+        with self.assertRaises(ValidationError) as cm:
+            self._agendamento(time(10, 0)).clean()
+        self.assertIn("10:30", str(cm.exception))
+
+    def test_inicio_fora_da_grade(self):
+        with self.assertRaises(ValidationError) as cm:
+            self._agendamento(time(9, 15)).clean()
+        self.assertIn("09:15", str(cm.exception))
+
+    def test_lote_recusa_inicio_fora_da_grade(self):
+        erros = Agendamento.validar_lote([self._agendamento(time(9, 0)), self._agendamento(time(9, 15))])
+        self.assertEqual(list(erros), [1])
+        self.assertIn("09:15", erros[1])
+
+    def test_sobreposicao_parcial_gera_conflito(self):
+        self._agendamento(time(9, 0)).save()
+        with self.assertRaises(ValidationError) as cm:
+            self._agendamento(time(9, 30)).clean()
+        self.assertIn("Conflito", str(cm.exception))
+
+    def test_agendamento_adjacente_e_valido(self):
+        Agendamento.objects.create(
+            cliente=Usuario.objects.create_user(
+                email="outro@test.com", password="senha123",
+                nome_completo="Outro Cliente", tipo=TipoUsuario.CLIENTE
+            ),
+            profissional=self.profissional,
+            servico=Servico.objects.create(nome="Esmaltação", preco=30, duracao=timedelta(minutes=30)),
+            data=self.segunda,
+            hora=time(9, 0)
+        )
+        self._agendamento(time(9, 30)).clean()
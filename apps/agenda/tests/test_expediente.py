@@ -4,7 +4,7 @@ from django.urls import reverse
 from datetime import time, date, timedelta
 
 from apps.usuario.models import Usuario, TipoUsuario
-from apps.agenda.models import Horario, HorarioExpediente, Agendamento
+from apps.agenda.models import Horario, HorarioExpediente, Agendamento, SerieRecorrente
 from apps.servicos.models import Servico
 
 
@@ -80,3 +80,30 @@ class HorarioExpedienteTests(TestCase):
         horarios = {h['horario']: h['ocupado'] for h in response.data}
         self.assertTrue(horarios['09:00'])
         self.assertFalse(horarios['09:30'])
+
+    def test_horarios_disponiveis_considera_series(self):
+        expediente = HorarioExpediente.objects.create(profissional=self.profissional, dia_semana=0)
+        expediente.horarios.add(self.horario_09, self.horario_0930)
+        cliente = Usuario.objects.create_user(
+            email="cliente@test.com", password="senha123", nome_completo="Cliente Teste", tipo=TipoUsuario.CLIENTE
+        )
+        serie = SerieRecorrente.objects.create(
+            cliente=cliente, profissional=self.profissional, servico=self.servico,
+            hora=time(9, 30), data_inicio=date(2025, 5, 19), intervalo_semanas=1,
+            datas_excluidas=['2025-06-02']
+        )
+        url = reverse('expediente-horarios-disponiveis', args=[expediente.id])
+
+        def ocupados(data):
+            response = self.client.get(url, {"data": data})
+            self.assertEqual(response.status_code, 200)
+            return [h['horario'] for h in response.data if h['ocupado']]
+
+        self.assertEqual(ocupados("2025-05-26"), ['09:30'])
+        self.assertEqual(ocupados("2025-06-02"), [])  # data excluída da série
+
+        # Materializada e movida para as 09:00: conta só a linha de Agendamento
+        ocorrencia = serie.ocorrencia(date(2025, 6, 9))
+        ocorrencia.hora = time(9, 0)
+        ocorrencia.save()
+        self.assertEqual(ocupados("2025-06-09"), ['09:00'])
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento
+
+
+class ExportacaoTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('agendamentos-exportar')
+        self.admin = Usuario.objects.create_superuser(
+            email="admin@test.com",
+            password="senha123",
+            nome_completo="Admin",
+            tipo=TipoUsuario.ADMIN
+        )
+        profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        servico = Servico.objects.create(nome="Manicure", preco=40, duracao=timedelta(minutes=30))
+        Agendamento.objects.bulk_create([
+            Agendamento(
+                cliente=self.cliente,
+                profissional=profissional,
+                servico=servico,
+                data=date(2025, 5, 26) + timedelta(days=dia),
+                hora=time(9, 0)
+            )
+            for dia in range(3)
+        ])
+
+    def _conteudo(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_exportar_ndjson(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(self.url, {"data_inicial": "2025-05-27"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        with self.assertNumQueries(1):
+            linhas = [json.loads(l) for l in self._conteudo(response).splitlines()]
+        self.assertEqual([l["data"] for l in linhas], ["2025-05-27", "2025-05-28"])
+        self.assertEqual(linhas[0]["cliente"], "Cliente Teste")
+        self.assertEqual(linhas[0]["servico"], "Manicure")
+        self.assertEqual(linhas[0]["preco"], "40.00")
+
+    def test_exportar_csv(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(self.url, {"formato": "csv"})
+        linhas = list(csv.reader(io.StringIO(self._conteudo(response))))
+        self.assertEqual(linhas[0][:3], ["id", "data", "hora"])
+        self.assertEqual(len(linhas), 4)
+        self.assertIn("Cliente Teste", linhas[1])
+
+    def test_exportar_formato_invalido_e_permissao(self):
+        self.assertIn(self.client.get(self.url).status_code, (401, 403))
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.get(self.url, {"formato": "xml"}).status_code, 400)
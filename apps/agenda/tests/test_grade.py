@@ -0,0 +1,109 @@
+from types import MappingProxyType
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario
+from apps.agenda import cache as agenda_cache
+from apps.agenda.catalogo import Catalogo, catalogo, nova_requisicao
+from apps.agenda.grade import montar_agendas
+from apps.agenda.horarios import grade_horarios
+
+
+class AgendaEquipeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.segunda = date(2025, 5, 26)
+
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.servico = Servico.objects.create(nome="Alongamento", preco=120, duracao=timedelta(minutes=60))
+
+        horarios = [Horario.objects.create(horario=time(9, 0)), Horario.objects.create(horario=time(9, 30))]
+        self.profissionais = []
+        for i in range(3):
+            profissional = Usuario.objects.create_user(
+                email=f"prof{i}@test.com",
+                password="senha123",
+                nome_completo=f"Profissional {i}",
+                tipo=TipoUsuario.PROFISSIONAL
+            )
+            HorarioExpediente.objects.create(profissional=profissional, dia_semana=0).horarios.add(*horarios)
+            self.profissionais.append(profissional)
+
+        Agendamento.objects.create(
+            cliente=self.cliente,
+            profissional=self.profissionais[1],
+            servico=self.servico,
+            data=self.segunda,
+            hora=time(9, 0)
+        )
+
+    def _params(self):
+        ids = ",".join(str(p.id) for p in self.profissionais)
+        return f"?profissionais={ids}&data_inicial=2025-05-26&data_final=2025-06-01"
+
+    def test_agenda_equipe_usa_numero_fixo_de_queries(self):
+        url = reverse('agendamentos-agenda-equipe') + self._params()
+        # Linhas de Horario e serviços ficam no cache local do processo
+        grade_horarios()
+        catalogo()
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["profissional"] for item in response.data], [p.id for p in self.profissionais])
+
+    def test_agenda_equipe_igual_a_agenda_individual(self):
+        response = self.client.get(reverse('agendamentos-agenda-equipe') + self._params())
+        for item in response.data:
+            individual = self.client.get(
+                reverse('agendamentos-agenda'),
+                {"profissional": item["profissional"], "data_inicial": "2025-05-26", "data_final": "2025-06-01"}
+            )
+            self.assertEqual(item["agenda"], individual.data)
+
+        agenda = response.data[1]["agenda"]
+        self.assertTrue(agenda[0]["2025-05-26"]["ocupado"])
+        self.assertTrue(agenda[1]["2025-05-26"]["ocupado"])
+        self.assertIsNone(agenda[0]["2025-05-27"]["ocupado"])
+        self.assertFalse(response.data[0]["agenda"][0]["2025-05-26"]["ocupado"])
+
+    def test_agenda_equipe_sem_profissionais(self):
+        response = self.client.get(reverse('agendamentos-agenda-equipe'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_servico_ausente_do_catalogo_nao_quebra_a_grade(self):
+        vazio = Catalogo(versao=0, servicos=MappingProxyType({}))
+        with mock.patch('apps.agenda.grade.catalogo', return_value=vazio):
+            agendas = montar_agendas([self.profissionais[1].id], self.segunda, self.segunda)
+        celula = agendas[self.profissionais[1].id][0]["2025-05-26"]
+        self.assertTrue(celula["ocupado"])
+        self.assertIsNone(celula["servico_nome"])
+
+    def _consultas_ao_cache(self, semanas):
+        nova_requisicao()
+        with mock.patch.object(agenda_cache.cache, 'get_many', wraps=agenda_cache.cache.get_many) as get_many:
+            montar_agendas([self.profissionais[0].id], self.segunda, self.segunda + timedelta(weeks=semanas))
+        return get_many.call_count
+
+    def test_versoes_lidas_uma_vez_por_grade(self):
+        uma = self._consultas_ao_cache(20)
+        Agendamento.objects.bulk_create([
+            Agendamento(
+                cliente=self.cliente, profissional=self.profissionais[0], servico_id=self.servico.id,
+                data=self.segunda + timedelta(weeks=i), hora=time(9, 0)
+            )
+            for i in range(20)
+        ])
+        # Versões do catálogo de serviços e das linhas de Horario, não uma por agendamento
+        self.assertEqual(self._consultas_ao_cache(20), uma)
+        self.assertEqual(uma, 2)
@@ -0,0 +1,42 @@
+from django.test import TestCase, override_settings
+from datetime import time
+
+from apps.agenda.models import Horario
+from apps.agenda.horarios import grade_horarios
+
+
+class GradeHorariosTests(TestCase):
+    def setUp(self):
+        self.horario_0930 = Horario.objects.create(horario=time(9, 30))
+        self.horario_09 = Horario.objects.create(horario=time(9, 0))
+
+    def test_grade_e_carregada_uma_vez(self):
+        grade = grade_horarios()
+        with self.assertNumQueries(0):
+            self.assertIs(grade_horarios(), grade)
+
+        linha = grade.por_pk[self.horario_09.pk]
+        self.assertEqual((linha.rotulo, linha.indice, linha.bit), ("09:00", 6, 1 << 6))
+        self.assertEqual(grade.pk_por_horario[time(9, 30)], self.horario_0930.pk)
+
+    def test_alteracao_de_horario_recarrega(self):
+        grade_horarios()
+        fora_da_grade = Horario.objects.create(horario=time(23, 30))
+        linha = grade_horarios().por_pk[fora_da_grade.pk]
+        self.assertEqual((linha.rotulo, linha.indice, linha.bit), ("23:30", None, 0))
+
+        self.horario_09.delete()
+        self.assertNotIn(self.horario_09.pk, grade_horarios().por_pk)
+
+    @override_settings(PROCESSOS_WEB=2)
+    def test_versoes_por_processo_releem_a_grade(self):
+        grade_horarios()
+        # bulk_create não dispara signals, como uma escrita atendida por outro processo
+        novo, = Horario.objects.bulk_create([Horario(horario=time(10, 0))])
+        self.assertIn(novo.pk, grade_horarios().por_pk)
+
+    def test_representar_em_ordem_de_horario(self):
+        self.assertEqual(
+            grade_horarios().representar([self.horario_0930.pk, self.horario_09.pk]),
+            [{"id": self.horario_09.pk, "horario": "09:00"}, {"id": self.horario_0930.pk, "horario": "09:30"}]
+        )
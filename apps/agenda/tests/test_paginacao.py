@@ -0,0 +1,109 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento
+
+
+class ListagemAgendamentosTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('agendamentos-list')
+        self.segunda = date(2025, 5, 26)
+
+        self.profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.outro_cliente = Usuario.objects.create_user(
+            email="outro@test.com",
+            password="senha123",
+            nome_completo="Outro Cliente",
+            tipo=TipoUsuario.CLIENTE
+        )
+        servico = Servico.objects.create(nome="Manicure", preco=40, duracao=timedelta(minutes=30))
+
+        Agendamento.objects.bulk_create([
+            Agendamento(
+                cliente=self.cliente if dia % 2 == 0 else self.outro_cliente,
+                profissional=self.profissional,
+                servico=servico,
+                data=self.segunda + timedelta(days=dia),
+                hora=hora,
+                status='CANCELADO' if dia == 3 else 'AGENDADO'
+            )
+            for dia in range(5)
+            for hora in (time(10, 0), time(9, 0))
+        ])
+
+    def test_paginas_seguem_ordem_data_hora_id(self):
+        response = self.client.get(self.url, {"limite": 4})
+        self.assertEqual(response.status_code, 200)
+        vistos = [(a["data"], a["hora"]) for a in response.data["results"]]
+        self.assertIsNone(response.data["previous"])
+
+        while response.data["next"]:
+            with self.assertNumQueries(1):
+                response = self.client.get(response.data["next"])
+            vistos += [(a["data"], a["hora"]) for a in response.data["results"]]
+
+        self.assertEqual(len(vistos), 10)
+        self.assertEqual(vistos, sorted(vistos))
+        self.assertEqual(vistos[:2], [("2025-05-26", "09:00:00"), ("2025-05-26", "10:00:00")])
+
+    def test_filtros(self):
+        def total(**params):
+            return len(self.client.get(self.url, params).data["results"])
+
+        self.assertEqual(total(cliente=self.cliente.id), 6)
+        self.assertEqual(total(status='CANCELADO'), 2)
+        self.assertEqual(total(profissional=self.profissional.id, data_inicial="2025-05-27", data_final="2025-05-28"), 4)
+        self.assertEqual(total(profissional=self.cliente.id), 0)
+
+    def test_filtros_invalidos(self):
+        self.assertEqual(self.client.get(self.url, {"cliente": "abc"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"status": "PERDIDO"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"data_inicial": "26/05/2025"}).status_code, 400)
+
+    def test_cursor_usa_a_linha_inteira_sem_offset(self):
+        # Vários agendamentos com a mesma data e hora: a posição precisa do id
+        Agendamento.objects.bulk_create([
+            Agendamento(
+                cliente=self.cliente, profissional=self.profissional, servico_id=Servico.objects.get().id,
+                data=self.segunda, hora=time(9, 0)
+            )
+            for _ in range(5)
+        ])
+        esperado = list(Agendamento.objects.order_by('data', 'hora', 'id').values_list('id', flat=True))
+
+        response = self.client.get(self.url, {"limite": 3})
+        paginas = [[a["id"] for a in response.data["results"]]]
+        while response.data["next"]:
+            with self.assertNumQueries(1) as consultas:
+                response = self.client.get(response.data["next"])
+            self.assertNotIn("OFFSET", consultas.captured_queries[0]["sql"].upper())
+            paginas.append([a["id"] for a in response.data["results"]])
+        self.assertEqual(sum(paginas, []), esperado)
+
+        # Voltando pelos links 'previous' as mesmas páginas reaparecem
+        for pagina in reversed(paginas[:-1]):
+            response = self.client.get(response.data["previous"])
+            self.assertEqual([a["id"] for a in response.data["results"]], pagina)
+        self.assertIsNone(response.data["previous"])
+
+    def test_cursor_invalido(self):
+        response = self.client.get(self.url, {"cursor": "bm9uc2Vuc2U="})
+        self.assertEqual(response.status_code, 200)  # sem 'p': primeira página
+        response = self.client.get(self.url, {"cursor": "cD1bIngiXQ=="})  # p=["x"]
+        self.assertEqual(response.status_code, 404)
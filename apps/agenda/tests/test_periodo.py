@@ -0,0 +1,89 @@
+from django.test import TestCase
+from django.utils import timezone
+from datetime import date, datetime, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario
+
+
+class PeriodoDesnormalizadoTests(TestCase):
+    def setUp(self):
+        self.segunda = date(2025, 5, 26)
+        self.profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.servico = Servico.objects.create(nome="Manicure", preco=40, duracao=timedelta(minutes=60))
+        self.servico.profissionais.add(self.profissional)
+
+        expediente = HorarioExpediente.objects.create(profissional=self.profissional, dia_semana=0)
+        for hora in (time(9, 0), time(9, 30), time(10, 0), time(10, 30)):
+            expediente.horarios.add(Horario.objects.create(horario=hora))
+
+    def _agendamento(self, hora, **kwargs):
+        return Agendamento(
+            cliente=self.cliente,
+            profissional=self.profissional,
+            servico=self.servico,
+            data=self.segunda,
+            hora=hora,
+            **kwargs
+        )
+
+    def test_save_preenche_inicio_e_fim(self):
+        ag = self._agendamento(time(9, 0))
+        ag.save()
+        self.assertEqual(ag.inicio, timezone.make_aware(datetime(2025, 5, 26, 9, 0)))
+        self.assertEqual(ag.fim, timezone.make_aware(datetime(2025, 5, 26, 10, 0)))
+
+        ag.hora = time(10, 0)
+        ag.duracao_personalizada = 30
+        ag.save(update_fields=['hora', 'duracao_personalizada'])
+        ag.refresh_from_db()
+        self.assertEqual(ag.fim, timezone.make_aware(datetime(2025, 5, 26, 10, 30)))
+
+    def test_bulk_create_preenche_inicio_e_fim(self):
+        Agendamento.objects.bulk_create([self._agendamento(time(9, 0))])
+        ag = Agendamento.objects.get()
+        self.assertEqual(ag.inicio, timezone.make_aware(datetime(2025, 5, 26, 9, 0)))
+        self.assertEqual(ag.fim, timezone.make_aware(datetime(2025, 5, 26, 10, 0)))
+
+    def test_update_de_queryset_recalcula_inicio_e_fim(self):
+        self._agendamento(time(9, 0)).save()
+        Agendamento.objects.filter(hora=time(9, 0)).update(hora=time(10, 0), duracao_personalizada=30)
+        ag = Agendamento.objects.get()
+        self.assertEqual(ag.inicio, timezone.make_aware(datetime(2025, 5, 26, 10, 0)))
+        self.assertEqual(ag.fim, timezone.make_aware(datetime(2025, 5, 26, 10, 30)))
+
+        with self.assertNumQueries(1):
+            Agendamento.objects.update(status='CONCLUIDO')
+
+    def test_alterar_duracao_do_servico_recalcula_fim(self):
+        ag = self._agendamento(time(9, 0))
+        ag.save()
+        personalizado = self._agendamento(time(10, 0), duracao_personalizada=30)
+        personalizado.save()
+
+        self.servico.duracao = timedelta(minutes=90)
+        self.servico.save()
+
+        ag.refresh_from_db()
+        personalizado.refresh_from_db()
+        self.assertEqual(ag.fim, timezone.make_aware(datetime(2025, 5, 26, 10, 30)))
+        self.assertEqual(personalizado.fim, timezone.make_aware(datetime(2025, 5, 26, 10, 30)))
+
+    def test_conflito_detectado_por_consulta_de_intervalo(self):
+        self._agendamento(time(9, 0)).save()
+        novo = self._agendamento(time(9, 30))
+        with self.assertNumQueries(5):
+            with self.assertRaisesMessage(Exception, "09:00"):
+                novo.clean()
@@ -0,0 +1,94 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import time
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.agenda.models import HorarioExpediente, Horario
+
+
+class ProvisionamentoTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(Usuario.objects.create_superuser(
+            email="admin@test.com",
+            password="senha123",
+            nome_completo="Admin",
+            tipo=TipoUsuario.ADMIN
+        ))
+        self.profissionais = [
+            Usuario.objects.create_user(
+                email=f"prof{i}@test.com",
+                password="senha123",
+                nome_completo=f"Profissional {i}",
+                tipo=TipoUsuario.PROFISSIONAL
+            )
+            for i in range(4)
+        ]
+        Horario.objects.create(horario=time(9, 0))
+
+    def _semana(self):
+        return [
+            {"dia_semana": dia, "inicio": "09:00", "fim": "18:00"}
+            for dia in range(6)
+        ]
+
+    def test_provisionar_equipe_com_queries_fixas(self):
+        payload = {"profissionais": [p.id for p in self.profissionais], "semana": self._semana()}
+        # profissionais, horários (busca + criação), expedientes (busca + criação), delete, insert, savepoints
+        with self.assertNumQueries(9):
+            response = self.client.post(reverse('expediente-provisionar'), payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"expedientes": 24, "horarios": 24 * 19})
+        self.assertEqual(HorarioExpediente.objects.count(), 24)
+        self.assertEqual(Horario.objects.count(), 19)
+
+    def test_reprovisionar_substitui_apenas_os_dias_informados(self):
+        url = reverse('expediente-provisionar')
+        profissional = self.profissionais[0]
+        self.client.post(url, {"profissionais": [profissional.id], "semana": self._semana()}, format='json')
+        self.client.post(url, {
+            "profissionais": [profissional.id],
+            "semana": [{"dia_semana": 0, "inicio": "13:00", "fim": "14:00"}]
+        }, format='json')
+
+        segunda = HorarioExpediente.objects.get(profissional=profissional, dia_semana=0)
+        self.assertEqual([str(h) for h in segunda.horarios.order_by('horario')], ["13:00", "13:30", "14:00"])
+        terca = HorarioExpediente.objects.get(profissional=profissional, dia_semana=1)
+        self.assertEqual(terca.horarios.count(), 19)
+
+    def test_copiar_semana(self):
+        origem = self.profissionais[0]
+        expediente = HorarioExpediente.objects.create(profissional=origem, dia_semana=2)
+        expediente.horarios.add(Horario.objects.get(horario=time(9, 0)), Horario.objects.create(horario=time(9, 30)))
+
+        response = self.client.post(reverse('expediente-copiar-semana'), {
+            "origem": origem.id,
+            "destinos": [p.id for p in self.profissionais[1:]]
+        }, format='json')
+        self.assertEqual(response.data, {"expedientes": 3, "horarios": 6})
+        for destino in self.profissionais[1:]:
+            copia = HorarioExpediente.objects.get(profissional=destino)
+            self.assertEqual(copia.dia_semana, 2)
+            self.assertEqual(set(copia.horarios.values_list('pk', flat=True)), set(expediente.horarios.values_list('pk', flat=True)))
+
+    def test_validacoes(self):
+        url = reverse('expediente-provisionar')
+        cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente",
+            tipo=TipoUsuario.CLIENTE
+        )
+        response = self.client.post(url, {"profissionais": [cliente.id], "semana": self._semana()}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(url, {
+            "profissionais": [self.profissionais[0].id],
+            "semana": [{"dia_semana": 0, "inicio": "18:00", "fim": "09:00"}]
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(reverse('expediente-copiar-semana'), {
+            "origem": self.profissionais[0].id,
+            "destinos": [self.profissionais[1].id]
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
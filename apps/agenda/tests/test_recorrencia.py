@@ -0,0 +1,82 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario
+from apps.agenda.catalogo import catalogo
+
+
+class RecorrenciaEmLoteTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('agendamentos-list')
+        self.segunda = date(2025, 5, 26)
+
+        self.profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.servico = Servico.objects.create(nome="Manicure", preco=40, duracao=timedelta(minutes=60))
+        self.servico.profissionais.add(self.profissional)
+
+        expediente = HorarioExpediente.objects.create(profissional=self.profissional, dia_semana=0)
+        for hora in (time(9, 0), time(9, 30), time(10, 0)):
+            expediente.horarios.add(Horario.objects.create(horario=hora))
+
+    def _payload(self, repeticoes, **extra):
+        return {
+            "cliente": self.cliente.id,
+            "profissional": self.profissional.id,
+            "servico": self.servico.id,
+            "data": self.segunda.isoformat(),
+            "hora": "09:00",
+            "recorrencia": 1,
+            "repeticoes": repeticoes,
+            **extra,
+        }
+
+    def _ocupar(self, semana):
+        Agendamento.objects.create(
+            cliente=self.cliente,
+            profissional=self.profissional,
+            servico=self.servico,
+            data=self.segunda + timedelta(weeks=semana),
+            hora=time(9, 30)
+        )
+
+    def test_cria_serie_com_numero_fixo_de_queries(self):
+        catalogo()  # competência e duração vêm do catálogo local
+        with self.assertNumQueries(10):
+            response = self.client.post(self.url, self._payload(52), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 52)
+        self.assertEqual(Agendamento.objects.exclude(recorrencia_id=None).count(), 52)
+        self.assertEqual(len({a["recorrencia_id"] for a in response.data}), 1)
+        self.assertFalse(Agendamento.objects.filter(inicio=None).exists())
+
+    def test_conflito_impede_a_serie_inteira(self):
+        self._ocupar(semana=2)
+        response = self.client.post(self.url, self._payload(4), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["erros"][0]["data"], "2025-06-09")
+        self.assertIn("Conflito", response.data["erros"][0]["erro"])
+        self.assertEqual(Agendamento.objects.count(), 1)
+
+    def test_parcial_cria_ocorrencias_validas(self):
+        self._ocupar(semana=2)
+        response = self.client.post(self.url, self._payload(4, parcial=True), format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(len(response.data["criados"]), 3)
+        self.assertEqual(len(response.data["erros"]), 1)
+        self.assertEqual(Agendamento.objects.count(), 4)
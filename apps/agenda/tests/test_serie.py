@@ -0,0 +1,168 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario, SerieRecorrente
+from apps.agenda.serializers import SerieRecorrenteSerializer
+
+
+class SerieRecorrenteTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.segunda = date(2025, 5, 26)
+
+        self.profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.outro_cliente = Usuario.objects.create_user(
+            email="outro@test.com",
+            password="senha123",
+            nome_completo="Outro Cliente",
+            tipo=TipoUsuario.CLIENTE
+        )
+        self.servico = Servico.objects.create(nome="Manicure", preco=40, duracao=timedelta(minutes=60))
+        self.servico.profissionais.add(self.profissional)
+
+        expediente = HorarioExpediente.objects.create(profissional=self.profissional, dia_semana=0)
+        for hora in (time(9, 0), time(9, 30), time(10, 0)):
+            expediente.horarios.add(Horario.objects.create(horario=hora))
+
+    def _criar_serie(self, **extra):
+        payload = {
+            "cliente": self.cliente.id,
+            "profissional": self.profissional.id,
+            "servico": self.servico.id,
+            "hora": "09:00",
+            "data_inicio": self.segunda.isoformat(),
+            "intervalo_semanas": 1,
+            **extra,
+        }
+        return self.client.post(reverse('series-list'), payload, format='json')
+
+    def test_criar_serie_sem_fim_nao_gera_agendamentos(self):
+        response = self._criar_serie()
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(response.data["data_fim"])
+        self.assertEqual(Agendamento.objects.count(), 0)
+
+    def test_repeticoes_definem_data_fim(self):
+        response = self._criar_serie(repeticoes=4, intervalo_semanas=2)
+        self.assertEqual(response.data["data_fim"], "2025-07-07")
+
+    def test_agenda_expande_ocorrencias(self):
+        self._criar_serie()
+        response = self.client.get(
+            reverse('agendamentos-agenda'),
+            {"profissional": self.profissional.id, "data_inicial": "2026-03-02", "data_final": "2026-03-08"}
+        )
+        celula = response.data[0]["2026-03-02"]
+        self.assertTrue(celula["ocupado"])
+        self.assertIsNone(celula["agendamento_id"])
+        self.assertIsNotNone(celula["serie_id"])
+
+    def test_ocorrencia_virtual_gera_conflito(self):
+        self._criar_serie()
+        agendamento = Agendamento(
+            cliente=self.outro_cliente,
+            profissional=self.profissional,
+            servico=self.servico,
+            data=self.segunda + timedelta(weeks=30),
+            hora=time(9, 30)
+        )
+        with self.assertRaises(ValidationError) as cm:
+            agendamento.clean()
+        self.assertIn("Conflito", str(cm.exception))
+
+    def test_serie_conflitando_com_agendamento_existente(self):
+        Agendamento.objects.create(
+            cliente=self.outro_cliente,
+            profissional=self.profissional,
+            servico=self.servico,
+            data=self.segunda + timedelta(weeks=3),
+            hora=time(9, 30)
+        )
+        response = self._criar_serie()
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Conflito", str(response.data))
+
+    def test_materializar_ocorrencia(self):
+        serie_id = self._criar_serie().data["id"]
+        url = reverse('series-materializar', args=[serie_id])
+
+        response = self.client.post(url, {"data": "2025-06-09"}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.post(url, {"data": "2025-06-09"}, format='json').status_code, 200)
+        self.assertEqual(self.client.post(url, {"data": "2025-06-10"}, format='json').status_code, 400)
+
+        ocorrencias = self.client.get(
+            reverse('series-ocorrencias'),
+            {"data_inicial": "2025-06-02", "data_final": "2025-06-16"}
+        )
+        self.assertEqual([o["data"] for o in ocorrencias.data], ["2025-06-02", "2025-06-16"])
+
+    def test_encerrar_serie(self):
+        serie_id = self._criar_serie().data["id"]
+        self.client.post(reverse('series-materializar', args=[serie_id]), {"data": "2025-06-16"}, format='json')
+
+        response = self.client.post(reverse('series-encerrar', args=[serie_id]), {"data": "2025-06-10"}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["removidos"], 1)
+        serie = SerieRecorrente.objects.get(pk=serie_id)
+        self.assertEqual(list(serie.datas(date(2025, 5, 1), date(2025, 12, 31))), [date(2025, 5, 26), date(2025, 6, 2), date(2025, 6, 9)])
+
+    def test_excluir_ocorrencia_materializada_nao_a_traz_de_volta(self):
+        serie_id = self._criar_serie().data["id"]
+        self.client.post(reverse('series-materializar', args=[serie_id]), {"data": "2025-06-09"}, format='json')
+
+        Agendamento.objects.get(serie_id=serie_id, data_ocorrencia=date(2025, 6, 9)).delete()
+
+        ocorrencias = self.client.get(
+            reverse('series-ocorrencias'),
+            {"data_inicial": "2025-06-02", "data_final": "2025-06-16"}
+        )
+        self.assertEqual([o["data"] for o in ocorrencias.data], ["2025-06-02", "2025-06-16"])
+
+    def test_excluir_ocorrencia_libera_o_horario(self):
+        serie_id = self._criar_serie().data["id"]
+        url = reverse('series-excluir-ocorrencia', args=[serie_id])
+
+        response = self.client.post(url, {"data": "2025-06-09"}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["datas_excluidas"], ["2025-06-09"])
+        self.assertEqual(self.client.post(url, {"data": "2025-06-09"}, format='json').status_code, 200)
+        self.assertEqual(self.client.post(url, {"data": "2025-06-10"}, format='json').status_code, 400)
+        self.assertEqual(Agendamento.objects.count(), 0)
+
+        Agendamento(
+            cliente=self.outro_cliente,
+            profissional=self.profissional,
+            servico=self.servico,
+            data=date(2025, 6, 9),
+            hora=time(9, 0)
+        ).clean()
+
+    def test_alterar_repeticoes_recalcula_data_fim(self):
+        serie_id = self._criar_serie(repeticoes=4).data["id"]
+        response = self.client.patch(reverse('series-detail', args=[serie_id]), {"repeticoes": 2}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["data_fim"], "2025-06-02")
+
+    def test_alteracao_recusada_nao_muda_a_instancia(self):
+        serie = SerieRecorrente.objects.get(pk=self._criar_serie().data["id"])
+        serializer = SerieRecorrenteSerializer(serie, data={"hora": "07:00", "repeticoes": 2}, partial=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serie.hora, time(9, 0))
+        self.assertIsNone(serie.data_fim)
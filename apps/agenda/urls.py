@@ -1,14 +1,22 @@
 from rest_framework.routers import DefaultRouter
 from apps.agenda.views.expediente import HorarioExpedienteViewSet
 from apps.agenda.views.agendamento import AgendamentoViewSet
+from apps.agenda.views.serie import SerieRecorrenteViewSet
 from django.urls import path, include
 from apps.agenda.views.expediente import horarios_estabelecimento
+from apps.agenda.views import assincronas
 
 router = DefaultRouter()
 router.register(r'expediente', HorarioExpedienteViewSet, basename='expediente')
 router.register(r'agendamentos', AgendamentoViewSet, basename='agendamentos')
+router.register(r'series', SerieRecorrenteViewSet, basename='series')
 
 urlpatterns = [
     path('horarios-estabelecimento/', horarios_estabelecimento, name='horarios-estabelecimento'),
+    # Versões assíncronas (ASGI) das leituras mais acessadas; ver apps.agenda.views.assincronas
+    path('async/agendamentos/agenda/', assincronas.agenda, name='async-agendamentos-agenda'),
+    path('async/expediente/<int:pk>/horarios_disponiveis/', assincronas.horarios_disponiveis,
+         name='async-expediente-horarios-disponiveis'),
+    path('async/expediente/por_profissional/', assincronas.por_profissional, name='async-expediente-por-profissional'),
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
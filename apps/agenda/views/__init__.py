@@ -1,2 +1,3 @@
 from .expediente import *
 from .agendamento import *
+from .serie import *
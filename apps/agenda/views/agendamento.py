@@ -2,25 +2,119 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
-from datetime import datetime, timedelta
-from collections import defaultdict
+from rest_framework.permissions import IsAdminUser
+from rest_framework.exceptions import ValidationError
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from datetime import date, datetime, timedelta
 from uuid import uuid4
 
-from apps.agenda.models import Agendamento, HorarioExpediente, Horario
+from apps.agenda.models import Agendamento
+from apps.agenda import cache as agenda_cache
+from apps.agenda import busca
+from apps.agenda import exportacao
+from apps.agenda.condicional import com_etag
+from apps.agenda.paginacao import AgendamentoCursorPagination
 from apps.agenda.serializers import AgendamentoSerializer
+from apps.servicos.models import Servico
 
 
 
 
+def _marcador_agenda(view, request):
+    try:
+        profissional_id = int(request.query_params.get('profissional', ''))
+    except ValueError:
+        return None
+    versoes = agenda_cache.versoes([agenda_cache.VERSAO_GLOBAL, profissional_id])
+    # Sem 'data_inicial' a agenda começa hoje, então o dia entra no marcador
+    return sorted(versoes.values()), date.today()
+
+
+def ler_periodo(params):
+    """
+    Lê 'data_inicial' e 'data_final' dos parâmetros (padrão: a semana a partir de hoje).
+    Retorna ((data_inicial, data_final), None) ou (None, mensagem de erro).
+    """
+    try:
+        data_inicial_str = params.get('data_inicial')
+        data_final_str = params.get('data_final')
+
+        data_inicial = datetime.strptime(data_inicial_str, '%Y-%m-%d').date() if data_inicial_str else datetime.today().date()
+        data_final = datetime.strptime(data_final_str, '%Y-%m-%d').date() if data_final_str else data_inicial + timedelta(days=6)
+
+        if data_final < data_inicial:
+            return None, "A data final não pode ser anterior à data inicial."
+
+    except ValueError:
+        return None, "Formato de data inválido. Use 'YYYY-MM-DD'."
+
+    return (data_inicial, data_final), None
+
+
 class AgendamentoViewSet(viewsets.ModelViewSet):
     """
     ViewSet para gerenciar Agendamentos.
     Permite listar, criar, atualizar e excluir agendamentos.
+
+    A listagem traz só linhas de Agendamento (incluindo as ocorrências
+    materializadas de séries): a paginação por cursor anda sobre o índice
+    (data, hora, id), que as ocorrências virtuais não têm, e uma série sem
+    fim não teria última página. As ocorrências virtuais de um período vêm
+    de 'series/ocorrencias', com os mesmos filtros de profissional e cliente.
     """
     queryset = Agendamento.objects.all()
     serializer_class = AgendamentoSerializer
+    pagination_class = AgendamentoCursorPagination
+
+    def get_queryset(self):
+        """
+        Na listagem e na exportação, permite filtrar por ?profissional=, ?cliente=,
+        ?status= e pelo intervalo ?data_inicial= / ?data_final= (YYYY-MM-DD).
+        Cada filtro tem um índice composto terminando em (data, hora, id).
+        """
+        queryset = self.queryset
+        if self.action not in ('list', 'exportar'):
+            return queryset
+
+        params = self.request.query_params
+        for campo in ('profissional', 'cliente'):
+            valor = params.get(campo)
+            if valor:
+                try:
+                    queryset = queryset.filter(**{f'{campo}_id': int(valor)})
+                except ValueError:
+                    raise ValidationError({"erro": f"O ID do {campo} deve ser um número inteiro."})
+
+        status_param = params.get('status')
+        if status_param:
+            if status_param not in dict(Agendamento.STATUS_CHOICES):
+                raise ValidationError({"erro": "Status inválido."})
+            queryset = queryset.filter(status=status_param)
+
+        try:
+            if params.get('data_inicial'):
+                queryset = queryset.filter(data__gte=datetime.strptime(params['data_inicial'], '%Y-%m-%d').date())
+            if params.get('data_final'):
+                queryset = queryset.filter(data__lte=datetime.strptime(params['data_final'], '%Y-%m-%d').date())
+        except ValueError:
+            raise ValidationError({"erro": "Formato de data inválido. Use 'YYYY-MM-DD'."})
+
+        return queryset
+
+    def _ler_periodo(self, request):
+        """
+        Lê 'data_inicial' e 'data_final' da query string.
+        Retorna ((data_inicial, data_final), None) ou (None, Response de erro).
+        """
+        periodo, erro = ler_periodo(request.query_params)
+        if erro:
+            return None, Response({"erro": erro}, status=400)
+        return periodo, None
 
     @action(detail=False, methods=['get'])
+    @com_etag(_marcador_agenda)
     def agenda(self, request):
         """
         Retorna a agenda semanal ou diária de um profissional,
@@ -36,93 +130,114 @@ class AgendamentoViewSet(viewsets.ModelViewSet):
         except ValueError:
             return Response({"erro": "O ID do profissional deve ser um número inteiro."}, status=400)
 
+        periodo, erro = self._ler_periodo(request)
+        if erro:
+            return erro
+
+        agendas, hits = agenda_cache.agendas_em_cache([profissional_id], *periodo)
+        response = Response(agendas[profissional_id])
+        response['X-Cache'] = 'HIT' if hits else 'MISS'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='agenda-equipe')
+    def agenda_equipe(self, request):
+        """
+        Retorna a agenda de vários profissionais de uma só vez.
+        Parâmetros: profissionais=1,2,3 (ou 'profissional' repetido), data_inicial, data_final.
+        Cada item traz a agenda no mesmo formato do endpoint 'agenda'.
+        """
+        valores = request.query_params.getlist('profissional')
+        valores += request.query_params.get('profissionais', '').split(',')
+        valores = [v.strip() for v in valores if v.strip()]
+        if not valores:
+            return Response({"erro": "Informe ao menos um profissional em 'profissionais'."}, status=400)
+
         try:
-            data_inicial_str = request.query_params.get('data_inicial')
-            data_final_str = request.query_params.get('data_final')
+            profissional_ids = list(dict.fromkeys(int(v) for v in valores))
+        except ValueError:
+            return Response({"erro": "Os IDs dos profissionais devem ser números inteiros."}, status=400)
 
-            data_inicial = datetime.strptime(data_inicial_str, '%Y-%m-%d').date() if data_inicial_str else datetime.today().date()
-            data_final = datetime.strptime(data_final_str, '%Y-%m-%d').date() if data_final_str else data_inicial + timedelta(days=6)
+        periodo, erro = self._ler_periodo(request)
+        if erro:
+            return erro
 
-            if data_final < data_inicial:
-                return Response({"erro": "A data final não pode ser anterior à data inicial."}, status=400)
+        agendas, hits = agenda_cache.agendas_em_cache(profissional_ids, *periodo)
+        response = Response([
+            {"profissional": prof_id, "agenda": agendas[prof_id]}
+            for prof_id in profissional_ids
+        ])
+        response['X-Cache'] = 'HIT' if hits == len(profissional_ids) else ('PARCIAL' if hits else 'MISS')
+        return response
 
+    @action(detail=False, methods=['get'], url_path='agenda-cache', permission_classes=[IsAdminUser])
+    def estatisticas_cache(self, request):
+        """
+        Retorna as estatísticas de acerto do cache da agenda neste processo (apenas admins).
+        """
+        return Response(agenda_cache.estatisticas())
+
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def exportar(self, request):
+        """
+        Exporta os agendamentos em streaming (apenas admins).
+        Parâmetros: formato=ndjson|csv (padrão ndjson) e os mesmos filtros da listagem.
+        """
+        formato = request.query_params.get('formato', 'ndjson')
+        if formato not in exportacao.FORMATOS:
+            return Response({"erro": "Formato inválido. Use 'ndjson' ou 'csv'."}, status=400)
+
+        # O streaming roda depois que o ReplicaMiddleware já terminou: fixa agora o banco de leitura
+        queryset = self.get_queryset()
+        queryset = queryset.using(queryset.db)
+        response = StreamingHttpResponse(
+            exportacao.GERADORES[formato](queryset),
+            content_type=exportacao.FORMATOS[formato]
+        )
+        response['Content-Disposition'] = f'attachment; filename="agendamentos.{formato}"'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='proximos-horarios')
+    def proximos_horarios(self, request):
+        """
+        Retorna os próximos horários livres para um serviço, considerando todos
+        os profissionais habilitados, a duração do serviço e o expediente.
+        Parâmetros: servico (obrigatório), a_partir_de ('YYYY-MM-DD' ou
+        'YYYY-MM-DDTHH:MM', no horário local, ou com fuso, padrão agora) e
+        limite (padrão 5, máximo 50).
+        """
+        servico_id = request.query_params.get('servico')
+        if not servico_id:
+            return Response({"erro": "O ID do serviço é obrigatório."}, status=400)
+
+        try:
+            servico = Servico.objects.get(pk=int(servico_id))
         except ValueError:
-            return Response({"erro": "Formato de data inválido. Use 'YYYY-MM-DD'."}, status=400)
-
-        # --- Buscar Expediente ---
-        dias_semana = [(data_inicial + timedelta(days=i)).weekday() for i in range((data_final - data_inicial).days + 1)]
-        expedientes = HorarioExpediente.objects.filter(
-            profissional_id=profissional_id,
-            dia_semana__in=dias_semana
-        ).prefetch_related('horarios')
-
-        horarios_por_dia = {
-            exp.dia_semana: {h.horario for h in exp.horarios.all()}
-            for exp in expedientes
-        }
-
-        # --- Buscar Agendamentos Existentes ---
-        agendamentos = Agendamento.objects.filter(
-            profissional_id=profissional_id,
-            data__range=[data_inicial, data_final]
-        ).select_related('cliente', 'servico')
-
-        slots_ocupados = defaultdict(dict)
-
-        for ag in agendamentos:
-            inicio_dt = ag.hora_inicio_dt
-            fim_dt = ag.hora_fim_dt
-
-            if not inicio_dt or not fim_dt:
-                print(f"Aviso: Agendamento ID {ag.id} com dados inválidos.")
-                continue
-
-            data_str = ag.data.strftime('%Y-%m-%d')
-            horario_atual = inicio_dt
-            while horario_atual < fim_dt:
-                slot_time = horario_atual.time()
-                if slot_time not in slots_ocupados[data_str]:
-                    slots_ocupados[data_str][slot_time] = ag
-                else:
-                    print(f"Aviso: Slot {data_str} {slot_time.strftime('%H:%M')} já ocupado por {slots_ocupados[data_str][slot_time].id}, tentando marcar por {ag.id}")
-                horario_atual += timedelta(minutes=30)
-
-        # --- Montar a Resposta ---
-        agenda_resposta = []
-        horarios_base = Horario.objects.all().order_by('horario')
-
-        for horario_obj in horarios_base:
-            horario_time = horario_obj.horario
-            linha = {"horario": horario_time.strftime('%H:%M')}
-
-            for i in range((data_final - data_inicial).days + 1):
-                dia_atual = data_inicial + timedelta(days=i)
-                dia_semana = dia_atual.weekday()
-                data_str = dia_atual.strftime('%Y-%m-%d')
-
-                no_expediente = dia_semana in horarios_por_dia and horario_time in horarios_por_dia[dia_semana]
-                agendamento = slots_ocupados[data_str].get(horario_time)
-
-                if agendamento:
-                    linha[data_str] = {
-                        "ocupado": True,
-                        "agendamento_id": agendamento.id,
-                        "cliente_id": agendamento.cliente.id,
-                        "nome_cliente": str(agendamento.cliente),
-                        "servico_id": agendamento.servico.id,
-                        "servico_nome": agendamento.servico.nome,
-                        "status": agendamento.status,
-                        "recorrencia_id": str(agendamento.recorrencia_id) if agendamento.recorrencia_id else None,
-                    }
-                elif no_expediente:
-                    linha[data_str] = {"ocupado": False}
-                else:
-                    linha[data_str] = {"ocupado": None}
-
-            agenda_resposta.append(linha)
-
-        return Response(agenda_resposta)
-    
+            return Response({"erro": "O ID do serviço deve ser um número inteiro."}, status=400)
+        except Servico.DoesNotExist:
+            return Response({"erro": "Serviço não encontrado."}, status=404)
+
+        try:
+            limite = int(request.query_params.get('limite') or 5)
+        except ValueError:
+            return Response({"erro": "O limite deve ser um número inteiro."}, status=400)
+        limite = max(1, min(limite, 50))
+
+        agora = timezone.localtime().replace(tzinfo=None, second=0, microsecond=0)
+        a_partir_de_str = request.query_params.get('a_partir_de')
+        if a_partir_de_str:
+            try:
+                a_partir_de = datetime.fromisoformat(a_partir_de_str)
+            except ValueError:
+                return Response({"erro": "Formato de data inválido. Use 'YYYY-MM-DD' ou 'YYYY-MM-DDTHH:MM'."}, status=400)
+            if timezone.is_aware(a_partir_de):
+                # Com fuso (ex.: '...T12:00:00Z'), converte para o horário local da grade
+                a_partir_de = timezone.localtime(a_partir_de)
+            a_partir_de = max(a_partir_de.replace(tzinfo=None), agora)
+        else:
+            a_partir_de = agora
+
+        return Response(busca.proximos_horarios(servico, a_partir_de, limite))
 
     @action(detail=False, methods=['delete'], url_path='excluir-recorrencia')
     def excluir_recorrencia(self, request):
@@ -133,10 +248,8 @@ class AgendamentoViewSet(viewsets.ModelViewSet):
         recorrencia_id = request.data.get('recorrencia_id')
         if not recorrencia_id:
             return Response({"erro": "recorrencia_id é obrigatório."}, status=status.HTTP_400_BAD_REQUEST)
-        qs = Agendamento.objects.filter(recorrencia_id=recorrencia_id)
-        count = qs.count()
-        qs.delete()
-        return Response({"removidos": count}, status=status.HTTP_200_OK)
+        removidos, _ = Agendamento.objects.filter(recorrencia_id=recorrencia_id).delete()
+        return Response({"removidos": removidos}, status=status.HTTP_200_OK)
     
 
     def create(self, request, *args, **kwargs):
@@ -145,6 +258,16 @@ class AgendamentoViewSet(viewsets.ModelViewSet):
         Parâmetros extras (opcionais):
         - recorrencia: 1 (semanal), 2 (quinzenal), 4 (mensal)
         - repeticoes: número de vezes que o agendamento deve se repetir
+        - parcial: se verdadeiro, cria as ocorrências válidas e retorna 207 com os erros;
+          por padrão a série é criada inteira ou nada é criado (400).
+
+        Este caminho grava uma linha de Agendamento por ocorrência, ligadas por
+        'recorrencia_id', e é mantido porque o contrato dele depende disso: a
+        resposta traz o id de cada ocorrência, 'parcial' cria só as datas livres
+        e 'excluir-recorrencia' apaga pelo 'recorrencia_id'. Por isso 'repeticoes'
+        é sempre finita. Recorrências longas ou sem fim devem usar 'series/'
+        (SerieRecorrente), que grava só a regra e expande as ocorrências na
+        leitura, com criação e cancelamento de custo constante.
         """
         data = request.data.copy()
         recorrencia = int(data.get('recorrencia') or 0)  # 0 = não repetir
@@ -152,29 +275,37 @@ class AgendamentoViewSet(viewsets.ModelViewSet):
 
         if not recorrencia or repeticoes <= 1:
             return super().create(request, *args, **kwargs)
-        
-        recorrencia_id = str(uuid4())
-        agendamentos_criados = []
-        erros = []
-        try:
-            data_inicial = datetime.strptime(data['data'], '%Y-%m-%d').date()
-        except Exception:
-            return Response({"erro": "Data inicial inválida."}, status=status.HTTP_400_BAD_REQUEST)
-
-        for i in range(repeticoes):
-            data['data'] = (data_inicial + timedelta(weeks=recorrencia * i)).strftime('%Y-%m-%d')
-            data['recorrencia_id'] = recorrencia_id
-            serializer = self.get_serializer(data=data)
-            try:
-                serializer.is_valid(raise_exception=True)
-                self.perform_create(serializer)
-                agendamentos_criados.append(serializer.data)
-            except Exception as e:
-                erros.append({'data': data['data'], 'erro': str(e)})
 
+        parcial = str(data.get('parcial', '')).lower() in ('1', 'true', 'sim')
+        data['recorrencia_id'] = str(uuid4())
+
+        contexto = self.get_serializer_context()
+        contexto['em_lote'] = True
+        serializer = self.get_serializer(data=data, context=contexto)
+        serializer.is_valid(raise_exception=True)
+
+        base = serializer.validated_data
+        data_inicial = base['data']
+        ocorrencias = [
+            Agendamento(**{**base, 'data': data_inicial + timedelta(weeks=recorrencia * i)})
+            for i in range(repeticoes)
+        ]
+
+        with transaction.atomic():
+            erros = {} if serializer.agendamento_livre() else Agendamento.validar_lote(ocorrencias)
+            erros_resposta = [
+                {'data': ocorrencias[i].data.strftime('%Y-%m-%d'), 'erro': mensagem}
+                for i, mensagem in sorted(erros.items())
+            ]
+            if erros and not parcial:
+                return Response({'erros': erros_resposta}, status=status.HTTP_400_BAD_REQUEST)
+
+            validas = [ag for i, ag in enumerate(ocorrencias) if i not in erros]
+            criados = Agendamento.objects.bulk_create(validas)
+            # bulk_create não dispara signals
+            agenda_cache.invalidar(base['profissional'].pk)
+
+        agendamentos_criados = self.get_serializer(criados, many=True).data
         if erros:
-            return Response({'criados': agendamentos_criados, 'erros': erros}, status=207)
+            return Response({'criados': agendamentos_criados, 'erros': erros_resposta}, status=207)
         return Response(agendamentos_criados, status=201)
-    
-
- 
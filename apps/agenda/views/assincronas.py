@@ -0,0 +1,156 @@
+"""
+Versões assíncronas dos endpoints de leitura mais acessados da agenda.
+
+Mesmos parâmetros, respostas e marcadores de ETag das actions ``agenda``,
+``horarios_disponiveis`` e ``por_profissional``, mas como views async do
+Django: cache e queries usam as APIs assíncronas, então sob um servidor ASGI
+(ver ``config.asgi``) a espera pelo banco não ocupa uma thread. Assim como as
+originais, são públicas. O ETag inclui o caminho, então o de uma rota
+assíncrona não vale para a síncrona correspondente.
+"""
+from datetime import date, datetime
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from apps.agenda import cache as agenda_cache
+from apps.agenda.condicional import com_etag_assincrono
+from apps.agenda.horarios import grade_horarios
+from apps.agenda.models import HorarioExpediente, Agendamento, SerieRecorrente
+from apps.agenda.serializers import HorarioExpedienteSerializer
+from apps.agenda.views.agendamento import ler_periodo
+
+
+async def _marcador_profissional(profissional_id):
+    if profissional_id is None:
+        return None
+    return sorted((await agenda_cache.aversoes([agenda_cache.VERSAO_GLOBAL, profissional_id])).values())
+
+
+async def _marcador_agenda(request):
+    try:
+        profissional_id = int(request.GET.get('profissional', ''))
+    except ValueError:
+        return None
+    # Sem 'data_inicial' a agenda começa hoje, então o dia entra no marcador
+    return await _marcador_profissional(profissional_id), date.today()
+
+
+async def _marcador_expediente(request, pk):
+    return await _marcador_profissional(await agenda_cache.aprofissional_do_expediente(pk))
+
+
+async def _marcador_por_profissional(request):
+    try:
+        return await _marcador_profissional(int(request.GET.get('profissional', '')))
+    except ValueError:
+        return None
+
+
+@require_GET
+@com_etag_assincrono(_marcador_agenda)
+async def agenda(request):
+    """
+    Retorna a agenda semanal ou diária de um profissional,
+    considerando a duração dos serviços para marcar horários ocupados.
+    """
+    profissional_id = request.GET.get('profissional')
+    if not profissional_id:
+        return JsonResponse({"erro": "O ID do profissional é obrigatório."}, status=400)
+
+    try:
+        profissional_id = int(profissional_id)
+    except ValueError:
+        return JsonResponse({"erro": "O ID do profissional deve ser um número inteiro."}, status=400)
+
+    periodo, erro = ler_periodo(request.GET)
+    if erro:
+        return JsonResponse({"erro": erro}, status=400)
+
+    agendas, hits = await agenda_cache.aagendas_em_cache([profissional_id], *periodo)
+    response = JsonResponse(agendas[profissional_id], safe=False)
+    response['X-Cache'] = 'HIT' if hits else 'MISS'
+    return response
+
+
+@require_GET
+@com_etag_assincrono(_marcador_expediente)
+async def horarios_disponiveis(request, pk):
+    """
+    Retorna os horários disponíveis e ocupados de um profissional em uma data específica.
+    """
+    profissional_id = await agenda_cache.aprofissional_do_expediente(pk)
+    if profissional_id is None:
+        # Mesma mensagem do get_object_or_404 usado pelo ViewSet
+        return JsonResponse({"detail": "No HorarioExpediente matches the given query."}, status=404)
+
+    data = request.GET.get('data')
+    if not data:
+        return JsonResponse({"erro": "A data é obrigatória. Use o parâmetro 'data' na URL."}, status=400)
+
+    try:
+        data_obj = datetime.strptime(data, '%Y-%m-%d').date()
+    except ValueError:
+        return JsonResponse({"erro": "Formato de data inválido. Use o formato 'YYYY-MM-DD'."}, status=400)
+
+    horario_ids = [
+        horario_id async for horario_id in HorarioExpediente.horarios.through.objects.filter(
+            horarioexpediente_id=pk
+        ).values_list('horario_id', flat=True)
+    ]
+    horarios_ocupados = {
+        hora async for hora in Agendamento.objects.filter(
+            profissional_id=profissional_id,
+            data=data_obj
+        ).values_list('hora', flat=True)
+    }
+    series = [
+        serie async for serie in SerieRecorrente.objects.no_periodo(data_obj, data_obj).filter(
+            profissional_id=profissional_id
+        )
+        if serie.ocorre_em(data_obj)
+    ]
+    if series:
+        materializadas = {par async for par in SerieRecorrente.materializadas(series, data_obj, data_obj)}
+        horarios_ocupados.update(serie.hora for serie in series if (serie.id, data_obj) not in materializadas)
+    grade = await sync_to_async(grade_horarios)()
+
+    resultado = [
+        {
+            "horario": linha.rotulo,
+            "ocupado": linha.horario in horarios_ocupados
+        }
+        for linha in grade.linhas_de(horario_ids)
+    ]
+    return JsonResponse(resultado, safe=False)
+
+
+@require_GET
+@com_etag_assincrono(_marcador_por_profissional)
+async def por_profissional(request):
+    """
+    Retorna os horários de expediente de um profissional específico.
+    """
+    profissional_id = request.GET.get('profissional')
+
+    if not profissional_id:
+        return JsonResponse({"erro": "O ID do profissional é obrigatório."}, status=400)
+
+    try:
+        profissional_id = int(profissional_id)
+    except ValueError:
+        return JsonResponse({"erro": "O ID do profissional deve ser um número inteiro."}, status=400)
+
+    expedientes = [exp async for exp in HorarioExpediente.objects.filter(profissional_id=profissional_id)]
+    por_expediente = {exp.pk: [] for exp in expedientes}
+    async for expediente_id, horario_id in HorarioExpediente.horarios.through.objects.filter(
+        horarioexpediente_id__in=por_expediente.keys()
+    ).values_list('horarioexpediente_id', 'horario_id'):
+        por_expediente[expediente_id].append(horario_id)
+    for expediente in expedientes:
+        expediente.horario_ids = por_expediente[expediente.pk]
+
+    # O serializer consulta a grade local de horários, que pode precisar recarregar do banco
+    dados = await sync_to_async(lambda: HorarioExpedienteSerializer(expedientes, many=True).data)()
+    return JsonResponse(dados, safe=False)
@@ -1,14 +1,39 @@
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
 from datetime import datetime
 
-from apps.agenda.models import HorarioExpediente, Agendamento
-from apps.agenda.serializers import HorarioExpedienteSerializer
+from apps.agenda import cache as agenda_cache
+from apps.agenda import provisionamento
+from apps.agenda.condicional import com_etag
+from apps.agenda.disponibilidade import ROTULOS
+from apps.agenda.horarios import grade_horarios, horario_ids_por_expediente, anexar_horario_ids
+from apps.agenda.models import HorarioExpediente, Agendamento, SerieRecorrente
+from apps.agenda.serializers import HorarioExpedienteSerializer, ProvisionamentoSerializer, CopiaSemanaSerializer
 
 from rest_framework.decorators import api_view
-from rest_framework.response import Response
-from apps.agenda.models.expediente import HORARIOS_DISPONIVEIS
+
+
+def _marcador_profissional(profissional_id):
+    if profissional_id is None:
+        return None
+    return sorted(agenda_cache.versoes([agenda_cache.VERSAO_GLOBAL, profissional_id]).values())
+
+
+def _marcador_expediente(view, request, pk=None):
+    try:
+        expediente_id = int(pk)
+    except (TypeError, ValueError):
+        return None
+    return _marcador_profissional(agenda_cache.profissional_do_expediente(expediente_id))
+
+
+def _marcador_por_profissional(view, request):
+    try:
+        return _marcador_profissional(int(request.query_params.get('profissional', '')))
+    except ValueError:
+        return None
 
 
 class HorarioExpedienteViewSet(viewsets.ModelViewSet):
@@ -19,10 +44,17 @@ class HorarioExpedienteViewSet(viewsets.ModelViewSet):
     queryset = HorarioExpediente.objects.all()
     serializer_class = HorarioExpedienteSerializer
 
+    def list(self, request, *args, **kwargs):
+        expedientes = anexar_horario_ids(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer(expedientes, many=True)
+        return Response(serializer.data)
+
     @action(detail=True, methods=['get'])
+    @com_etag(_marcador_expediente)
     def horarios_disponiveis(self, request, pk=None):
         """
         Retorna os horários disponíveis e ocupados de um profissional em uma data específica.
+        Ocorrências de séries recorrentes ainda não materializadas também ocupam o horário.
         """
         expediente = self.get_object()
         data = request.query_params.get('data')
@@ -35,23 +67,31 @@ class HorarioExpedienteViewSet(viewsets.ModelViewSet):
         except ValueError:
             return Response({"erro": "Formato de data inválido. Use o formato 'YYYY-MM-DD'."}, status=400)
 
-        horarios = expediente.horarios.all()
-        horarios_ocupados = Agendamento.objects.filter(
-            profissional=expediente.profissional,
+        horario_ids = horario_ids_por_expediente([expediente.pk])[expediente.pk]
+        horarios_ocupados = set(Agendamento.objects.filter(
+            profissional_id=expediente.profissional_id,
             data=data_obj
-        ).values_list('hora', flat=True)
+        ).values_list('hora', flat=True))
+        series = [
+            serie for serie in SerieRecorrente.objects.no_periodo(data_obj, data_obj).filter(
+                profissional_id=expediente.profissional_id
+            )
+            if serie.ocorre_em(data_obj)
+        ]
+        horarios_ocupados.update(ocorrencia.hora for ocorrencia in SerieRecorrente.expandir(series, data_obj, data_obj))
 
         resultado = [
             {
-                "horario": h.horario.strftime('%H:%M'),
-                "ocupado": h.horario in horarios_ocupados
+                "horario": linha.rotulo,
+                "ocupado": linha.horario in horarios_ocupados
             }
-            for h in horarios
+            for linha in grade_horarios().linhas_de(horario_ids)
         ]
 
         return Response(resultado)
 
     @action(detail=False, methods=['get'])
+    @com_etag(_marcador_por_profissional)
     def por_profissional(self, request):
         """
         Retorna os horários de expediente de um profissional específico.
@@ -66,9 +106,38 @@ class HorarioExpedienteViewSet(viewsets.ModelViewSet):
         except ValueError:
             return Response({"erro": "O ID do profissional deve ser um número inteiro."}, status=400)
 
-        expedientes = HorarioExpediente.objects.filter(profissional_id=profissional_id)
+        expedientes = anexar_horario_ids(HorarioExpediente.objects.filter(profissional_id=profissional_id))
         serializer = self.get_serializer(expedientes, many=True)
         return Response(serializer.data)
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def provisionar(self, request):
+        """
+        Aplica um modelo semanal a vários profissionais em uma única requisição (apenas admins).
+        Corpo: {"profissionais": [1, 2], "semana": [{"dia_semana": 0, "inicio": "09:00", "fim": "18:00"}, ...]}
+        """
+        serializer = ProvisionamentoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        expedientes, horarios = provisionamento.gravar_semanas(serializer.semanas())
+        return Response({"expedientes": expedientes, "horarios": horarios})
+
+    @action(detail=False, methods=['post'], url_path='copiar-semana', permission_classes=[IsAdminUser])
+    def copiar_semana(self, request):
+        """
+        Copia os expedientes de um profissional para outros (apenas admins).
+        Corpo: {"origem": 1, "destinos": [2, 3]}
+        """
+        serializer = CopiaSemanaSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        semana = provisionamento.semana_do_profissional(serializer.validated_data['origem'])
+        if not semana:
+            return Response({"erro": "O profissional de origem não possui expedientes."}, status=400)
+
+        expedientes, horarios = provisionamento.gravar_semanas(
+            {prof_id: semana for prof_id in serializer.validated_data['destinos']}
+        )
+        return Response({"expedientes": expedientes, "horarios": horarios})
     
 
 
@@ -77,4 +146,4 @@ def horarios_estabelecimento(request):
     """
     Retorna a lista de horários disponíveis do estabelecimento.
     """
-    return Response([h[1] for h in HORARIOS_DISPONIVEIS])
+    return Response(list(ROTULOS))
@@ -0,0 +1,117 @@
+from django.db import IntegrityError, transaction
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from datetime import datetime, timedelta
+
+from apps.agenda.models import Agendamento, SerieRecorrente
+from apps.agenda.serializers import AgendamentoSerializer, SerieRecorrenteSerializer
+
+
+class SerieRecorrenteViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet para gerenciar Séries Recorrentes.
+    A série guarda só a regra; criar ou cancelar uma série (mesmo sem fim)
+    não gera uma linha por ocorrência. As ocorrências de um período são
+    listadas em 'ocorrencias' (a listagem de agendamentos só traz linhas).
+    """
+    queryset = SerieRecorrente.objects.all()
+    serializer_class = SerieRecorrenteSerializer
+
+    def _ler_data(self, valor):
+        try:
+            return datetime.strptime(valor, '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            return None
+
+    @action(detail=False, methods=['get'])
+    def ocorrencias(self, request):
+        """
+        Lista as ocorrências ainda não materializadas das séries em um período.
+        Parâmetros: data_inicial, data_final (obrigatórios), profissional e cliente (opcionais).
+        """
+        data_inicial = self._ler_data(request.query_params.get('data_inicial'))
+        data_final = self._ler_data(request.query_params.get('data_final'))
+        if not data_inicial or not data_final:
+            return Response({"erro": "Informe 'data_inicial' e 'data_final' no formato 'YYYY-MM-DD'."}, status=400)
+        if data_final < data_inicial:
+            return Response({"erro": "A data final não pode ser anterior à data inicial."}, status=400)
+
+        series = SerieRecorrente.objects.no_periodo(data_inicial, data_final).select_related(
+            'cliente', 'profissional', 'servico'
+        )
+        for campo in ('profissional', 'cliente'):
+            valor = request.query_params.get(campo)
+            if valor:
+                series = series.filter(**{f'{campo}_id': valor})
+
+        ocorrencias = sorted(
+            SerieRecorrente.expandir(series, data_inicial, data_final),
+            key=lambda oc: (oc.data, oc.hora)
+        )
+        return Response(AgendamentoSerializer(ocorrencias, many=True).data)
+
+    @action(detail=True, methods=['post'])
+    def materializar(self, request, pk=None):
+        """
+        Cria o Agendamento de uma ocorrência da série para que ela possa ser
+        editada, concluída ou cancelada individualmente.
+        Espera receber {"data": "YYYY-MM-DD"} no corpo da requisição.
+        """
+        serie = self.get_object()
+        data = self._ler_data(request.data.get('data'))
+        if not data:
+            return Response({"erro": "Informe 'data' no formato 'YYYY-MM-DD'."}, status=status.HTTP_400_BAD_REQUEST)
+        if not serie.ocorre_em(data):
+            return Response({"erro": "A série não possui ocorrência nesta data."}, status=status.HTTP_400_BAD_REQUEST)
+
+        existente = serie.ocorrencias_materializadas.filter(data_ocorrencia=data).first()
+        if existente:
+            return Response(AgendamentoSerializer(existente).data, status=status.HTTP_200_OK)
+
+        agendamento = serie.ocorrencia(data)
+        try:
+            agendamento.save()
+        except IntegrityError:
+            agendamento = serie.ocorrencias_materializadas.get(data_ocorrencia=data)
+            return Response(AgendamentoSerializer(agendamento).data, status=status.HTTP_200_OK)
+        return Response(AgendamentoSerializer(agendamento).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def encerrar(self, request, pk=None):
+        """
+        Encerra a série a partir de uma data, mantendo as ocorrências anteriores.
+        Espera receber {"data": "YYYY-MM-DD"}; ocorrências materializadas a partir dela são removidas.
+        """
+        serie = self.get_object()
+        data = self._ler_data(request.data.get('data'))
+        if not data:
+            return Response({"erro": "Informe 'data' no formato 'YYYY-MM-DD'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if data <= serie.data_inicio:
+            removidos, _ = serie.delete()
+            return Response({"removidos": removidos}, status=status.HTTP_200_OK)
+
+        serie.data_fim = data - timedelta(days=1)
+        serie.save(update_fields=['data_fim'])
+        removidos, _ = Agendamento.objects.filter(serie=serie, data_ocorrencia__gte=data).delete()
+        return Response({**self.get_serializer(serie).data, "removidos": removidos}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['post'], url_path='excluir-ocorrencia')
+    def excluir_ocorrencia(self, request, pk=None):
+        """
+        Pula uma ocorrência da série, sem materializá-la; se ela já foi
+        materializada, a linha é removida.
+        Espera receber {"data": "YYYY-MM-DD"} no corpo da requisição.
+        """
+        serie = self.get_object()
+        data = self._ler_data(request.data.get('data'))
+        if not data:
+            return Response({"erro": "Informe 'data' no formato 'YYYY-MM-DD'."}, status=status.HTTP_400_BAD_REQUEST)
+        if data.isoformat() not in serie.datas_excluidas and not serie.ocorre_em(data):
+            return Response({"erro": "A série não possui ocorrência nesta data."}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            serie.excluir_data(data)
+            removidos, _ = Agendamento.objects.filter(serie=serie, data_ocorrencia=data).delete()
+        return Response({**self.get_serializer(serie).data, "removidos": removidos}, status=status.HTTP_200_OK)
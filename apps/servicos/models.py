@@ -1,9 +1,13 @@
+import logging
+
 from django.db import models
 from django.core.exceptions import ValidationError
 from datetime import timedelta
 
 from apps.usuario.models import Usuario, TipoUsuario
 
+logger = logging.getLogger(__name__)
+
 
 class Servico(models.Model):
     """
@@ -44,4 +48,6 @@ class Servico(models.Model):
             raise ValidationError("A duração do serviço deve ser positiva.")
 
         if self.duracao.total_seconds() % (30 * 60) != 0:
-            print(f"Aviso: Serviço '{self.nome}' tem duração ({self.duracao}) que não é múltiplo exato de 30 minutos.")
+            logger.warning(
+                "Serviço '%s' tem duração (%s) que não é múltiplo exato de 30 minutos.", self.nome, self.duracao
+            )
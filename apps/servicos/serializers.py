@@ -1,7 +1,55 @@
 from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, MANY_RELATION_KWARGS
 from .models import Servico
+from apps.usuario.models import Usuario, TipoUsuario
+
+
+class ManyRelatedEmLoteField(ManyRelatedField):
+    """
+    Igual ao ManyRelatedField, mas busca todos os ids informados em uma única
+    query (o padrão do DRF faz uma query por id).
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        relacao = self.child_relation
+        pks = []
+        for pk in data:
+            try:
+                if isinstance(pk, bool):
+                    raise TypeError
+                pks.append(relacao.pk_field.to_internal_value(pk) if relacao.pk_field else int(pk))
+            except (TypeError, ValueError):
+                relacao.fail('incorrect_type', data_type=type(pk).__name__)
+
+        encontrados = relacao.get_queryset().in_bulk(pks)
+        for pk in pks:
+            if pk not in encontrados:
+                relacao.fail('does_not_exist', pk_value=pk)
+        return [encontrados[pk] for pk in pks]
+
+
+class PrimaryKeyEmLoteField(serializers.PrimaryKeyRelatedField):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManyRelatedEmLoteField(**list_kwargs)
+
 
 class ServicoSerializer(serializers.ModelSerializer):
+    profissionais = PrimaryKeyEmLoteField(
+        many=True,
+        allow_empty=False,
+        queryset=Usuario.objects.filter(tipo=TipoUsuario.PROFISSIONAL)
+    )
+
     class Meta:
         model = Servico
         fields = '__all__'
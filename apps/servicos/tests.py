@@ -3,6 +3,7 @@ from datetime import timedelta
 
 from apps.usuario.models import Usuario, TipoUsuario
 from apps.servicos.models import Servico
+from apps.servicos.serializers import ServicoSerializer
 from django.core.exceptions import ValidationError
 
 
@@ -51,8 +52,10 @@ class ServicoModelTests(TestCase):
             duracao=timedelta(minutes=45),
             preco=150
         )
-        # A clean() só exibe print, não levanta erro nesse caso
-        servico.clean()
+        # A clean() só registra um aviso, não levanta erro nesse caso
+        with self.assertLogs('apps.servicos.models', level='WARNING') as logs:
+            servico.clean()
+        self.assertIn("não é múltiplo exato de 30 minutos", logs.output[0])
 
     def test_profissionais_deve_aceitar_apenas_profissionais(self):
         """Somente usuários com tipo PROFISSIONAL podem ser vinculados ao serviço."""
@@ -85,3 +88,49 @@ class ServicoModelTests(TestCase):
             duracao=timedelta(minutes=60)
         )
         self.assertIn("Design de Sobrancelha", str(servico))
+
+
+class ServicoSerializerTests(TestCase):
+    def setUp(self):
+        self.profissionais = [
+            Usuario.objects.create_user(
+                email=f"prof{i}@test.com",
+                password="senha123",
+                nome_completo=f"Profissional {i}",
+                tipo=TipoUsuario.PROFISSIONAL
+            )
+            for i in range(3)
+        ]
+        self.cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+
+    def _serializer(self, profissionais):
+        return ServicoSerializer(data={
+            "nome": "Manicure",
+            "preco": "40.00",
+            "duracao": "00:30:00",
+            "profissionais": profissionais,
+        })
+
+    def test_profissionais_validados_em_uma_query(self):
+        serializer = self._serializer([p.id for p in self.profissionais])
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["profissionais"], self.profissionais)
+
+    def test_profissionais_invalidos(self):
+        serializer = self._serializer([self.profissionais[0].id, self.cliente.id])
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors["profissionais"][0].code, "does_not_exist")
+
+        serializer = self._serializer(["abc"])
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors["profissionais"][0].code, "incorrect_type")
+
+        serializer = self._serializer([])
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors["profissionais"][0].code, "empty")
@@ -1,10 +1,12 @@
 from rest_framework.routers import DefaultRouter
-from .views import ServicoViewSet
+from .views import ServicoViewSet, listar_servicos
 from django.urls import path, include
 
 router = DefaultRouter()
 router.register(r'', ServicoViewSet)
 
 urlpatterns = [
+    # Antes do router, cuja rota de detalhe também casaria com 'async/'
+    path('async/', listar_servicos, name='async-servico-list'),
     path('', include(router.urls)),
 ]
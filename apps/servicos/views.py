@@ -1,7 +1,43 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets
 from .models import Servico
 from .serializers import ServicoSerializer
 
+from apps.agenda import cache as agenda_cache
+from apps.agenda.condicional import com_etag, com_etag_assincrono
+
+
+def _marcador_servicos(view, request):
+    return agenda_cache.versoes([agenda_cache.VERSAO_SERVICOS])[agenda_cache.VERSAO_SERVICOS]
+
+
+async def _amarcador_servicos(request):
+    return (await agenda_cache.aversoes([agenda_cache.VERSAO_SERVICOS]))[agenda_cache.VERSAO_SERVICOS]
+
+
 class ServicoViewSet(viewsets.ModelViewSet):
     queryset = Servico.objects.all()
     serializer_class = ServicoSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Uma query para os profissionais de todos os serviços, e não uma por serviço
+            queryset = queryset.prefetch_related('profissionais')
+        return queryset
+
+    @com_etag(_marcador_servicos)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+
+@require_GET
+@com_etag_assincrono(_amarcador_servicos)
+async def listar_servicos(request):
+    """
+    Versão assíncrona (ASGI) da listagem de serviços, com a mesma resposta e
+    o mesmo ETag. Os profissionais vêm do prefetch, então serializar não faz query.
+    """
+    servicos = [servico async for servico in Servico.objects.prefetch_related('profissionais')]
+    return JsonResponse(ServicoSerializer(servicos, many=True).data, safe=False)
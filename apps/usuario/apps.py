@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UsuarioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.usuario'
+
+    def ready(self):
+        from apps.usuario import signals  # noqa: F401
@@ -1,7 +1,12 @@
 import logging
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework.exceptions import AuthenticationFailed
 
+from apps.usuario.auth.cache_tokens import tokens_validados
+from apps.usuario.auth.tokens import token_revogado
+
 logger = logging.getLogger(__name__)
 
 
@@ -9,12 +14,13 @@ class CookieJWTAuthentication(JWTAuthentication):
     """
     Autenticação personalizada via cookie HTTP-only.
     Lê o token JWT do cookie 'access_token' em vez do header Authorization.
+    O usuário vem das claims do token (UsuarioToken), sem buscar a linha no banco.
     """
 
     def authenticate(self, request):
         # Obtém o token do cookie (se presente)
         raw_token = request.COOKIES.get("access_token")
-        logger.debug(f"🧪 Token bruto encontrado no cookie: {raw_token}")
+        logger.debug("🧪 Token bruto encontrado no cookie: %s", raw_token)
 
         if raw_token is None:
             logger.warning("⚠️ Nenhum access_token presente no cookie.")
@@ -23,10 +29,25 @@ class CookieJWTAuthentication(JWTAuthentication):
         try:
             validated_token = self.get_validated_token(raw_token)
         except Exception as e:
-            logger.error(f"❌ Erro ao validar token JWT: {e}")
+            logger.warning("❌ Erro ao validar token JWT: %s", e)
             raise AuthenticationFailed("Token inválido ou expirado.")
 
         user = self.get_user(validated_token)
-        logger.debug(f"🔐 Usuário autenticado via token: {user}")
+        logger.debug("🔐 Usuário autenticado via token: %s", user)
 
         return (user, validated_token)
+
+    def get_validated_token(self, raw_token):
+        # Assinatura e claims de um token já visto por este processo não são verificadas de novo
+        token = tokens_validados.obter(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            tokens_validados.guardar(raw_token, token)
+        return token
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("O token não identifica o usuário.")
+        if token_revogado(validated_token):
+            raise AuthenticationFailed("Token revogado. Faça login novamente.", code="token_revogado")
+        return api_settings.TOKEN_USER_CLASS(validated_token)
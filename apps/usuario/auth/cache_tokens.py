@@ -0,0 +1,78 @@
+"""
+Cache LRU, por processo, dos access tokens já validados.
+
+O mesmo cookie chega em muitas requisições seguidas; guardar o token
+validado evita decodificar o JWT e verificar a assinatura HMAC de novo. A
+chave é o sha256 do token bruto (o token em si não fica na memória como
+chave) e cada entrada vale até o 'exp' do token. O tamanho é fixo: ao
+passar de JWT_CACHE_TAMANHO, sai o token usado há mais tempo.
+
+A checagem de revogação (ver ``tokens``) continua rodando a cada requisição;
+só o trabalho criptográfico é reaproveitado.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class CacheTokens:
+    def __init__(self, tamanho):
+        self.tamanho = tamanho
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.despejos = 0
+
+    @staticmethod
+    def _chave(raw_token):
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode()
+        return hashlib.sha256(raw_token).digest()
+
+    def obter(self, raw_token):
+        """Token validado guardado para raw_token, ou None se ausente ou expirado."""
+        chave = self._chave(raw_token)
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None:
+                token, expira_em = item
+                if expira_em > time.time():
+                    self._itens.move_to_end(chave)
+                    self.hits += 1
+                    return token
+                del self._itens[chave]
+            self.misses += 1
+            return None
+
+    def guardar(self, raw_token, token):
+        expira_em = token.get('exp')
+        if not expira_em or self.tamanho <= 0:
+            return
+        chave = self._chave(raw_token)
+        with self._lock:
+            self._itens[chave] = (token, expira_em)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho:
+                self._itens.popitem(last=False)
+                self.despejos += 1
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'despejos': self.despejos,
+                'tamanho': len(self._itens),
+                'capacidade': self.tamanho,
+            }
+
+
+tokens_validados = CacheTokens(settings.JWT_CACHE_TAMANHO)
@@ -1,16 +1,25 @@
 from django.contrib.auth import authenticate
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.usuario.auth.tokens import adicionar_claims
+from apps.usuario.models import Usuario
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     Serializer customizado para login com email e senha.
     Retorna access_token e refresh_token em caso de sucesso.
+    Os tokens levam as claims do usuário usadas pela autenticação (ver ``tokens``).
     """
     username_field = 'email'
 
+    @classmethod
+    def get_token(cls, user):
+        return adicionar_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         # Captura as credenciais do request
         credentials = {
@@ -28,8 +37,22 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             raise serializers.ValidationError('Email ou senha inválidos.')
 
         # Gera os tokens JWT
-        refresh = RefreshToken.for_user(user)
+        refresh = self.get_token(user)
         return {
             'refresh': str(refresh),
             'access': str(refresh.access_token),
         }
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Gera o novo access token com as claims atuais do usuário, e não as
+    copiadas do refresh token, que pode ter sido emitido há semanas.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        usuario = Usuario.objects.filter(pk=refresh[api_settings.USER_ID_CLAIM]).first()
+        if usuario is None or not usuario.is_active:
+            raise AuthenticationFailed('Usuário inativo ou removido.', code='user_inactive')
+        return {'access': str(adicionar_claims(refresh.access_token, usuario))}
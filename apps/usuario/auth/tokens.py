@@ -0,0 +1,106 @@
+"""
+Usuário sem estado a partir do access token.
+
+O login grava no token as claims que quase todo endpoint usa (``tipo``,
+``is_active`` e ``is_staff``). A autenticação monta um ``UsuarioToken`` com
+elas em vez de buscar a linha do Usuario; o resto dos campos é carregado na
+primeira vez que algum código precisa deles.
+
+Como o token vale até expirar, cada requisição confere a situação atual do
+usuário (ativo, tipo, is_staff) em um cache com TTL curto, limpo pelos
+signals quando o usuário muda. Usuário removido, desativado ou com tipo ou
+permissão diferente do token tem o token recusado e precisa entrar de novo.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.usuario.models import Usuario
+from config.roteamento import usar_primario
+
+CLAIMS_USUARIO = ('tipo', 'is_active', 'is_staff')
+
+
+def adicionar_claims(token, usuario):
+    """Grava no token (refresh ou access) as claims de CLAIMS_USUARIO."""
+    for claim in CLAIMS_USUARIO:
+        token[claim] = getattr(usuario, claim)
+    return token
+
+
+def _chave_situacao(usuario_id):
+    return f'usuario:{usuario_id}:situacao'
+
+
+def situacao_usuario(usuario_id):
+    """
+    Valores atuais de CLAIMS_USUARIO para o usuário, ou None se ele não existe.
+    Guardados em cache por JWT_REVOGACAO_TTL segundos.
+    """
+    chave = _chave_situacao(usuario_id)
+    situacao = cache.get(chave)
+    if situacao is None:
+        with usar_primario():
+            linha = Usuario.objects.filter(pk=usuario_id).values_list(*CLAIMS_USUARIO).first()
+        # Tupla vazia marca o usuário inexistente sem ser confundida com ausência no cache
+        situacao = linha or ()
+        cache.set(chave, situacao, settings.JWT_REVOGACAO_TTL)
+    return dict(zip(CLAIMS_USUARIO, situacao)) or None
+
+
+def esquecer_situacao(usuario_id):
+    cache.delete(_chave_situacao(usuario_id))
+
+
+def token_revogado(token):
+    """
+    Indica se o token não vale mais: usuário removido ou inativo, ou claims
+    diferentes da situação atual. Tokens sem as claims (emitidos antes delas)
+    só são recusados pelos dois primeiros motivos.
+    """
+    situacao = situacao_usuario(token[api_settings.USER_ID_CLAIM])
+    if situacao is None or not situacao['is_active']:
+        return True
+    return any(claim in token and token[claim] != atual for claim, atual in situacao.items())
+
+
+class UsuarioToken(TokenUser):
+    """
+    Usuário montado a partir das claims do token, sem query.
+    Atributos que não estão no token (nome_completo, email, ...) vêm da linha
+    do Usuario, buscada uma única vez quando o primeiro deles é lido. Para
+    filtros do ORM use ``user.id`` ou ``user.usuario``.
+    """
+
+    @cached_property
+    def usuario(self):
+        return Usuario.objects.get(pk=self.id)
+
+    def _claim(self, nome):
+        if nome in self.token:
+            return self.token[nome]
+        return getattr(self.usuario, nome)
+
+    @cached_property
+    def tipo(self):
+        return self._claim('tipo')
+
+    @cached_property
+    def is_active(self):
+        return self._claim('is_active')
+
+    @cached_property
+    def is_staff(self):
+        return self._claim('is_staff')
+
+    @cached_property
+    def is_superuser(self):
+        return self.usuario.is_superuser
+
+    def __getattr__(self, nome):
+        # Chamado só para atributos que não existem nesta classe
+        if nome.startswith('_'):
+            raise AttributeError(nome)
+        return getattr(self.usuario, nome)
@@ -7,7 +7,7 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from ..auth.serializers_auth import CustomTokenObtainPairSerializer
+from ..auth.serializers_auth import CustomTokenObtainPairSerializer, CustomTokenRefreshSerializer
 from ..serializers import UsuarioSerializer
 
 logger = logging.getLogger(__name__)
@@ -54,7 +54,7 @@ class CookieTokenObtainPairView(TokenObtainPairView):
             response.data.pop("refresh", None)
             response.data.pop("access", None)
         else:
-            logger.warning(f"❌ Falha no login. Status: {response.status_code}")
+            logger.warning("❌ Falha no login. Status: %s", response.status_code)
 
         return response
 
@@ -63,11 +63,12 @@ class CookieTokenRefreshView(TokenRefreshView):
     """
     Gera novo access token a partir do refresh token armazenado no cookie.
     """
+    serializer_class = CustomTokenRefreshSerializer
     permission_classes = [permissions.AllowAny]
 
     def post(self, request, *args, **kwargs):
         refresh_token = request.COOKIES.get("refresh_token")
-        logger.debug(f"♻️ Tentativa de refresh. Token encontrado? {bool(refresh_token)}")
+        logger.debug("♻️ Tentativa de refresh. Token encontrado? %s", bool(refresh_token))
 
         if not refresh_token:
             logger.error("❌ Refresh token não encontrado no cookie.")
@@ -85,7 +86,7 @@ class LogoutView(APIView):
     Realiza logout, removendo os cookies de autenticação.
     """
     def post(self, request):
-        logger.debug(f"🚪 Logout iniciado para usuário: {request.user}")
+        logger.debug("🚪 Logout iniciado para usuário: %s", request.user)
 
         response = Response(
             {"detail": "Logout realizado com sucesso"},
@@ -0,0 +1,41 @@
+"""
+Texto normalizado para a busca de usuários.
+
+``Usuario.busca`` guarda nome, e-mail, telefone e CPF em minúsculas, sem
+acentos e com telefone e CPF só com dígitos. A busca vira um
+``LIKE '%termo%'`` por termo nessa coluna, que no PostgreSQL tem um índice
+de trigramas (pg_trgm) e por isso não precisa varrer a tabela. Cada termo
+precisa de ao menos TAMANHO_MINIMO caracteres: um trigrama tem três, e um
+termo mais curto não usa o índice.
+"""
+import re
+import unicodedata
+
+CAMPOS_BUSCA = ('nome_completo', 'email', 'telefone', 'cpf')
+TAMANHO_MINIMO = 3
+
+_NAO_DIGITO = re.compile(r'\D')
+# Termos como "123.456.789-01" ou "(11)" são um CPF ou telefone formatado
+_NUMERO_FORMATADO = re.compile(r'^[\d.\-/()+]*\d[\d.\-/()+]*$')
+
+
+def normalizar(texto):
+    """Minúsculas, sem acentos e com os espaços colapsados."""
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.casefold().split())
+
+
+def texto_busca(nome_completo, email, telefone, cpf):
+    """Conteúdo da coluna ``busca`` para os valores dos campos pesquisáveis."""
+    partes = [normalizar(nome_completo), normalizar(email)]
+    partes += [_NAO_DIGITO.sub('', valor) for valor in (telefone, cpf) if valor]
+    return ' '.join(parte for parte in partes if parte)
+
+
+def termos_busca(consulta):
+    """Termos normalizados da consulta; números formatados ficam só com os dígitos."""
+    return [
+        _NAO_DIGITO.sub('', termo) if _NUMERO_FORMATADO.match(termo) else termo
+        for termo in normalizar(consulta).split()
+    ]
@@ -0,0 +1,82 @@
+import re
+import unicodedata
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+# Cópia congelada de apps.usuario.busca.texto_busca: a migração não pode
+# depender do código atual, que pode mudar depois dela
+_NAO_DIGITO = re.compile(r'\D')
+
+INDICE_TRIGRAMA = GinIndex(fields=['busca'], name='usuario_busca_trgm_idx', opclasses=['gin_trgm_ops'])
+
+
+class CriarTrigramas(TrigramExtension):
+    """O database_backwards do CreateExtension consulta pg_extension mesmo fora do PostgreSQL."""
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def _normalizar(texto):
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.casefold().split())
+
+
+def _texto_busca(nome_completo, email, telefone, cpf):
+    partes = [_normalizar(nome_completo), _normalizar(email)]
+    partes += [_NAO_DIGITO.sub('', valor) for valor in (telefone, cpf) if valor]
+    return ' '.join(parte for parte in partes if parte)
+
+
+def preencher_busca(apps, schema_editor):
+    Usuario = apps.get_model('usuario', 'Usuario')
+    lote = []
+    campos = ('id', 'nome_completo', 'email', 'telefone', 'cpf')
+    for usuario in Usuario.objects.only(*campos).iterator(chunk_size=2000):
+        usuario.busca = _texto_busca(usuario.nome_completo, usuario.email, usuario.telefone, usuario.cpf)
+        lote.append(usuario)
+        if len(lote) >= 2000:
+            Usuario.objects.bulk_update(lote, ['busca'])
+            lote = []
+    if lote:
+        Usuario.objects.bulk_update(lote, ['busca'])
+
+
+# Só o PostgreSQL tem pg_trgm; nos outros bancos a busca usa a coluna sem
+# índice de trigramas. O índice fica fora do estado dos models para que o
+# SQLite não tente recriá-lo ao refazer a tabela em migrações futuras.
+def criar_indice_trigrama(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('usuario', 'Usuario'), INDICE_TRIGRAMA)
+
+
+def remover_indice_trigrama(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('usuario', 'Usuario'), INDICE_TRIGRAMA)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('usuario', '0005_alter_usuario_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='busca',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(preencher_busca, migrations.RunPython.noop),
+        CriarTrigramas(),
+        migrations.RunPython(criar_indice_trigrama, remover_indice_trigrama),
+        migrations.AddIndex(
+            model_name='usuario',
+            index=models.Index(fields=['tipo', 'nome_completo', 'id'], name='usuario_tipo_nome_idx'),
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
 from django.utils.timezone import now
 
+from .busca import CAMPOS_BUSCA, texto_busca
+
 # Tipos de usuário disponíveis
 class TipoUsuario(models.TextChoices):
     ADMIN = 'ADMIN', 'Administrador'
@@ -57,6 +59,9 @@ class Usuario(AbstractUser):
     created_at = models.DateTimeField(default=now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Nome, e-mail, telefone e CPF normalizados para a busca (ver apps.usuario.busca)
+    busca = models.TextField(default='', editable=False)
+
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['nome_completo', 'tipo']
 
@@ -65,6 +70,20 @@ class Usuario(AbstractUser):
     def __str__(self):
         return self.nome_completo
 
+    def atualizar_busca(self):
+        self.busca = texto_busca(self.nome_completo, self.email, self.telefone, self.cpf)
+
+    def save(self, *args, **kwargs):
+        self.atualizar_busca()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(CAMPOS_BUSCA):
+            kwargs['update_fields'] = {*update_fields, 'busca'}
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Usuário"
         verbose_name_plural = "Usuários"
+        indexes = [
+            # Filtro por ?tipo= já na ordem da paginação da busca
+            models.Index(fields=['tipo', 'nome_completo', 'id'], name='usuario_tipo_nome_idx'),
+        ]
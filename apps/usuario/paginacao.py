@@ -0,0 +1,13 @@
+from rest_framework.pagination import CursorPagination
+
+
+class BuscaUsuarioPagination(CursorPagination):
+    """
+    Paginação por cursor (keyset) dos resultados da busca de usuários,
+    na ordem do índice (tipo, nome_completo, id).
+    Use ?limite= para o tamanho da página e siga os links 'next'/'previous'.
+    """
+    ordering = ('nome_completo', 'id')
+    page_size = 20
+    page_size_query_param = 'limite'
+    max_page_size = 100
@@ -67,3 +67,12 @@ class UsuarioCreateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         return Usuario.objects.create_user(**validated_data)
+
+
+class UsuarioBuscaSerializer(serializers.ModelSerializer):
+    """Só os campos que a lista de resultados da busca exibe."""
+
+    class Meta:
+        model = Usuario
+        fields = ['id', 'nome_completo', 'email', 'telefone', 'cpf', 'tipo']
+        read_only_fields = fields
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.usuario.auth.tokens import esquecer_situacao
+from apps.usuario.models import Usuario
+
+
+@receiver(post_save, sender=Usuario)
+@receiver(post_delete, sender=Usuario)
+def atualizar_situacao_usuario(sender, instance, **kwargs):
+    """Força a próxima requisição a reler a situação do usuário para a checagem de revogação."""
+    esquecer_situacao(instance.pk)
@@ -0,0 +1,91 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from ..busca import termos_busca, texto_busca
+from ..models import Usuario, TipoUsuario
+
+
+class TextoBuscaTests(TestCase):
+    def test_normaliza_acentos_maiusculas_e_numeros(self):
+        self.assertEqual(
+            texto_busca("José  ÁVILA", "Jose@Exemplo.com", "(11) 98765-4321", "12345678901"),
+            "jose avila jose@exemplo.com 11987654321 12345678901"
+        )
+
+    def test_termos_formatados_ficam_so_com_digitos(self):
+        self.assertEqual(termos_busca(" Conceição 123.456.789-01 (11) "), ["conceicao", "12345678901", "11"])
+
+    def test_save_atualiza_busca(self):
+        usuario = Usuario.objects.create_user(
+            email="ana@test.com", password="senha123", nome_completo="Ana", tipo=TipoUsuario.CLIENTE
+        )
+        usuario.nome_completo = "Ângela"
+        usuario.save(update_fields=['nome_completo'])
+        usuario.refresh_from_db()
+        self.assertEqual(usuario.busca, "angela ana@test.com")
+
+
+class BuscarUsuariosTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = Usuario.objects.create_superuser(email="admin@test.com", password="senha123")
+        self.client.force_authenticate(self.admin)
+        self.url = reverse('usuario-buscar')
+
+        dados = [
+            ("João da Silva", "joao@test.com", "11987654321", "12345678901", TipoUsuario.CLIENTE),
+            ("Joana Souza", "joana@test.com", "21912345678", None, TipoUsuario.CLIENTE),
+            ("Conceição Silva", "ceica@test.com", None, "98765432100", TipoUsuario.CLIENTE),
+            ("João Barbeiro", "barbeiro@test.com", None, None, TipoUsuario.PROFISSIONAL),
+        ]
+        for nome, email, telefone, cpf, tipo in dados:
+            Usuario.objects.create_user(
+                email=email, password="senha123", nome_completo=nome, telefone=telefone, cpf=cpf, tipo=tipo
+            )
+
+    def _nomes(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [usuario['nome_completo'] for usuario in response.data['results']]
+
+    def test_prefixo_e_substring_sem_acentos(self):
+        self.assertEqual(self._nomes({"q": "JOA"}), ["Joana Souza", "João Barbeiro", "João da Silva"])
+        self.assertEqual(self._nomes({"q": "conceicao"}), ["Conceição Silva"])
+        self.assertEqual(self._nomes({"q": "silv"}), ["Conceição Silva", "João da Silva"])
+
+    def test_todos_os_termos_precisam_casar(self):
+        self.assertEqual(self._nomes({"q": "joão silva"}), ["João da Silva"])
+
+    def test_email_telefone_e_cpf(self):
+        self.assertEqual(self._nomes({"q": "ceica@"}), ["Conceição Silva"])
+        self.assertEqual(self._nomes({"q": "(11)98765-4321"}), ["João da Silva"])
+        self.assertEqual(self._nomes({"q": "987.654.321-00"}), ["Conceição Silva"])
+
+    def test_filtra_por_tipo(self):
+        self.assertEqual(self._nomes({"q": "joao", "tipo": TipoUsuario.CLIENTE}), ["João da Silva"])
+
+    def test_resultado_enxuto_e_paginado(self):
+        response = self.client.get(self.url, {"q": "test.com", "limite": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(
+            set(response.data['results'][0]), {'id', 'nome_completo', 'email', 'telefone', 'cpf', 'tipo'}
+        )
+
+        nomes = [usuario['nome_completo'] for usuario in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            nomes += [usuario['nome_completo'] for usuario in response.data['results']]
+        self.assertEqual(nomes, sorted(nomes))
+        self.assertEqual(len(nomes), Usuario.objects.count())
+
+    def test_consulta_curta(self):
+        for q in ("", "a", " - ", "a b", "joão da silva", "(11) 98765-4321"):
+            response = self.client.get(self.url, {"q": q})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("erro", response.data)
+
+    def test_exige_admin(self):
+        self.client.force_authenticate(Usuario.objects.get(email="joao@test.com"))
+        self.assertEqual(self.client.get(self.url, {"q": "joao"}).status_code, 403)
@@ -0,0 +1,84 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.usuario.auth.authentication import CookieJWTAuthentication
+from apps.usuario.auth.cache_tokens import CacheTokens, tokens_validados
+from config.metricas import texto_prometheus
+
+
+class CacheTokensTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        tokens_validados.limpar()
+        self.user = Usuario.objects.create_user(
+            email="user@test.com",
+            password="senha123",
+            nome_completo="Usuário Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+
+    def _autenticar(self, raw_token):
+        request = APIRequestFactory().get("/")
+        request.COOKIES["access_token"] = raw_token
+        return CookieJWTAuthentication().authenticate(request)
+
+    def test_token_repetido_nao_e_verificado_de_novo(self):
+        raw_token = str(AccessToken.for_user(self.user))
+        antes = tokens_validados.estatisticas()
+        with mock.patch.object(
+            JWTAuthentication, 'get_validated_token', wraps=JWTAuthentication().get_validated_token
+        ) as verificar:
+            for _ in range(3):
+                user, token = self._autenticar(raw_token)
+        self.assertEqual(verificar.call_count, 1)
+        self.assertEqual(user.id, self.user.id)
+
+        depois = tokens_validados.estatisticas()
+        self.assertEqual(depois['hits'] - antes['hits'], 2)
+        self.assertEqual(depois['misses'] - antes['misses'], 1)
+
+    def test_token_em_cache_ainda_passa_pela_revogacao(self):
+        raw_token = str(AccessToken.for_user(self.user))
+        self._autenticar(raw_token)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self._autenticar(raw_token)
+
+    def test_token_invalido_nao_entra_no_cache(self):
+        with self.assertRaises(AuthenticationFailed):
+            self._autenticar("token_invalido")
+        self.assertEqual(tokens_validados.estatisticas()['tamanho'], 0)
+
+    def test_lru_despeja_o_usado_ha_mais_tempo(self):
+        lru = CacheTokens(2)
+        expira_em = time.time() + 60
+        for nome in ("a", "b"):
+            lru.guardar(nome, {"exp": expira_em, "nome": nome})
+        lru.obter("a")
+        lru.guardar("c", {"exp": expira_em, "nome": "c"})
+
+        self.assertIsNone(lru.obter("b"))
+        self.assertEqual(lru.obter("a")["nome"], "a")
+        self.assertEqual(lru.obter("c")["nome"], "c")
+        self.assertEqual(lru.estatisticas(), {'hits': 3, 'misses': 1, 'despejos': 1, 'tamanho': 2, 'capacidade': 2})
+
+    def test_token_expirado_sai_do_cache(self):
+        lru = CacheTokens(2)
+        lru.guardar("a", {"exp": time.time() - 1})
+        self.assertIsNone(lru.obter("a"))
+        self.assertEqual(lru.estatisticas()['tamanho'], 0)
+
+    def test_estatisticas_nas_metricas(self):
+        self._autenticar(str(AccessToken.for_user(self.user)))
+        texto = texto_prometheus()
+        self.assertRegex(texto, r'jwt_cache_faltas_total\{pid="\d+"\} [1-9]')
+        self.assertRegex(texto, r'jwt_cache_tokens\{pid="\d+"\} 1')
@@ -0,0 +1,114 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.usuario.auth.authentication import CookieJWTAuthentication
+from apps.usuario.auth.serializers_auth import CustomTokenObtainPairSerializer
+from apps.usuario.auth.tokens import UsuarioToken
+
+
+class UsuarioTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.user = Usuario.objects.create_user(
+            email="user@test.com",
+            password="senha123",
+            nome_completo="Usuário Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+
+    def _token(self):
+        return str(CustomTokenObtainPairSerializer.get_token(self.user).access_token)
+
+    def _autenticar(self, token):
+        request = self.factory.get("/")
+        request.COOKIES["access_token"] = token
+        return CookieJWTAuthentication().authenticate(request)
+
+    def test_login_grava_claims_do_usuario(self):
+        serializer = CustomTokenObtainPairSerializer(data={"email": "user@test.com", "password": "senha123"})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        access = AccessToken(serializer.validated_data["access"])
+        self.assertEqual(access["tipo"], TipoUsuario.CLIENTE)
+        self.assertTrue(access["is_active"])
+        self.assertFalse(access["is_staff"])
+
+    def test_autenticacao_sem_query_com_situacao_em_cache(self):
+        token = self._token()
+        self._autenticar(token)
+        with self.assertNumQueries(0):
+            user, _ = self._autenticar(token)
+            self.assertIsInstance(user, UsuarioToken)
+            self.assertEqual(user.id, self.user.id)
+            self.assertEqual(user.tipo, TipoUsuario.CLIENTE)
+            self.assertFalse(user.is_staff)
+            self.assertTrue(user.is_authenticated)
+
+    def test_demais_campos_carregados_sob_demanda(self):
+        user, _ = self._autenticar(self._token())
+        with self.assertNumQueries(1):
+            self.assertEqual(user.nome_completo, "Usuário Teste")
+            self.assertEqual(user.email, "user@test.com")
+        self.assertEqual(user, self.user)
+
+    def test_token_sem_claims_usa_a_linha_do_usuario(self):
+        user, _ = self._autenticar(str(AccessToken.for_user(self.user)))
+        self.assertEqual(user.tipo, TipoUsuario.CLIENTE)
+
+    def test_usuario_desativado_tem_token_recusado(self):
+        token = self._token()
+        self._autenticar(token)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self._autenticar(token)
+
+    def test_usuario_removido_tem_token_recusado(self):
+        token = self._token()
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self._autenticar(token)
+
+    def test_mudanca_de_tipo_revoga_token(self):
+        token = self._token()
+        self._autenticar(token)
+        self.user.tipo = TipoUsuario.PROFISSIONAL
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self._autenticar(token)
+
+    def test_refresh_usa_claims_atuais(self):
+        refresh = CustomTokenObtainPairSerializer.get_token(self.user)
+        self.user.tipo = TipoUsuario.PROFISSIONAL
+        self.user.save()
+
+        client = APIClient()
+        client.cookies["refresh_token"] = str(refresh)
+        response = client.post(reverse("token_refresh"), {}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(AccessToken(response.data["access"])["tipo"], TipoUsuario.PROFISSIONAL)
+        user, _ = self._autenticar(response.data["access"])
+        self.assertEqual(user.tipo, TipoUsuario.PROFISSIONAL)
+
+    def test_refresh_de_usuario_inativo_falha(self):
+        refresh = RefreshToken.for_user(self.user)
+        self.user.is_active = False
+        self.user.save()
+
+        client = APIClient()
+        client.cookies["refresh_token"] = str(refresh)
+        response = client.post(reverse("token_refresh"), {}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_me_com_cookie(self):
+        client = APIClient()
+        client.cookies["access_token"] = self._token()
+        response = client.get(reverse("me"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["email"], "user@test.com")
+        self.assertEqual(response.data["tipo"], TipoUsuario.CLIENTE)
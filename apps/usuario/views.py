@@ -1,6 +1,11 @@
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from .busca import TAMANHO_MINIMO, termos_busca
 from .models import Usuario
-from .serializers import UsuarioSerializer, UsuarioCreateSerializer
+from .paginacao import BuscaUsuarioPagination
+from .serializers import UsuarioSerializer, UsuarioCreateSerializer, UsuarioBuscaSerializer
 
 
 class UsuarioViewSet(viewsets.ModelViewSet):
@@ -8,6 +13,7 @@ class UsuarioViewSet(viewsets.ModelViewSet):
     API para gerenciar usuários:
     - Listar, criar, editar e deletar usuários.
     - Filtrar usuários por tipo (?tipo=CLIENTE, PROFISSIONAL, ADMIN).
+    - Buscar por nome, e-mail, telefone ou CPF (/api/usuarios/buscar/?q=).
     """
     queryset = Usuario.objects.all()
 
@@ -16,10 +22,12 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         Permite filtrar usuários por tipo usando o parâmetro ?tipo=
         Exemplo: /api/usuarios/?tipo=CLIENTE
         """
+        # super() devolve uma cópia: o queryset da classe guardaria o resultado entre requisições
+        queryset = super().get_queryset()
         tipo = self.request.query_params.get('tipo')
         if tipo:
-            return self.queryset.filter(tipo=tipo)
-        return self.queryset
+            return queryset.filter(tipo=tipo)
+        return queryset
 
     def get_serializer_class(self):
         """
@@ -27,8 +35,36 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         """
         if self.action == 'create':
             return UsuarioCreateSerializer
+        if self.action == 'buscar':
+            return UsuarioBuscaSerializer
         return UsuarioSerializer
 
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def buscar(self, request):
+        """
+        Busca usuários por nome, e-mail, telefone ou CPF, sem diferenciar
+        maiúsculas nem acentos: cada termo de ?q= precisa aparecer em algum
+        desses campos, no início ou no meio, e ter ao menos TAMANHO_MINIMO
+        caracteres. Aceita também ?tipo= e ?limite=,
+        e é paginada por cursor.
+        Exemplo: /api/usuarios/buscar/?q=jose silva&tipo=CLIENTE
+        """
+        termos = termos_busca(request.query_params.get('q', ''))
+        if not termos or any(len(termo) < TAMANHO_MINIMO for termo in termos):
+            return Response(
+                {"erro": f"Informe no parâmetro 'q' termos com ao menos {TAMANHO_MINIMO} caracteres."},
+                status=400
+            )
+
+        serializer_class = self.get_serializer_class()
+        queryset = self.get_queryset().only(*serializer_class.Meta.fields)
+        for termo in termos:
+            queryset = queryset.filter(busca__contains=termo)
+
+        paginador = BuscaUsuarioPagination()
+        pagina = paginador.paginate_queryset(queryset, request, view=self)
+        return paginador.get_paginated_response(serializer_class(pagina, many=True).data)
+
     def perform_create(self, serializer):
         """
         Salva um novo usuário.
@@ -3,6 +3,25 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Use o ASGI para servir as views assíncronas (``/api/agenda/async/...`` e
+``/api/servicos/async/``), que esperam o banco e o cache sem ocupar uma
+thread. Para rodar com o uvicorn, informe o número de processos em
+WEB_CONCURRENCY (o uvicorn usa como padrão de ``--workers`` e o settings
+como PROCESSOS_WEB):
+
+    WEB_CONCURRENCY=4 uvicorn config.asgi:application --host 0.0.0.0 --port 8080
+
+Com mais de um processo defina REDIS_URL: o cache LocMem é de cada processo,
+e sem ele a agenda deixa de usar o cache e os ETags (ver
+``apps.agenda.cache.versoes_compartilhadas``). Ou com o gunicorn gerenciando
+os workers (pacote uvicorn-worker), que já exporta WEB_CONCURRENCY:
+
+    gunicorn -c config/gunicorn.py -k uvicorn_worker.UvicornWorker config.asgi:application
+
+Os endpoints síncronos continuam funcionando sob ASGI (o Django os roda numa
+thread) e sob o WSGI de ``config.wsgi``. As rotas assíncronas têm URLs
+próprias, então os ETags delas não valem para as síncronas e vice-versa.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
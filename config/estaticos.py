@@ -0,0 +1,35 @@
+"""
+WhiteNoise para as duas pilhas, WSGI e ASGI.
+
+O WhiteNoiseMiddleware só é síncrono; sob ASGI, um único middleware síncrono
+faz o Django rodar cada requisição numa thread, e as views assíncronas perdem
+o sentido. Esta subclasse decide em memória se o caminho é um arquivo
+estático e, se não for, segue direto para o próximo middleware, sem trocar de
+modo.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class WhiteNoiseAssincrono(WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
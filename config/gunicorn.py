@@ -0,0 +1,85 @@
+"""
+Configuração do Gunicorn para produção.
+
+    gunicorn -c config/gunicorn.py config.wsgi:application
+
+- Workers e threads dimensionados pelas CPUs disponíveis (respeitando a cota
+  do cgroup em containers); GUNICORN_WORKERS e GUNICORN_THREADS sobrescrevem.
+  Sem REDIS_URL o cache é local a cada processo, então o padrão é um worker
+  só (com as threads); com mais workers a agenda deixa de usar o cache.
+- ``preload_app``: o Django é carregado uma vez no master. Em ``when_ready``,
+  ainda antes do primeiro fork, o master aquece rotas, serializers e caches
+  locais (``apps.agenda.aquecimento.aquecer_processo``), fecha as conexões e
+  congela o heap com ``gc.freeze()``: os workers compartilham essas páginas
+  de memória (copy-on-write) e nenhum paga a primeira requisição lenta.
+- ``max_requests`` com jitter recicla os workers aos poucos, sem reiniciar
+  todos ao mesmo tempo.
+"""
+import gc
+import math
+import os
+
+
+def _cpus():
+    """CPUs disponíveis para o processo, limitadas pela cota do cgroup v2 quando houver."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as arquivo:
+            cota, periodo = arquivo.read().split()
+        if cota != 'max':
+            cpus = min(cpus, max(1, math.ceil(int(cota) / int(periodo))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8080')}")
+
+# As requisições passam a maior parte do tempo esperando o banco: poucos
+# processos, cada um com algumas threads
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+if os.getenv('REDIS_URL'):
+    workers = int(os.getenv('GUNICORN_WORKERS', _cpus() + 1 if threads > 1 else _cpus() * 2 + 1))
+else:
+    workers = int(os.getenv('GUNICORN_WORKERS', 1))
+worker_class = 'gthread' if threads > 1 else 'sync'
+# Lido pelo settings (PROCESSOS_WEB), carregado depois deste arquivo pelo preload
+os.environ['WEB_CONCURRENCY'] = str(workers)
+
+preload_app = True
+
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = timeout
+keepalive = 5
+
+# Heartbeat dos workers em memória, e não no disco do container
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+
+def when_ready(server):
+    """Roda no master depois do preload e antes de criar os workers."""
+    from django.core.cache import caches
+    from django.db import connections
+
+    from apps.agenda.aquecimento import aquecer_processo
+
+    resumo = aquecer_processo()
+    server.log.info("Aquecido: %(rotas)s rotas, %(serializers)s serializers", resumo)
+
+    # Conexões abertas no master não podem ser herdadas pelos workers; o pool
+    # (e as threads dele) é recriado em cada worker na primeira query
+    connections.close_all()
+    for conexao in connections.all():
+        if hasattr(conexao, 'close_pool'):
+            conexao.close_pool()
+    caches.close_all()
+
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,106 @@
+"""
+Logging sem bloquear a requisição.
+
+``FilaHandler`` só enfileira o registro; uma thread (QueueListener) formata
+e escreve no stream. A mensagem é montada com os args no formato '%' apenas
+nessa thread, e só se o registro passou pelo nível e pelos filtros.
+
+Filtros do handler, na ordem em que rodam:
+
+- ``ContadorLogs`` conta os registros por logger e nível (exportados em /metrics);
+- ``FiltroAmostragem`` deixa passar no máximo ``limite`` registros iguais
+  (mesmo logger e mesma mensagem sem args) por ``janela`` segundos. O
+  primeiro registro da janela seguinte informa quantos foram suprimidos.
+  Erros nunca são suprimidos.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from logging.handlers import QueueHandler, QueueListener
+
+
+class FilaHandler(QueueHandler):
+    def __init__(self, stream=None):
+        super().__init__(queue.SimpleQueue())
+        self.destino = logging.StreamHandler(stream)
+        self.listener = QueueListener(self.queue, self.destino)
+        self.listener.start()
+        atexit.register(self.parar)
+        # Threads não sobrevivem ao fork (ex.: gunicorn com preload_app): cada worker inicia a sua
+        os.register_at_fork(after_in_child=self._reiniciar)
+
+    def parar(self):
+        """Escreve o que ainda está na fila e encerra a thread."""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def _reiniciar(self):
+        self.queue = self.listener.queue = queue.SimpleQueue()
+        self.listener._thread = None
+        self.listener.start()
+
+    def setFormatter(self, fmt):
+        # Quem formata é o handler de destino, na thread do listener
+        self.destino.setFormatter(fmt)
+
+    def prepare(self, record):
+        # A fila é do próprio processo: o registro vai inteiro, sem formatar aqui
+        return record
+
+
+_contadores = defaultdict(int)  # (logger, nível) -> total
+_suprimidos = defaultdict(int)  # logger -> total
+_lock = threading.Lock()
+
+
+class ContadorLogs(logging.Filter):
+    def filter(self, record):
+        with _lock:
+            _contadores[record.name, record.levelname] += 1
+        return True
+
+
+class FiltroAmostragem(logging.Filter):
+    MAX_CHAVES = 1000
+
+    def __init__(self, limite=10, janela=60):
+        super().__init__()
+        self.limite = limite
+        self.janela = janela
+        self._janelas = {}  # (logger, msg) -> [início, emitidos, suprimidos]
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True
+
+        chave = (record.name, str(record.msg))
+        agora = time.monotonic()
+        with _lock:
+            if len(self._janelas) > self.MAX_CHAVES:
+                # Mensagens montadas com f-string geram uma chave por registro
+                self._janelas.clear()
+            estado = self._janelas.get(chave)
+            if estado is None or agora - estado[0] >= self.janela:
+                suprimidos = estado[2] if estado else 0
+                self._janelas[chave] = [agora, 1, 0]
+            elif estado[1] < self.limite:
+                estado[1] += 1
+                suprimidos = 0
+            else:
+                estado[2] += 1
+                _suprimidos[record.name] += 1
+                return False
+
+        if suprimidos:
+            record.msg = f'{record.msg} [+{suprimidos} iguais suprimidas]'
+        return True
+
+
+def estatisticas():
+    """Registros por (logger, nível) e suprimidos por logger neste processo."""
+    with _lock:
+        return dict(_contadores), dict(_suprimidos)
@@ -0,0 +1,299 @@
+"""
+Métricas por rota no formato texto do Prometheus.
+
+O middleware registra, para cada URL resolvida (ex.: 'agendamentos-agenda'),
+a quantidade de requisições por método e status, um histograma de latência e
+o número e o tempo das queries SQL. As queries são contadas por um wrapper
+instalado uma vez em cada conexão (``execute_wrappers``), que soma no contador
+da requisição atual guardado numa ContextVar; assim a contagem vale também
+para views assíncronas, cujas queries rodam em outra thread.
+
+Também são exportadas as estatísticas do pool de conexões do PostgreSQL,
+quando configurado (ver DB_POOL nas settings).
+
+Cada thread acumula num objeto próprio, então o caminho da requisição não usa
+locks; os acumuladores só são somados quando /metrics é lido. Os números são
+por processo: com vários workers do gunicorn, cada um expõe os seus, marcados
+com o label 'pid'.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROTA_NAO_RESOLVIDA = 'nao_resolvida'
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Acumulador:
+    __slots__ = ('requisicoes', 'rotas')
+
+    def __init__(self):
+        self.requisicoes = defaultdict(int)  # (rota, método, status) -> total
+        self.rotas = {}  # rota -> [buckets..., soma, total, queries, tempo_sql]
+
+
+_local = threading.local()
+_acumuladores = []
+_registro = threading.Lock()
+
+
+def _acumulador():
+    acumulador = getattr(_local, 'acumulador', None)
+    if acumulador is None:
+        acumulador = _local.acumulador = _Acumulador()
+        with _registro:  # só na primeira requisição de cada thread
+            _acumuladores.append(acumulador)
+    return acumulador
+
+
+def registrar(rota, metodo, status, duracao, consultas, tempo_sql):
+    acumulador = _acumulador()
+    acumulador.requisicoes[rota, metodo, status] += 1
+
+    valores = acumulador.rotas.get(rota)
+    if valores is None:
+        valores = acumulador.rotas[rota] = [0] * (len(BUCKETS) + 4)
+    for i, limite in enumerate(BUCKETS):
+        if duracao <= limite:
+            valores[i] += 1
+            break
+    n = len(BUCKETS)
+    valores[n] += duracao
+    valores[n + 1] += 1
+    valores[n + 2] += consultas
+    valores[n + 3] += tempo_sql
+
+
+def reiniciar():
+    """Zera as métricas deste processo (usado nos testes)."""
+    with _registro:
+        for acumulador in _acumuladores:
+            acumulador.requisicoes.clear()
+            acumulador.rotas.clear()
+
+
+def _somar():
+    requisicoes = defaultdict(int)
+    rotas = {}
+    for acumulador in list(_acumuladores):
+        for chave, total in list(acumulador.requisicoes.items()):
+            requisicoes[chave] += total
+        for rota, valores in list(acumulador.rotas.items()):
+            soma = rotas.setdefault(rota, [0] * len(valores))
+            for i, valor in enumerate(valores):
+                soma[i] += valor
+    return requisicoes, rotas
+
+
+class _ContadorSQL:
+    __slots__ = ('consultas', 'tempo')
+
+    def __init__(self):
+        self.consultas = 0
+        self.tempo = 0.0
+
+
+_contador_atual = ContextVar('contador_sql', default=None)
+
+
+def _contar_sql(execute, sql, params, many, context):
+    contador = _contador_atual.get()
+    if contador is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        contador.consultas += 1
+        contador.tempo += time.perf_counter() - inicio
+
+
+def _instalar_contador(sender=None, connection=None, **kwargs):
+    if _contar_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_contar_sql)
+
+
+connection_created.connect(_instalar_contador, dispatch_uid='metricas_contador_sql')
+# Conexões já abertas nesta thread antes do import (ex.: testes, shell)
+for _conexao in connections.all(initialized_only=True):
+    _instalar_contador(connection=_conexao)
+
+
+class MetricasMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        contador = _ContadorSQL()
+        token = _contador_atual.set(contador)
+        inicio = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _contador_atual.reset(token)
+        self._registrar(request, response, time.perf_counter() - inicio, contador)
+        return response
+
+    async def __acall__(self, request):
+        contador = _ContadorSQL()
+        token = _contador_atual.set(contador)
+        inicio = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _contador_atual.reset(token)
+        self._registrar(request, response, time.perf_counter() - inicio, contador)
+        return response
+
+    @staticmethod
+    def _registrar(request, response, duracao, contador):
+        resolver_match = getattr(request, 'resolver_match', None)
+        rota = (resolver_match.view_name if resolver_match else None) or ROTA_NAO_RESOLVIDA
+        registrar(rota, request.method, response.status_code, duracao, contador.consultas, contador.tempo)
+
+
+# Estatísticas do psycopg_pool que são valores instantâneos; as demais só crescem
+_MEDIDAS_POOL = {'pool_min', 'pool_max', 'pool_size', 'pool_available', 'requests_waiting'}
+
+
+def _estatisticas_pools():
+    """{alias: estatísticas} dos bancos configurados com pool (PostgreSQL + psycopg 3)."""
+    return {
+        alias: connections[alias].pool.get_stats()
+        for alias in connections
+        if connections[alias].settings_dict.get('OPTIONS', {}).get('pool')
+    }
+
+
+def _rotulos(**labels):
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels.items()) + '}'
+
+
+def _formatar(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+def texto_prometheus():
+    requisicoes, rotas = _somar()
+    pid = os.getpid()
+    n = len(BUCKETS)
+    linhas = [
+        '# HELP http_requisicoes_total Requisições atendidas por rota, método e status.',
+        '# TYPE http_requisicoes_total counter',
+    ]
+    for (rota, metodo, status), total in sorted(requisicoes.items()):
+        linhas.append(f'http_requisicoes_total{_rotulos(pid=pid, rota=rota, metodo=metodo, status=status)} {total}')
+
+    linhas += [
+        '# HELP http_requisicao_duracao_segundos Latência das requisições por rota.',
+        '# TYPE http_requisicao_duracao_segundos histogram',
+    ]
+    for rota, valores in sorted(rotas.items()):
+        acumulado = 0
+        for limite, quantidade in zip(BUCKETS, valores):
+            acumulado += quantidade
+            linhas.append(f'http_requisicao_duracao_segundos_bucket{_rotulos(pid=pid, rota=rota, le=limite)} {acumulado}')
+        linhas.append(f'http_requisicao_duracao_segundos_bucket{_rotulos(pid=pid, rota=rota, le="+Inf")} {valores[n + 1]}')
+        linhas.append(f'http_requisicao_duracao_segundos_sum{_rotulos(pid=pid, rota=rota)} {_formatar(valores[n])}')
+        linhas.append(f'http_requisicao_duracao_segundos_count{_rotulos(pid=pid, rota=rota)} {valores[n + 1]}')
+
+    linhas += [
+        '# HELP http_requisicao_sql_consultas_total Queries SQL executadas por rota.',
+        '# TYPE http_requisicao_sql_consultas_total counter',
+    ]
+    linhas += [
+        f'http_requisicao_sql_consultas_total{_rotulos(pid=pid, rota=rota)} {valores[n + 2]}'
+        for rota, valores in sorted(rotas.items())
+    ]
+    linhas += [
+        '# HELP http_requisicao_sql_duracao_segundos_total Tempo gasto em queries SQL por rota.',
+        '# TYPE http_requisicao_sql_duracao_segundos_total counter',
+    ]
+    linhas += [
+        f'http_requisicao_sql_duracao_segundos_total{_rotulos(pid=pid, rota=rota)} {_formatar(valores[n + 3])}'
+        for rota, valores in sorted(rotas.items())
+    ]
+
+    from apps.agenda import cache as agenda_cache
+
+    estatisticas = agenda_cache.estatisticas()
+    linhas += [
+        '# HELP agenda_cache_acertos_total Grades de agenda servidas do cache.',
+        '# TYPE agenda_cache_acertos_total counter',
+        f'agenda_cache_acertos_total{_rotulos(pid=pid)} {estatisticas["hits"]}',
+        '# HELP agenda_cache_faltas_total Grades de agenda montadas no banco.',
+        '# TYPE agenda_cache_faltas_total counter',
+        f'agenda_cache_faltas_total{_rotulos(pid=pid)} {estatisticas["misses"]}',
+    ]
+
+    from apps.usuario.auth.cache_tokens import tokens_validados
+
+    estatisticas = tokens_validados.estatisticas()
+    linhas += [
+        '# HELP jwt_cache_acertos_total Access tokens reaproveitados sem verificar a assinatura.',
+        '# TYPE jwt_cache_acertos_total counter',
+        f'jwt_cache_acertos_total{_rotulos(pid=pid)} {estatisticas["hits"]}',
+        '# HELP jwt_cache_faltas_total Access tokens decodificados e verificados.',
+        '# TYPE jwt_cache_faltas_total counter',
+        f'jwt_cache_faltas_total{_rotulos(pid=pid)} {estatisticas["misses"]}',
+        '# HELP jwt_cache_despejos_total Tokens removidos do cache por falta de espaço.',
+        '# TYPE jwt_cache_despejos_total counter',
+        f'jwt_cache_despejos_total{_rotulos(pid=pid)} {estatisticas["despejos"]}',
+        '# HELP jwt_cache_tokens Tokens guardados no cache.',
+        '# TYPE jwt_cache_tokens gauge',
+        f'jwt_cache_tokens{_rotulos(pid=pid)} {estatisticas["tamanho"]}',
+    ]
+
+    pools = _estatisticas_pools()
+    for nome in sorted({nome for estatisticas in pools.values() for nome in estatisticas}):
+        medida = nome in _MEDIDAS_POOL
+        metrica = f'db_pool_{nome}' if medida else f'db_pool_{nome}_total'
+        linhas += [
+            f"# HELP {metrica} Estatística '{nome}' do pool de conexões (psycopg_pool).",
+            f"# TYPE {metrica} {'gauge' if medida else 'counter'}",
+        ]
+        for alias, estatisticas in sorted(pools.items()):
+            if nome in estatisticas:
+                linhas.append(f'{metrica}{_rotulos(pid=pid, banco=alias)} {estatisticas[nome]}')
+
+    from config import logs
+
+    registros, suprimidos = logs.estatisticas()
+    linhas += [
+        '# HELP logs_registros_total Registros de log recebidos por logger e nível.',
+        '# TYPE logs_registros_total counter',
+    ]
+    for (logger, nivel), total in sorted(registros.items()):
+        linhas.append(f'logs_registros_total{_rotulos(pid=pid, logger=logger, nivel=nivel)} {total}')
+    linhas += [
+        '# HELP logs_suprimidos_total Registros descartados pela amostragem, por logger.',
+        '# TYPE logs_suprimidos_total counter',
+    ]
+    for logger, total in sorted(suprimidos.items()):
+        linhas.append(f'logs_suprimidos_total{_rotulos(pid=pid, logger=logger)} {total}')
+    return '\n'.join(linhas) + '\n'
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metricas(request):
+    """Métricas deste processo no formato texto do Prometheus (apenas admins)."""
+    return HttpResponse(texto_prometheus(), content_type=CONTENT_TYPE)
@@ -0,0 +1,107 @@
+"""
+Leituras na réplica do banco.
+
+Com REPLICA_DATABASE_URL configurada existe o alias 'replica', e o
+``RoteadorReplica`` manda para ele as leituras das requisições seguras
+(GET, HEAD, OPTIONS). Todo o resto fica no primário:
+
+- escritas, e as leituras de requisições que escrevem (POST, PUT, ...), como
+  a validação de um agendamento;
+- as leituras do mesmo cliente logo depois de uma escrita: a resposta de uma
+  requisição que escreve leva o cookie COOKIE_PRIMARIO, que vale
+  REPLICA_FIXAR_SEGUNDOS, para que ele leia o que acabou de gravar;
+- o que roda dentro de ``usar_primario()``: ``Agendamento.clean`` e o
+  preenchimento dos caches versionados (grades da agenda, grade de horários,
+  catálogo, situação do usuário), que guardariam por muito tempo um dado
+  atrasado da réplica sob a versão nova.
+
+Sem réplica configurada, o roteador devolve sempre o primário.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica'
+COOKIE_PRIMARIO = 'usar_primario'
+METODOS_SEGUROS = ('GET', 'HEAD', 'OPTIONS')
+
+_ler_da_replica = ContextVar('ler_da_replica', default=False)
+
+
+def replica_configurada():
+    return REPLICA in connections.settings
+
+
+@contextmanager
+def ler_da_replica(ativo=True):
+    """Dentro do bloco, as leituras vão para a réplica (se ``ativo`` e ela existir)."""
+    token = _ler_da_replica.set(ativo)
+    try:
+        yield
+    finally:
+        _ler_da_replica.reset(token)
+
+
+def usar_primario():
+    """Context manager (ou decorator) que mantém as leituras no primário."""
+    return ler_da_replica(False)
+
+
+class RoteadorReplica:
+    def db_for_read(self, model, **hints):
+        if _ler_da_replica.get() and replica_configurada():
+            return REPLICA
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica e primário têm os mesmos dados
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # A réplica recebe o schema pela replicação
+        return db != REPLICA
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _usa_replica(request):
+        return request.method in METODOS_SEGUROS and COOKIE_PRIMARIO not in request.COOKIES
+
+    @staticmethod
+    def _fixar_no_primario(request, response):
+        if request.method not in METODOS_SEGUROS and replica_configurada():
+            response.set_cookie(
+                COOKIE_PRIMARIO,
+                '1',
+                max_age=settings.REPLICA_FIXAR_SEGUNDOS,
+                httponly=True,
+                secure=True,
+                samesite="None",
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with ler_da_replica(self._usa_replica(request)):
+            response = self.get_response(request)
+        return self._fixar_no_primario(request, response)
+
+    async def __acall__(self, request):
+        with ler_da_replica(self._usa_replica(request)):
+            response = await self.get_response(request)
+        return self._fixar_no_primario(request, response)
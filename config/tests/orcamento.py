@@ -0,0 +1,128 @@
+"""
+Orçamento de queries por endpoint.
+
+Cada teste monta o mesmo cenário com dois volumes (n e 2n linhas) dentro de
+um savepoint desfeito ao final, executa a requisição e compara as queries.
+Falha, mostrando o SQL, quando a contagem cresce com o volume (N+1) ou passa
+do orçamento declarado para a rota.
+
+Uso::
+
+    class MeusOrcamentos(OrcamentoQueriesMixin, TestCase):
+        ORCAMENTOS = {('servico-list', 'get'): 2}
+
+        def test_listar(self):
+            def montar(tamanho):
+                ServicoFactory.create_batch(tamanho)
+                return reverse('servico-list'), None
+            self.assertOrcamentoQueries('servico-list', 'get', montar)
+"""
+import importlib
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.agenda import catalogo as catalogo_servicos
+from apps.agenda.horarios import grade_horarios
+
+
+def rotas_dos_routers():
+    """
+    Pares (nome da rota, método HTTP) de todos os viewsets registrados nos
+    routers de ``apps/*/urls.py``, incluindo as actions customizadas.
+    """
+    rotas = set()
+    for config in apps.get_app_configs():
+        if not config.name.startswith('apps.'):
+            continue
+        try:
+            modulo = importlib.import_module(f'{config.name}.urls')
+        except ModuleNotFoundError:
+            continue
+        router = getattr(modulo, 'router', None)
+        if router is None:
+            continue
+        for padrao in router.urls:
+            acoes = getattr(padrao.callback, 'actions', None)
+            if acoes:
+                # HEAD é mapeado pelo DRF para a mesma action do GET
+                rotas.update((padrao.name, metodo) for metodo in acoes if metodo != 'head')
+    return rotas
+
+
+def _formatar_sql(queries):
+    return '\n'.join(f'{i}. {query["sql"]}' for i, query in enumerate(queries, start=1))
+
+
+class OrcamentoQueriesMixin:
+    """
+    Mixin para TestCase com ``self.client`` (APIClient).
+    ORCAMENTOS mapeia (rota, método) para o máximo de queries aceito em
+    qualquer volume.
+    """
+    ORCAMENTOS = {}
+    VOLUME = 3
+
+    def aquecer(self):
+        """Carrega os caches locais do processo, que não contam como custo da requisição."""
+        grade_horarios()
+        catalogo_servicos.catalogo()
+
+    def _requisitar(self, metodo, url, dados):
+        if metodo == 'get':
+            response = self.client.get(url, dados)
+        else:
+            response = getattr(self.client, metodo)(url, dados, format='json')
+        if response.streaming:
+            # O corpo só é gerado (e consultado) ao ser consumido
+            response.conteudo = b''.join(response.streaming_content)
+        return response
+
+    def _limpar_caches(self):
+        cache.clear()
+        # A versão do catálogo é lida uma vez por requisição: a limpeza do cache não chega a ele
+        catalogo_servicos.descartar()
+
+    def _medir(self, metodo, montar, tamanho, status):
+        self._limpar_caches()
+        try:
+            with transaction.atomic():
+                url, dados = montar(tamanho)
+                self.aquecer()
+                with CaptureQueriesContext(connection) as contexto:
+                    response = self._requisitar(metodo, url, dados)
+                transaction.set_rollback(True)
+        finally:
+            # Os caches locais podem ter visto linhas que foram desfeitas
+            self._limpar_caches()
+
+        if status is not None:
+            self.assertEqual(
+                response.status_code, status,
+                f'{metodo.upper()} {url} com {tamanho} linhas: {getattr(response, "data", response.status_code)}'
+            )
+        return contexto.captured_queries
+
+    def assertOrcamentoQueries(self, rota, metodo, montar, status=200):
+        """
+        ``montar(tamanho)`` cria os dados do cenário e retorna ``(url, dados)``.
+        Mede a requisição com VOLUME e 2 * VOLUME linhas.
+        """
+        maximo = self.ORCAMENTOS[(rota, metodo)]
+        n = self.VOLUME
+        pequeno = self._medir(metodo, montar, n, status)
+        grande = self._medir(metodo, montar, 2 * n, status)
+
+        if len(grande) > len(pequeno):
+            self.fail(
+                f'{metodo.upper()} {rota}: as queries crescem com o volume '
+                f'({len(pequeno)} com {n} linhas, {len(grande)} com {2 * n}).\n'
+                f'Queries com {2 * n} linhas:\n{_formatar_sql(grande)}'
+            )
+        if len(grande) > maximo:
+            self.fail(
+                f'{metodo.upper()} {rota}: {len(grande)} queries, orçamento de {maximo}.\n'
+                f'{_formatar_sql(grande)}'
+            )
@@ -0,0 +1,68 @@
+import importlib
+import os
+from unittest import mock
+
+from django.db import connections
+from django.test import TestCase
+
+from apps.agenda import horarios
+from apps.agenda.aquecimento import aquecer_processo
+from config import gunicorn as configuracao
+
+
+class GunicornTests(TestCase):
+    def test_cpus_respeita_cota_do_cgroup(self):
+        with mock.patch('os.sched_getaffinity', return_value=set(range(16))), \
+                mock.patch('builtins.open', mock.mock_open(read_data='200000 100000\n')):
+            self.assertEqual(configuracao._cpus(), 2)
+        with mock.patch('os.sched_getaffinity', return_value=set(range(4))), \
+                mock.patch('builtins.open', mock.mock_open(read_data='max 100000\n')):
+            self.assertEqual(configuracao._cpus(), 4)
+        with mock.patch('os.sched_getaffinity', return_value=set(range(3))), \
+                mock.patch('builtins.open', side_effect=FileNotFoundError):
+            self.assertEqual(configuracao._cpus(), 3)
+
+    def _carregar(self, **env):
+        """Relê a configuração com o ambiente dado, restaurando o original no fim do teste."""
+        self.addCleanup(importlib.reload, configuracao)
+        with mock.patch.dict(os.environ, env):
+            for nome in {'REDIS_URL', 'GUNICORN_WORKERS', 'GUNICORN_THREADS'} - set(env):
+                os.environ.pop(nome, None)
+            importlib.reload(configuracao)
+            return configuracao, os.environ['WEB_CONCURRENCY']
+
+    def test_perfil_de_producao(self):
+        config, _ = self._carregar(REDIS_URL='redis://localhost:6379/0')
+        self.assertTrue(config.preload_app)
+        self.assertGreater(config.max_requests_jitter, 0)
+
+    def test_workers_com_e_sem_redis(self):
+        with mock.patch('os.sched_getaffinity', return_value=set(range(4))), \
+                mock.patch('builtins.open', side_effect=FileNotFoundError):
+            config, processos = self._carregar(REDIS_URL='redis://localhost:6379/0')
+            self.assertEqual((config.workers, config.threads), (5, 4))
+            self.assertEqual(processos, '5')
+
+            # Sem Redis cada worker teria o próprio cache: um processo, com as threads
+            config, processos = self._carregar()
+            self.assertEqual((config.workers, config.threads), (1, 4))
+            self.assertEqual(processos, '1')
+
+            config, _ = self._carregar(GUNICORN_WORKERS='3')
+            self.assertEqual(config.workers, 3)
+
+    def test_aquecer_processo(self):
+        horarios._grade = None
+        resumo = aquecer_processo()
+        self.assertGreater(resumo['rotas'], 40)
+        self.assertGreaterEqual(resumo['serializers'], 5)
+        self.assertIsNotNone(horarios._grade)
+
+    def test_when_ready_aquece_fecha_conexoes_e_congela_o_heap(self):
+        server = mock.Mock()
+        with mock.patch.object(connections, 'close_all') as fechar, \
+                mock.patch('gc.freeze') as congelar:
+            configuracao.when_ready(server)
+        fechar.assert_called_once()
+        congelar.assert_called_once()
+        server.log.info.assert_called_once()
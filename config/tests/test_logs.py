@@ -0,0 +1,72 @@
+import io
+import logging
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from config import logs
+
+
+def _registro(msg='Slots %s já ocupados', args=('09:00',), nivel=logging.WARNING, nome='apps.agenda.grade'):
+    return logging.LogRecord(nome, nivel, __file__, 1, msg, args, None)
+
+
+class FiltroAmostragemTests(SimpleTestCase):
+    def test_limita_registros_iguais_por_janela(self):
+        filtro = logs.FiltroAmostragem(limite=2, janela=60)
+        with mock.patch('config.logs.time.monotonic', return_value=100):
+            aceitos = [filtro.filter(_registro(args=(i,))) for i in range(5)]
+        self.assertEqual(aceitos, [True, True, False, False, False])
+
+        with mock.patch('config.logs.time.monotonic', return_value=161):
+            registro = _registro()
+            self.assertTrue(filtro.filter(registro))
+        self.assertEqual(registro.getMessage(), 'Slots 09:00 já ocupados [+3 iguais suprimidas]')
+
+    def test_mensagens_diferentes_tem_janelas_proprias(self):
+        filtro = logs.FiltroAmostragem(limite=1, janela=60)
+        self.assertTrue(filtro.filter(_registro()))
+        self.assertTrue(filtro.filter(_registro(msg='Outra mensagem')))
+        self.assertTrue(filtro.filter(_registro(nome='outro.logger')))
+        self.assertFalse(filtro.filter(_registro()))
+
+    def test_erros_nunca_sao_suprimidos(self):
+        filtro = logs.FiltroAmostragem(limite=1, janela=60)
+        self.assertTrue(all(filtro.filter(_registro(nivel=logging.ERROR)) for _ in range(5)))
+
+    def test_suprimidos_contados_por_logger(self):
+        filtro = logs.FiltroAmostragem(limite=1, janela=60)
+        _, antes = logs.estatisticas()
+        for _ in range(3):
+            filtro.filter(_registro(nome='teste.amostragem'))
+        _, depois = logs.estatisticas()
+        self.assertEqual(depois['teste.amostragem'] - antes.get('teste.amostragem', 0), 2)
+
+
+class FilaHandlerTests(SimpleTestCase):
+    def test_formata_e_escreve_na_thread_do_listener(self):
+        stream = io.StringIO()
+        handler = logs.FilaHandler(stream=stream)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        handler.addFilter(logs.ContadorLogs())
+
+        logger = logging.getLogger('teste.fila')
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            logger.warning('Agendamento ID %s com dados inválidos.', 7)
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+            handler.parar()
+
+        self.assertEqual(stream.getvalue(), 'WARNING Agendamento ID 7 com dados inválidos.\n')
+        registros, _ = logs.estatisticas()
+        self.assertGreaterEqual(registros['teste.fila', 'WARNING'], 1)
+
+    def test_registro_enfileirado_sem_formatar(self):
+        handler = logs.FilaHandler(stream=io.StringIO())
+        handler.parar()
+        registro = _registro()
+        self.assertIs(handler.prepare(registro), registro)
+        self.assertEqual(registro.args, ('09:00',))
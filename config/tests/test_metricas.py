@@ -0,0 +1,75 @@
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import timedelta
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from config import metricas
+
+
+class MetricasTests(TestCase):
+    def setUp(self):
+        metricas.reiniciar()
+        self.client = APIClient()
+        self.admin = Usuario.objects.create_superuser(
+            email="admin@test.com",
+            password="senha123",
+            nome_completo="Admin",
+            tipo=TipoUsuario.ADMIN
+        )
+        Servico.objects.create(nome="Manicure", preco=40, duracao=timedelta(minutes=30))
+
+    def _metricas(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('metricas'))
+        self.client.force_authenticate(None)
+        return response
+
+    def test_registra_requisicoes_latencia_e_sql_por_rota(self):
+        self.client.get(reverse('servico-list'))
+        self.client.get(reverse('servico-list'))
+        self.client.get(reverse('agendamentos-agenda'))
+
+        response = self._metricas()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        texto = response.content.decode()
+
+        self.assertRegex(texto, r'http_requisicoes_total\{pid="\d+",rota="servico-list",metodo="GET",status="200"\} 2')
+        self.assertRegex(texto, r'http_requisicoes_total\{pid="\d+",rota="agendamentos-agenda",metodo="GET",status="400"\} 1')
+        self.assertRegex(texto, r'http_requisicao_duracao_segundos_bucket\{pid="\d+",rota="servico-list",le="\+Inf"\} 2')
+        self.assertRegex(texto, r'http_requisicao_duracao_segundos_count\{pid="\d+",rota="servico-list"\} 2')
+        self.assertRegex(texto, r'http_requisicao_sql_consultas_total\{pid="\d+",rota="servico-list"\} [1-9]')
+        self.assertIn('agenda_cache_acertos_total', texto)
+
+    def test_rotas_desconhecidas_sao_agrupadas(self):
+        self.client.get('/nao-existe/123')
+        self.assertIn('rota="nao_resolvida"', self._metricas().content.decode())
+
+    def test_apenas_admins(self):
+        self.assertIn(self.client.get(reverse('metricas')).status_code, (401, 403))
+
+    def test_estatisticas_do_pool_de_conexoes(self):
+        estatisticas = {'default': {'pool_size': 4, 'pool_available': 3, 'requests_num': 12}}
+        with mock.patch('config.metricas._estatisticas_pools', return_value=estatisticas):
+            texto = metricas.texto_prometheus()
+        self.assertIn('# TYPE db_pool_pool_size gauge', texto)
+        self.assertRegex(texto, r'db_pool_pool_available\{pid="\d+",banco="default"\} 3')
+        self.assertIn('# TYPE db_pool_requests_num_total counter', texto)
+        self.assertRegex(texto, r'db_pool_requests_num_total\{pid="\d+",banco="default"\} 12')
+
+    def test_sem_pool_nao_exporta_estatisticas(self):
+        if connection.settings_dict['OPTIONS'].get('pool'):
+            self.skipTest("banco configurado com pool")
+        self.assertNotIn('db_pool_', metricas.texto_prometheus())
+
+    @skipUnless(connection.vendor == 'postgresql' and connection.settings_dict['OPTIONS'].get('pool'),
+                "requer PostgreSQL com DB_POOL (ver settings)")
+    def test_pool_real_do_postgres(self):
+        self.client.get(reverse('servico-list'))
+        texto = self._metricas().content.decode()
+        self.assertRegex(texto, r'db_pool_pool_max\{pid="\d+",banco="default"\} [1-9]')
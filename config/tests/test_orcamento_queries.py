@@ -0,0 +1,527 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+from uuid import uuid4
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.agenda.models import SerieRecorrente
+from apps.servicos.models import Servico
+from apps.servicos.views import ServicoViewSet
+from apps.agenda.factories import (
+    ClienteFactory, ProfissionalFactory, ServicoFactory, HorarioFactory,
+    HorarioExpedienteFactory, AgendamentoFactory,
+)
+from config.tests.orcamento import OrcamentoQueriesMixin, rotas_dos_routers
+
+
+class OrcamentoQueriesTests(OrcamentoQueriesMixin, TestCase):
+    """
+    Orçamento de queries de cada rota dos routers; o volume dobra entre as duas
+    medições. A autenticação é forçada, então a busca do usuário do token não entra na conta.
+    """
+
+    ORCAMENTOS = {
+        ('servico-list', 'get'): 2,
+        ('servico-list', 'post'): 6,
+        ('servico-detail', 'get'): 2,
+        ('servico-detail', 'put'): 10,
+        ('servico-detail', 'patch'): 5,
+        ('servico-detail', 'delete'): 6,
+
+        ('usuario-list', 'get'): 1,
+        ('usuario-list', 'post'): 2,
+        ('usuario-detail', 'get'): 1,
+        ('usuario-detail', 'put'): 3,
+        ('usuario-detail', 'patch'): 2,
+        ('usuario-detail', 'delete'): 14,
+        ('usuario-buscar', 'get'): 1,
+
+        ('expediente-list', 'get'): 2,
+        ('expediente-list', 'post'): 7,
+        ('expediente-detail', 'get'): 2,
+        ('expediente-detail', 'put'): 9,
+        ('expediente-detail', 'patch'): 5,
+        ('expediente-detail', 'delete'): 3,
+        ('expediente-horarios-disponiveis', 'get'): 6,
+        ('expediente-por-profissional', 'get'): 2,
+        ('expediente-provisionar', 'post'): 8,
+        ('expediente-copiar-semana', 'post'): 10,
+
+        ('agendamentos-list', 'get'): 1,
+        ('agendamentos-list', 'post'): 10,
+        ('agendamentos-detail', 'get'): 1,
+        ('agendamentos-detail', 'put'): 11,
+        ('agendamentos-detail', 'patch'): 3,
+        ('agendamentos-detail', 'delete'): 2,
+        ('agendamentos-agenda', 'get'): 3,
+        ('agendamentos-agenda-equipe', 'get'): 3,
+        ('agendamentos-estatisticas-cache', 'get'): 0,
+        ('agendamentos-exportar', 'get'): 1,
+        ('agendamentos-proximos-horarios', 'get'): 5,
+        ('agendamentos-excluir-recorrencia', 'delete'): 2,
+
+        ('series-list', 'get'): 1,
+        ('series-list', 'post'): 11,
+        ('series-detail', 'get'): 1,
+        ('series-detail', 'put'): 13,
+        ('series-detail', 'patch'): 3,
+        ('series-detail', 'delete'): 4,
+        ('series-ocorrencias', 'get'): 2,
+        ('series-materializar', 'post'): 3,
+        ('series-encerrar', 'post'): 5,
+        ('series-excluir-ocorrencia', 'post'): 10,
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = Usuario.objects.create_superuser(
+            email="admin@test.com",
+            password="senha123",
+            nome_completo="Admin",
+            tipo=TipoUsuario.ADMIN
+        )
+        self.client.force_authenticate(self.admin)
+        self.segunda = date(2025, 6, 2)
+
+        self.profissional = ProfissionalFactory()
+        self.cliente = ClienteFactory()
+        self.servico = ServicoFactory(duracao=timedelta(minutes=30), profissionais=[self.profissional])
+        self.horarios = [HorarioFactory(horario=time(hora, minuto)) for hora in (9, 10, 11, 12) for minuto in (0, 30)]
+        self.expediente = HorarioExpedienteFactory(profissional=self.profissional, dia_semana=0)
+        self.expediente.horarios.add(*self.horarios)
+
+    def _como_cliente(self):
+        # Clientes passam pelas validações de negócio (clean), profissionais e admins não
+        self.client.force_authenticate(self.cliente)
+
+    def _agendamentos(self, tamanho, **campos):
+        campos = {'cliente': self.cliente, 'profissional': self.profissional, 'servico': self.servico, **campos}
+        return [
+            AgendamentoFactory(data=self.segunda + timedelta(weeks=i + 1), **campos)
+            for i in range(tamanho)
+        ]
+
+    def _serie(self, **campos):
+        return SerieRecorrente.objects.create(**{
+            'cliente': self.cliente,
+            'profissional': self.profissional,
+            'servico': self.servico,
+            'hora': time(10, 0),
+            'data_inicio': self.segunda,
+            **campos,
+        })
+
+    def _payload_servico(self, profissionais):
+        return {
+            "nome": "Spa dos pés",
+            "descricao": "",
+            "preco": "80.00",
+            "duracao": "01:00:00",
+            "profissionais": [p.id for p in profissionais],
+        }
+
+    def test_todas_as_rotas_dos_routers_tem_orcamento(self):
+        self.assertEqual(set(self.ORCAMENTOS), rotas_dos_routers())
+
+    def test_detecta_queries_que_crescem_com_o_volume(self):
+        def montar(tamanho):
+            ServicoFactory.create_batch(tamanho, profissionais=[self.profissional])
+            return reverse('servico-list'), None
+        # Sem o prefetch, cada serviço busca os próprios profissionais
+        with mock.patch.object(ServicoViewSet, 'get_queryset', lambda view: Servico.objects.all()):
+            with self.assertRaisesRegex(AssertionError, 'crescem com o volume'):
+                self.assertOrcamentoQueries('servico-list', 'get', montar)
+
+    # --- Serviços ---
+
+    def test_servico_listar(self):
+        def montar(tamanho):
+            ServicoFactory.create_batch(tamanho, profissionais=ProfissionalFactory.create_batch(2))
+            return reverse('servico-list'), None
+        self.assertOrcamentoQueries('servico-list', 'get', montar)
+
+    def test_servico_criar(self):
+        def montar(tamanho):
+            return reverse('servico-list'), self._payload_servico(ProfissionalFactory.create_batch(tamanho))
+        self.assertOrcamentoQueries('servico-list', 'post', montar, status=201)
+
+    def test_servico_detalhar(self):
+        def montar(tamanho):
+            self.servico.profissionais.add(*ProfissionalFactory.create_batch(tamanho))
+            return reverse('servico-detail', args=[self.servico.id]), None
+        self.assertOrcamentoQueries('servico-detail', 'get', montar)
+
+    def test_servico_atualizar(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            profissionais = ProfissionalFactory.create_batch(tamanho)
+            return reverse('servico-detail', args=[self.servico.id]), self._payload_servico(profissionais)
+        self.assertOrcamentoQueries('servico-detail', 'put', montar)
+
+    def test_servico_atualizar_parcial(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            return reverse('servico-detail', args=[self.servico.id]), {"duracao": "00:45:00"}
+        self.assertOrcamentoQueries('servico-detail', 'patch', montar)
+
+    def test_servico_excluir(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            return reverse('servico-detail', args=[self.servico.id]), None
+        self.assertOrcamentoQueries('servico-detail', 'delete', montar, status=204)
+
+    # --- Usuários ---
+
+    def test_usuario_listar(self):
+        def montar(tamanho):
+            ClienteFactory.create_batch(tamanho)
+            return reverse('usuario-list'), None
+        self.assertOrcamentoQueries('usuario-list', 'get', montar)
+
+    def test_usuario_criar(self):
+        def montar(tamanho):
+            ClienteFactory.create_batch(tamanho)
+            return reverse('usuario-list'), {
+                "email": "novo@test.com",
+                "nome_completo": "Cliente Novo",
+                "tipo": TipoUsuario.CLIENTE,
+                "password": "senha123",
+            }
+        self.assertOrcamentoQueries('usuario-list', 'post', montar, status=201)
+
+    def test_usuario_buscar(self):
+        def montar(tamanho):
+            ClienteFactory.create_batch(tamanho, nome_completo="João Silva")
+            return reverse('usuario-buscar'), {"q": "joao", "tipo": TipoUsuario.CLIENTE}
+        self.assertOrcamentoQueries('usuario-buscar', 'get', montar)
+
+    def test_usuario_detalhar(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            return reverse('usuario-detail', args=[self.cliente.id]), None
+        self.assertOrcamentoQueries('usuario-detail', 'get', montar)
+
+    def test_usuario_atualizar(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            return reverse('usuario-detail', args=[self.cliente.id]), {
+                "email": self.cliente.email,
+                "nome_completo": "Cliente Renomeado",
+                "tipo": TipoUsuario.CLIENTE,
+            }
+        self.assertOrcamentoQueries('usuario-detail', 'put', montar)
+
+    def test_usuario_atualizar_parcial(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            return reverse('usuario-detail', args=[self.cliente.id]), {"telefone": "11999990000"}
+        self.assertOrcamentoQueries('usuario-detail', 'patch', montar)
+
+    def test_usuario_excluir(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            for i in range(tamanho):
+                self._serie(hora=time(11, 0), data_inicio=self.segunda + timedelta(days=i))
+            return reverse('usuario-detail', args=[self.cliente.id]), None
+        self.assertOrcamentoQueries('usuario-detail', 'delete', montar, status=204)
+
+    # --- Expedientes ---
+
+    def test_expediente_listar(self):
+        def montar(tamanho):
+            for _ in range(tamanho):
+                HorarioExpedienteFactory().horarios.add(*self.horarios)
+            return reverse('expediente-list'), None
+        self.assertOrcamentoQueries('expediente-list', 'get', montar)
+
+    def test_expediente_criar(self):
+        def montar(tamanho):
+            fim = (datetime.combine(self.segunda, time(9, 0)) + timedelta(minutes=30 * tamanho)).time()
+            return reverse('expediente-list'), {
+                "profissional": self.profissional.id,
+                "dia_semana": 1,
+                "inicio": "09:00",
+                "fim": fim.strftime('%H:%M'),
+            }
+        self.assertOrcamentoQueries('expediente-list', 'post', montar, status=201)
+
+    def test_expediente_detalhar(self):
+        def montar(tamanho):
+            self.expediente.horarios.add(*[HorarioFactory(horario=time(14 + i, 0)) for i in range(tamanho)])
+            return reverse('expediente-detail', args=[self.expediente.id]), None
+        self.assertOrcamentoQueries('expediente-detail', 'get', montar)
+
+    def test_expediente_atualizar(self):
+        def montar(tamanho):
+            fim = (datetime.combine(self.segunda, time(9, 0)) + timedelta(minutes=30 * tamanho)).time()
+            return reverse('expediente-detail', args=[self.expediente.id]), {
+                "profissional": self.profissional.id,
+                "dia_semana": 0,
+                "inicio": "09:00",
+                "fim": fim.strftime('%H:%M'),
+            }
+        self.assertOrcamentoQueries('expediente-detail', 'put', montar)
+
+    def test_expediente_atualizar_parcial(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            return reverse('expediente-detail', args=[self.expediente.id]), {"dia_semana": 1}
+        self.assertOrcamentoQueries('expediente-detail', 'patch', montar)
+
+    def test_expediente_excluir(self):
+        def montar(tamanho):
+            self.expediente.horarios.add(*[HorarioFactory(horario=time(14 + i, 0)) for i in range(tamanho)])
+            return reverse('expediente-detail', args=[self.expediente.id]), None
+        self.assertOrcamentoQueries('expediente-detail', 'delete', montar, status=204)
+
+    def test_expediente_horarios_disponiveis(self):
+        def montar(tamanho):
+            self.expediente.horarios.add(*[HorarioFactory(horario=time(14 + i, 0)) for i in range(tamanho)])
+            for i in range(tamanho):
+                AgendamentoFactory(
+                    cliente=ClienteFactory(), profissional=self.profissional, servico=self.servico,
+                    data=self.segunda, hora=time(14 + i, 0)
+                )
+                self._serie(hora=time(14 + i, 30))
+            url = reverse('expediente-horarios-disponiveis', args=[self.expediente.id])
+            return url, {"data": self.segunda.isoformat()}
+        self.assertOrcamentoQueries('expediente-horarios-disponiveis', 'get', montar)
+
+    def test_expediente_por_profissional(self):
+        def montar(tamanho):
+            for dia in range(1, tamanho + 1):
+                HorarioExpedienteFactory(profissional=self.profissional, dia_semana=dia).horarios.add(*self.horarios)
+            return reverse('expediente-por-profissional'), {"profissional": self.profissional.id}
+        self.assertOrcamentoQueries('expediente-por-profissional', 'get', montar)
+
+    def test_expediente_provisionar(self):
+        def montar(tamanho):
+            return reverse('expediente-provisionar'), {
+                "profissionais": [p.id for p in ProfissionalFactory.create_batch(tamanho)],
+                "semana": [{"dia_semana": dia, "inicio": "09:00", "fim": "12:00"} for dia in range(5)],
+            }
+        self.assertOrcamentoQueries('expediente-provisionar', 'post', montar)
+
+    def test_expediente_copiar_semana(self):
+        def montar(tamanho):
+            return reverse('expediente-copiar-semana'), {
+                "origem": self.profissional.id,
+                "destinos": [p.id for p in ProfissionalFactory.create_batch(tamanho)],
+            }
+        self.assertOrcamentoQueries('expediente-copiar-semana', 'post', montar)
+
+    # --- Agendamentos ---
+
+    def test_agendamento_listar(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            return reverse('agendamentos-list'), None
+        self.assertOrcamentoQueries('agendamentos-list', 'get', montar)
+
+    def test_agendamento_criar(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            self._como_cliente()
+            return reverse('agendamentos-list'), {
+                "cliente": self.cliente.id,
+                "profissional": self.profissional.id,
+                "servico": self.servico.id,
+                "data": self.segunda.isoformat(),
+                "hora": "09:00",
+            }
+        self.assertOrcamentoQueries('agendamentos-list', 'post', montar, status=201)
+
+    def test_agendamento_criar_recorrente(self):
+        def montar(tamanho):
+            self._como_cliente()
+            return reverse('agendamentos-list'), {
+                "cliente": self.cliente.id,
+                "profissional": self.profissional.id,
+                "servico": self.servico.id,
+                "data": self.segunda.isoformat(),
+                "hora": "09:00",
+                "recorrencia": 1,
+                "repeticoes": tamanho,
+            }
+        self.assertOrcamentoQueries('agendamentos-list', 'post', montar, status=201)
+
+    def test_agendamento_detalhar(self):
+        def montar(tamanho):
+            agendamento = self._agendamentos(tamanho)[0]
+            return reverse('agendamentos-detail', args=[agendamento.id]), None
+        self.assertOrcamentoQueries('agendamentos-detail', 'get', montar)
+
+    def test_agendamento_atualizar(self):
+        def montar(tamanho):
+            agendamento = self._agendamentos(tamanho)[0]
+            self._como_cliente()
+            return reverse('agendamentos-detail', args=[agendamento.id]), {
+                "cliente": self.cliente.id,
+                "profissional": self.profissional.id,
+                "servico": self.servico.id,
+                "data": agendamento.data.isoformat(),
+                "hora": "10:00",
+            }
+        self.assertOrcamentoQueries('agendamentos-detail', 'put', montar)
+
+    def test_agendamento_atualizar_parcial(self):
+        def montar(tamanho):
+            agendamento = self._agendamentos(tamanho)[0]
+            return reverse('agendamentos-detail', args=[agendamento.id]), {"status": "CONCLUIDO"}
+        self.assertOrcamentoQueries('agendamentos-detail', 'patch', montar)
+
+    def test_agendamento_excluir(self):
+        def montar(tamanho):
+            agendamento = self._agendamentos(tamanho)[0]
+            return reverse('agendamentos-detail', args=[agendamento.id]), None
+        self.assertOrcamentoQueries('agendamentos-detail', 'delete', montar, status=204)
+
+    def test_agendamento_agenda(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            return reverse('agendamentos-agenda'), {
+                "profissional": self.profissional.id,
+                "data_inicial": self.segunda.isoformat(),
+                "data_final": (self.segunda + timedelta(weeks=7)).isoformat(),
+            }
+        self.assertOrcamentoQueries('agendamentos-agenda', 'get', montar)
+
+    def test_agendamento_agenda_equipe(self):
+        def montar(tamanho):
+            profissionais = ProfissionalFactory.create_batch(tamanho)
+            for profissional in profissionais:
+                HorarioExpedienteFactory(profissional=profissional).horarios.add(*self.horarios)
+                self._agendamentos(1, profissional=profissional)
+            return reverse('agendamentos-agenda-equipe'), {
+                "profissionais": ",".join(str(p.id) for p in profissionais),
+                "data_inicial": self.segunda.isoformat(),
+                "data_final": (self.segunda + timedelta(weeks=2)).isoformat(),
+            }
+        self.assertOrcamentoQueries('agendamentos-agenda-equipe', 'get', montar)
+
+    def test_agendamento_estatisticas_cache(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            return reverse('agendamentos-estatisticas-cache'), None
+        self.assertOrcamentoQueries('agendamentos-estatisticas-cache', 'get', montar)
+
+    def test_agendamento_exportar(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho)
+            return reverse('agendamentos-exportar'), {"formato": "csv"}
+        self.assertOrcamentoQueries('agendamentos-exportar', 'get', montar)
+
+    def test_agendamento_proximos_horarios(self):
+        def montar(tamanho):
+            for profissional in ProfissionalFactory.create_batch(tamanho):
+                self.servico.profissionais.add(profissional)
+                HorarioExpedienteFactory(profissional=profissional).horarios.add(*self.horarios)
+                self._agendamentos(1, profissional=profissional)
+            return reverse('agendamentos-proximos-horarios'), {
+                "servico": self.servico.id,
+                "a_partir_de": self.segunda.isoformat(),
+            }
+        self.assertOrcamentoQueries('agendamentos-proximos-horarios', 'get', montar)
+
+    def test_agendamento_excluir_recorrencia(self):
+        def montar(tamanho):
+            recorrencia_id = uuid4()
+            self._agendamentos(tamanho, recorrencia_id=recorrencia_id)
+            return reverse('agendamentos-excluir-recorrencia'), {"recorrencia_id": str(recorrencia_id)}
+        self.assertOrcamentoQueries('agendamentos-excluir-recorrencia', 'delete', montar)
+
+    # --- Séries ---
+
+    def test_serie_listar(self):
+        def montar(tamanho):
+            for i in range(tamanho):
+                self._serie(data_inicio=self.segunda + timedelta(days=i))
+            return reverse('series-list'), None
+        self.assertOrcamentoQueries('series-list', 'get', montar)
+
+    def test_serie_criar(self):
+        def montar(tamanho):
+            self._agendamentos(tamanho, hora=time(11, 0))
+            self._como_cliente()
+            return reverse('series-list'), {
+                "cliente": self.cliente.id,
+                "profissional": self.profissional.id,
+                "servico": self.servico.id,
+                "hora": "09:00",
+                "data_inicio": self.segunda.isoformat(),
+                "repeticoes": tamanho,
+            }
+        self.assertOrcamentoQueries('series-list', 'post', montar, status=201)
+
+    def test_serie_detalhar(self):
+        def montar(tamanho):
+            serie = self._serie()
+            for i in range(tamanho):
+                serie.ocorrencia(self.segunda + timedelta(weeks=i)).save()
+            return reverse('series-detail', args=[serie.id]), None
+        self.assertOrcamentoQueries('series-detail', 'get', montar)
+
+    def test_serie_atualizar(self):
+        def montar(tamanho):
+            serie = self._serie()
+            self._agendamentos(tamanho, hora=time(11, 0))
+            self._como_cliente()
+            return reverse('series-detail', args=[serie.id]), {
+                "cliente": self.cliente.id,
+                "profissional": self.profissional.id,
+                "servico": self.servico.id,
+                "hora": "09:30",
+                "data_inicio": self.segunda.isoformat(),
+                "repeticoes": tamanho,
+            }
+        self.assertOrcamentoQueries('series-detail', 'put', montar)
+
+    def test_serie_atualizar_parcial(self):
+        def montar(tamanho):
+            serie = self._serie()
+            return reverse('series-detail', args=[serie.id]), {"repeticoes": tamanho}
+        self.assertOrcamentoQueries('series-detail', 'patch', montar)
+
+    def test_serie_excluir(self):
+        def montar(tamanho):
+            serie = self._serie()
+            for i in range(tamanho):
+                serie.ocorrencia(self.segunda + timedelta(weeks=i)).save()
+            return reverse('series-detail', args=[serie.id]), None
+        self.assertOrcamentoQueries('series-detail', 'delete', montar, status=204)
+
+    def test_serie_ocorrencias(self):
+        def montar(tamanho):
+            for _ in range(tamanho):
+                self._serie(cliente=ClienteFactory(), profissional=ProfissionalFactory())
+            return reverse('series-ocorrencias'), {
+                "data_inicial": self.segunda.isoformat(),
+                "data_final": (self.segunda + timedelta(weeks=4)).isoformat(),
+            }
+        self.assertOrcamentoQueries('series-ocorrencias', 'get', montar)
+
+    def test_serie_materializar(self):
+        def montar(tamanho):
+            serie = self._serie()
+            for i in range(1, tamanho + 1):
+                serie.ocorrencia(self.segunda + timedelta(weeks=i)).save()
+            return reverse('series-materializar', args=[serie.id]), {"data": self.segunda.isoformat()}
+        self.assertOrcamentoQueries('series-materializar', 'post', montar, status=201)
+
+    def test_serie_encerrar(self):
+        def montar(tamanho):
+            serie = self._serie()
+            for i in range(1, tamanho + 1):
+                serie.ocorrencia(self.segunda + timedelta(weeks=i)).save()
+            return reverse('series-encerrar', args=[serie.id]), {"data": (self.segunda + timedelta(days=1)).isoformat()}
+        self.assertOrcamentoQueries('series-encerrar', 'post', montar)
+
+    def test_serie_excluir_ocorrencia(self):
+        def montar(tamanho):
+            serie = self._serie()
+            for i in range(tamanho):
+                serie.ocorrencia(self.segunda + timedelta(weeks=i)).save()
+            return reverse('series-excluir-ocorrencia', args=[serie.id]), {"data": self.segunda.isoformat()}
+        self.assertOrcamentoQueries('series-excluir-ocorrencia', 'post', montar)
@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+from datetime import date, time, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.usuario.models import Usuario, TipoUsuario
+from apps.servicos.models import Servico
+from apps.agenda.models import Agendamento, HorarioExpediente, Horario
+from config.roteamento import COOKIE_PRIMARIO, REPLICA, ler_da_replica
+
+
+class SemReplicaTests(TestCase):
+    def test_leituras_ficam_no_primario(self):
+        with ler_da_replica():
+            self.assertEqual(Servico.objects.all().db, DEFAULT_DB_ALIAS)
+        response = APIClient().post(reverse('servico-list'), {}, format='json')
+        self.assertNotIn(COOKIE_PRIMARIO, response.cookies)
+
+
+class ReplicaSQLiteTests(TestCase):
+    """
+    Primário e réplica em dois bancos SQLite: a réplica é uma cópia do banco de
+    testes feita antes dos testes e, daí em diante, os dados de cada um são
+    criados separadamente, como numa réplica atrasada.
+    """
+    databases = {DEFAULT_DB_ALIAS, REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.diretorio = tempfile.mkdtemp()
+        configuracao = connections.configure_settings({
+            DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+            REPLICA: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(cls.diretorio, 'replica.sqlite3')},
+        })
+        cls.bancos = mock.patch.dict(connections.settings, {REPLICA: configuracao[REPLICA]})
+        cls.bancos.start()
+
+        for alias in (DEFAULT_DB_ALIAS, REPLICA):
+            connections[alias].ensure_connection()
+        connections[DEFAULT_DB_ALIAS].connection.backup(connections[REPLICA].connection)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        cls.bancos.stop()
+        shutil.rmtree(cls.diretorio)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.profissional = Usuario.objects.create_user(
+            email="prof@test.com",
+            password="senha123",
+            nome_completo="Profissional Teste",
+            tipo=TipoUsuario.PROFISSIONAL
+        )
+
+    def _nomes(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [servico['nome'] for servico in response.json()]
+
+    def test_get_le_da_replica(self):
+        Servico.objects.using(REPLICA).create(nome="Só na réplica", preco=10, duracao=timedelta(minutes=30))
+        Servico.objects.create(nome="Só no primário", preco=10, duracao=timedelta(minutes=30))
+        self.assertEqual(self._nomes(self.client.get(reverse('servico-list'))), ["Só na réplica"])
+
+    def test_escrita_no_primario_e_leituras_seguintes_fixadas(self):
+        # A validação de 'profissionais' lê o Usuario, que só existe no primário
+        response = self.client.post(reverse('servico-list'), {
+            "nome": "Corte", "descricao": "", "duracao": "00:30:00", "preco": "50.00",
+            "profissionais": [self.profissional.id],
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertTrue(Servico.objects.using(DEFAULT_DB_ALIAS).filter(nome="Corte").exists())
+        self.assertFalse(Servico.objects.using(REPLICA).filter(nome="Corte").exists())
+        self.assertIn(COOKIE_PRIMARIO, response.cookies)
+
+        self.assertEqual(self._nomes(self.client.get(reverse('servico-list'))), ["Corte"])
+        self.assertEqual(self._nomes(APIClient().get(reverse('servico-list'))), [])
+
+    def test_clean_do_agendamento_valida_no_primario(self):
+        servico = Servico.objects.create(nome="Corte", preco=100, duracao=timedelta(minutes=30))
+        servico.profissionais.add(self.profissional)
+        expediente = HorarioExpediente.objects.create(profissional=self.profissional, dia_semana=0)
+        expediente.horarios.add(Horario.objects.create(horario=time(9, 0)), Horario.objects.create(horario=time(9, 30)))
+        cliente = Usuario.objects.create_user(
+            email="cliente@test.com",
+            password="senha123",
+            nome_completo="Cliente Teste",
+            tipo=TipoUsuario.CLIENTE
+        )
+        agendamento = Agendamento(
+            cliente=cliente, profissional=self.profissional, servico=servico, data=date(2025, 5, 26), hora=time(9, 0)
+        )
+
+        with ler_da_replica(), CaptureQueriesContext(connections[REPLICA]) as na_replica:
+            agendamento.clean()
+        self.assertEqual(len(na_replica), 0)
+
+    def test_grade_da_agenda_em_cache_vem_do_primario(self):
+        expediente = HorarioExpediente.objects.create(profissional=self.profissional, dia_semana=0)
+        expediente.horarios.add(Horario.objects.create(horario=time(9, 0)))
+        params = {"profissional": self.profissional.id, "data_inicial": "2025-05-26", "data_final": "2025-05-26"}
+
+        with CaptureQueriesContext(connections[REPLICA]) as na_replica:
+            response = self.client.get(reverse('agendamentos-agenda'), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [{"horario": "09:00", "2025-05-26": {"ocupado": False}}])
+        self.assertEqual(len(na_replica), 0)
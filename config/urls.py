@@ -3,11 +3,14 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from config.metricas import metricas
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/servicos/', include('apps.servicos.urls')),
     path('api/usuario/', include('apps.usuario.urls')),
     path('api/agenda/', include('apps.agenda.urls')),
+    path('metrics', metricas, name='metricas'),
 ]
 
 # Serve arquivos de mídia apenas no modo DEBUG (desenvolvimento)